@@ -11,7 +11,14 @@ Functions:
 It also initializes the following components:
     - db: SQLAlchemy database extension.
     - login_manager: Flask-Login manager for user session handling.
+    - payload_cache: LRU cache of the encoded quiz payloads of the API.
+    - single_flight: Coalescing of concurrent expensive reads.
+    - answer_keys: LRU cache of the compiled answer keys used for grading.
+    - result_writer: Writer of graded results (optionally write-behind).
+    - item_banks: LRU cache of the item banks of the adaptive mode.
+    - Commands: Command line commands (e.g. `calibrate-items`).
     - Error handlers: Custom error handlers registered for the application.
+    - QuizJSONProvider: JSON provider used by `jsonify` and the API.
 
 Blueprints registered:
     - auth_bp: Blueprint for authentication routes.
@@ -24,8 +31,9 @@ Blueprints registered:
 '''
 
 from flask import Flask
-from .extensions import db, login_manager
+from .extensions import db, login_manager, payload_cache, single_flight
 from .error_handlers import register_error_handlers
+from .json_provider import QuizJSONProvider
 
 
 def create_app(config_class):
@@ -34,7 +42,8 @@ def create_app(config_class):
 
     This function initializes the app with configurations
     from the specified config class,
-    sets up the database, login manager, error handlers,
+    sets up the JSON provider, database, login manager, caches,
+    error handlers,
     and registers the blueprints.
 
     Args:
@@ -46,9 +55,24 @@ def create_app(config_class):
 
     app = Flask(__name__)
     app.config.from_object(config_class)
+    app.json = QuizJSONProvider(app)
 
     db.init_app(app)
     login_manager.init_app(app)
+    payload_cache.init_app(app)
+    single_flight.init_app(app)
+
+    from .answer_keys import answer_keys
+    answer_keys.init_app(app)
+
+    from .result_writer import result_writer
+    result_writer.init_app(app)
+
+    from .item_bank import item_banks
+    item_banks.init_app(app)
+
+    from .commands import register_commands
+    register_commands(app)
 
     from .routes import (
             auth_bp,
@@ -0,0 +1,371 @@
+'''
+app/answer_keys.py
+
+This module defines the compiled answer keys used to grade quiz submissions,
+and the in-process cache that holds them.
+
+An answer key lists the IDs of the questions of a quiz (as the strings used
+for the form field names) together with a compact string of their correct
+options, one character per question. Grading is then a single loop over the
+key, without loading any question.
+
+Keys are cached per quiz with the version of the quiz they were compiled
+from. Every lookup reads the current version with a primary key query,
+and a key compiled from an older version is compiled again, so changes
+committed by other processes are picked up as soon as they bump the
+version (see `app.events`). Keys are also dropped as soon as a commit of
+this process changes the quiz or its questions.
+
+Classes:
+    AnswerKey: The compiled answer key of a quiz.
+    AnswerKeyCache: A bounded LRU cache of answer keys.
+
+Functions:
+    compile_answer_key: Builds the answer key of a quiz with one query.
+    grade: Counts the correct answers of a submission.
+    pool_fingerprint: Returns a fingerprint of the questions an answer
+    key draws from.
+    draw_answer_key: Returns the answer key of the questions drawn
+    for an attempt.
+    pick_answer_key: Returns the answer key of the given questions.
+    attempt_answer_key: Returns the answer key of the questions
+    of an attempt.
+    stored_question_ids: Returns the questions of a stored attempt.
+
+Attributes:
+    answer_keys (AnswerKeyCache): The cache used by the application,
+    initialized in `create_app`.
+'''
+
+from app.extensions import db
+from app.models import Question, Quiz
+from collections import OrderedDict, namedtuple
+from hashlib import blake2b
+from random import Random
+from sqlalchemy import select
+from threading import Lock
+
+AnswerKey = namedtuple('AnswerKey', ['question_ids', 'correct_options'])
+AnswerKey.__doc__ = '''
+The compiled answer key of a quiz.
+
+Attributes:
+    question_ids (tuple): The question IDs, as strings, ordered by ID.
+    correct_options (str): The correct option of each question
+    ('a', 'b', 'c' or 'd'), in the same order.
+'''
+
+
+def compile_answer_key(quiz_id):
+    '''
+    Builds the answer key of a quiz with one query.
+
+    Args:
+        quiz_id (int): The ID of the quiz.
+
+    Returns:
+        AnswerKey: The answer key (empty if the quiz has no questions).
+    '''
+
+    rows = db.session.execute(
+            select(Question.id, Question.correct_option).where(
+                Question.quiz_id == quiz_id
+                ).order_by(Question.id)
+            ).all()
+    return AnswerKey(
+            tuple(str(question_id) for question_id, _ in rows),
+            ''.join(correct_option for _, correct_option in rows)
+            )
+
+
+def grade(answer_key, answers):
+    '''
+    Counts the correct answers of a submission.
+
+    Args:
+        answer_key (AnswerKey): The answer key of the quiz.
+        answers (Mapping): The selected options, keyed by question ID
+        as a string (e.g. `request.form`). Options are case-insensitive.
+
+    Returns:
+        int: The number of correct answers.
+    '''
+
+    score = 0
+    get = answers.get
+    for question_id, correct_option in zip(
+            answer_key.question_ids,
+            answer_key.correct_options
+            ):
+        selected_option = get(question_id)
+        if selected_option and selected_option.lower() == correct_option:
+            score += 1
+    return score
+
+
+def pool_fingerprint(answer_key):
+    '''
+    Returns a fingerprint of the questions an answer key draws from.
+
+    The questions drawn for an attempt only depend on its seed and on the
+    IDs of the questions of the quiz, so the fingerprint only changes when
+    questions are added or deleted, not when they are edited or their
+    difficulties calibrated.
+
+    Args:
+        answer_key (AnswerKey): The answer key of the whole quiz.
+
+    Returns:
+        str: A short hexadecimal digest of the question IDs.
+    '''
+
+    return blake2b(
+            ','.join(answer_key.question_ids).encode(),
+            digest_size=8
+            ).hexdigest()
+
+
+def draw_answer_key(answer_key, count, seed):
+    '''
+    Returns the answer key of the questions drawn for an attempt.
+
+    The questions are drawn from the seed and the answer key, so the same
+    subset is rebuilt when the attempt is graded, as long as the questions
+    of the quiz were not added or deleted since it was displayed (the
+    attempt token carries the fingerprint of the pool, see
+    `pool_fingerprint`). The graded questions are then stored with the
+    attempt.
+
+    Args:
+        answer_key (AnswerKey): The answer key of the whole quiz.
+        count (int or None): The number of questions drawn.
+        seed (int or None): The seed of the attempt (None when no
+        questions are drawn).
+
+    Returns:
+        AnswerKey: The answer key of the drawn questions, ordered by ID
+        (the whole key when there is no seed or the quiz does not have
+        more questions than `count`).
+    '''
+
+    size = len(answer_key.question_ids)
+    if seed is None or not count or count >= size:
+        return answer_key
+    indexes = sorted(Random(seed).sample(range(size), count))
+    return AnswerKey(
+            tuple(answer_key.question_ids[index] for index in indexes),
+            ''.join(answer_key.correct_options[index] for index in indexes)
+            )
+
+
+def pick_answer_key(answer_key, question_ids):
+    '''
+    Returns the answer key of the given questions.
+
+    Args:
+        answer_key (AnswerKey): The answer key of the whole quiz.
+        question_ids (iterable): The question IDs, as strings.
+
+    Returns:
+        AnswerKey: The answer key of the questions, in the given order
+        (questions no longer in the quiz are left out).
+    '''
+
+    options = dict(zip(answer_key.question_ids, answer_key.correct_options))
+    question_ids = tuple(
+            question_id
+            for question_id in question_ids
+            if question_id in options
+            )
+    return AnswerKey(
+            question_ids,
+            ''.join(options[question_id] for question_id in question_ids)
+            )
+
+
+def attempt_answer_key(
+        quiz_id,
+        question_count=None,
+        seed=None,
+        question_ids=None
+        ):
+    '''
+    Returns the answer key of the questions of an attempt.
+
+    Args:
+        quiz_id (int): The ID of the quiz.
+        question_count (int, optional): The number of questions drawn.
+        seed (int, optional): The seed the questions were drawn with.
+        question_ids (iterable, optional): The questions asked, as strings,
+        for attempts whose questions were chosen one by one (adaptive
+        mode).
+
+    Returns:
+        AnswerKey: The answer key of the attempt's questions, built from
+        the cached answer key of the quiz.
+    '''
+
+    answer_key = answer_keys.get(quiz_id)
+    if question_ids:
+        return pick_answer_key(answer_key, question_ids)
+    return draw_answer_key(answer_key, question_count, seed)
+
+
+def stored_question_ids(question_ids):
+    '''
+    Returns the questions of a stored attempt, in the order of its
+    packed answers.
+
+    Args:
+        question_ids (str or tuple): The question IDs stored with the
+        attempt, comma-separated (as in `QuizAttempt`) or as a tuple
+        of strings (as in a graded result).
+
+    Returns:
+        tuple: The question IDs, as strings.
+    '''
+
+    if isinstance(question_ids, str):
+        return tuple(question_ids.split(',')) if question_ids else ()
+    return tuple(question_ids)
+
+
+class AnswerKeyCache:
+    '''
+    A bounded LRU cache of answer keys, keyed by quiz ID.
+
+    Subclasses can cache other per-quiz structures by overriding
+    `compile` and the `size_setting` and `extension_name` attributes.
+
+    Attributes:
+        size_setting (str): The configuration key of the maximum number
+        of entries.
+        extension_name (str): The name under which the cache is
+        registered in `app.extensions`.
+        max_entries (int): The maximum number of cached keys
+        (0 disables the cache).
+        hits (int): The number of keys served from the cache.
+        misses (int): The number of keys compiled.
+        generation (int): Incremented on every invalidation. A key compiled
+        from data read before an invalidation is not cached.
+
+    Entries are `(version, key)` pairs, checked against the version
+    of the quiz on every lookup.
+    '''
+
+    size_setting = 'ANSWER_KEY_CACHE_SIZE'
+    extension_name = 'answer_keys'
+
+    def __init__(self, app=None):
+        '''
+        Creates the cache, optionally binding it to an application.
+
+        Args:
+            app (Flask, optional): The Flask application instance.
+        '''
+
+        self._lock = Lock()
+        self._entries = OrderedDict()
+        self.max_entries = 0
+        self.hits = 0
+        self.misses = 0
+        self.generation = 0
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        '''
+        Configures the cache for an application and empties it.
+
+        Args:
+            app (Flask): The Flask application instance.
+        '''
+
+        from .events import quizzes_changed
+
+        self.max_entries = app.config[self.size_setting]
+        self.clear()
+        quizzes_changed.connect(self._on_quizzes_changed)
+        app.extensions[self.extension_name] = self
+
+    def compile(self, quiz_id):
+        '''
+        Builds the cached entry of a quiz.
+
+        Args:
+            quiz_id (int): The ID of the quiz.
+
+        Returns:
+            AnswerKey: The answer key of the quiz.
+        '''
+
+        return compile_answer_key(quiz_id)
+
+    def get(self, quiz_id):
+        '''
+        Returns the answer key of a quiz, compiling it on a miss or when
+        the version of the quiz changed.
+
+        Args:
+            quiz_id (int): The ID of the quiz.
+
+        Returns:
+            AnswerKey: The answer key of the quiz.
+        '''
+
+        version = db.session.scalar(
+                select(Quiz.version).where(Quiz.id == quiz_id)
+                )
+        with self._lock:
+            entry = self._entries.get(quiz_id)
+            if entry is not None and entry[0] == version:
+                self._entries.move_to_end(quiz_id)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+            generation = self.generation
+        answer_key = self.compile(quiz_id)
+        with self._lock:
+            if generation == self.generation and self.max_entries:
+                self._entries[quiz_id] = (version, answer_key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+        return answer_key
+
+    def invalidate(self, quiz_ids):
+        '''
+        Removes the answer keys of the given quizzes.
+
+        Args:
+            quiz_ids (iterable): The IDs of the quizzes.
+        '''
+
+        with self._lock:
+            self.generation += 1
+            for quiz_id in quiz_ids:
+                self._entries.pop(quiz_id, None)
+
+    def clear(self):
+        '''
+        Empties the cache and resets its counters.
+        '''
+
+        with self._lock:
+            self.generation += 1
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def _on_quizzes_changed(self, sender, quiz_ids):
+        '''
+        Invalidates the answer keys of changed quizzes.
+
+        Args:
+            sender: The session that committed the changes.
+            quiz_ids (set): The IDs of the changed quizzes.
+        '''
+
+        self.invalidate(quiz_ids)
+
+
+answer_keys = AnswerKeyCache()
@@ -0,0 +1,174 @@
+'''
+app/commands.py
+
+This module defines the command line commands of the application, run with
+`flask --app run <command>`.
+
+Functions:
+    register_commands: Registers the commands on the application.
+    calibrate_items: Precomputes the difficulty of the questions
+    for the adaptive mode.
+    regrade: Regrades the stored attempts of a quiz.
+    rebuild_leaderboard_command: Rebuilds the leaderboard entries
+    from the stored results.
+    replay_failed_results: Saves the results of a failed write-behind
+    journal again.
+'''
+
+from app.extensions import db
+from app.events import bump_versions
+from app.models import Question, QuestionStat
+from app.regrade import regrade_quiz
+from app.leaderboard import rebuild_leaderboard
+from app.result_writer import result_writer
+from flask import current_app
+from sqlalchemy import bindparam, select, update
+from math import log
+import click
+import os
+
+
+@click.command(
+        'calibrate-items',
+        help='Precompute question difficulties for the adaptive mode.'
+        )
+@click.option(
+        '--min-responses',
+        default=20,
+        show_default=True,
+        help='Minimum number of responses to calibrate a question.'
+        )
+def calibrate_items(min_responses):
+    '''
+    Precomputes the difficulty of the questions for the adaptive mode.
+
+    The Rasch difficulty of each question is estimated from its item
+    statistics (see `QuestionStat`) as the log-odds of a wrong answer,
+    `ln((1 - p) / p)`, where `p` is the share of correct answers smoothed
+    by half a response on each side. Only the counters are read, and all
+    the questions are updated with one batched statement. The versions of
+    their quizzes are bumped in the same transaction, so running workers
+    compile their item banks again.
+
+    Args:
+        min_responses (int): Questions with fewer responses keep
+        their current difficulty.
+    '''
+
+    stats = db.session.execute(
+            select(
+                QuestionStat.question_id,
+                QuestionStat.quiz_id,
+                QuestionStat.responses,
+                QuestionStat.correct
+                ).where(QuestionStat.responses >= min_responses)
+            ).all()
+    if stats:
+        db.session.execute(
+                update(Question.__table__).where(
+                    Question.__table__.c.id == bindparam('b_id')
+                    ).values(difficulty=bindparam('b_difficulty')),
+                [
+                    {
+                        'b_id': question_id,
+                        'b_difficulty': log(
+                            (responses - correct + 0.5) / (correct + 0.5)
+                            )
+                        }
+                    for question_id, _, responses, correct in stats
+                    ]
+                )
+        bump_versions(db.session, {row.quiz_id for row in stats})
+        db.session.commit()
+    click.echo(f'Calibrated {len(stats)} questions.')
+
+
+@click.command(
+        'regrade',
+        help='Regrade the stored attempts of a quiz after a key correction.'
+        )
+@click.argument('quiz_id', type=int)
+@click.option(
+        '--chunk-size',
+        default=1000,
+        show_default=True,
+        type=click.IntRange(min=1),
+        help='Number of attempts read and written per transaction.'
+        )
+def regrade(quiz_id, chunk_size):
+    '''
+    Regrades the stored attempts of a quiz.
+
+    See `regrade_quiz` for how the attempts, results and item statistics
+    are recomputed, and which attempts are skipped.
+
+    Args:
+        quiz_id (int): The ID of the quiz.
+        chunk_size (int): The number of attempts per transaction.
+    '''
+
+    counts = regrade_quiz(quiz_id, chunk_size)
+    click.echo(
+            f'Regraded {counts["attempts"]} attempts '
+            f'({counts["changed"]} changed, {counts["skipped"]} skipped, '
+            f'{counts["results"]} results).'
+            )
+
+
+@click.command(
+        'rebuild-leaderboard',
+        help='Rebuild the leaderboard entries from the stored results.'
+        )
+def rebuild_leaderboard_command():
+    '''
+    Rebuilds the leaderboard entries from the stored results, e.g. for
+    results stored before the leaderboard entries were maintained.
+    '''
+
+    click.echo(f'Rebuilt {rebuild_leaderboard()} leaderboard entries.')
+
+
+@click.command(
+        'replay-failed-results',
+        help='Save the results of a failed write-behind journal again.'
+        )
+@click.argument('path', required=False)
+def replay_failed_results(path):
+    '''
+    Saves the results of a failed write-behind journal again, once
+    the cause of their failure was fixed.
+
+    The saved results are removed from the failed journal, and the ones
+    that still fail are kept in it (see `ResultWriter.replay_failed`).
+
+    Args:
+        path (str, optional): The path of the failed journal (default:
+        `RESULTS_JOURNAL` with a `.failed` suffix).
+    '''
+
+    journal = current_app.config['RESULTS_JOURNAL']
+    path = path or (journal and journal + '.failed')
+    if not path:
+        raise click.UsageError(
+                'Give the path of the failed journal, or set '
+                'RESULTS_JOURNAL.'
+                )
+    if not os.path.exists(path):
+        click.echo('No failed results.')
+        return
+    saved, left = result_writer.replay_failed(path)
+    click.echo(f'Saved {saved} results ({left} left in {path}).')
+
+
+def register_commands(app):
+    '''
+    Registers the commands on the application.
+
+    Args:
+        app (Flask): The Flask application instance.
+    '''
+
+    app.cli.add_command(calibrate_items)
+    app.cli.add_command(regrade)
+    app.cli.add_command(rebuild_leaderboard_command)
+    app.cli.add_command(replay_failed_results)
@@ -16,6 +16,47 @@ Attributes:
     modifications in SQLAlchemy.
     SQLALCHEMY_DATABASE_URI (str): URI for the SQLAlchemy database.
     DEBUG (bool): Flag to enable/disable debug mode.
+    API_STREAM_BATCH_SIZE (int): Number of quizzes read from the database
+    per batch when streaming `/api/quizzes`.
+    API_MAX_LIMIT (int): Maximum page size for cursor pagination
+    of `/api/quizzes`.
+    PAYLOAD_CACHE_MAX_BYTES (int): Byte budget of the in-process cache
+    of encoded quiz payloads (0 disables the cache).
+    API_MAX_IDS (int): Maximum number of IDs accepted by `/api/questions`.
+    JSON_COMPACT (bool or None): Whether JSON responses use compact
+    separators (None indents them in debug mode only).
+    JSON_FAST_ENCODER (bool): Whether `orjson` is used to encode JSON
+    when it is installed.
+    ANSWER_KEY_CACHE_SIZE (int): Maximum number of compiled answer keys
+    kept in memory for grading (0 disables the cache).
+    API_MAX_SUBMISSIONS (int): Maximum number of answer sheets accepted
+    by `/api/results` in one request.
+    RESULTS_WRITE_BEHIND (bool): Whether graded results are journaled,
+    queued and written in batches by a background thread.
+    RESULTS_FLUSH_INTERVAL (float): Maximum time a queued result waits
+    before its batch is written, in seconds.
+    RESULTS_FLUSH_ROWS (int): Maximum number of results written
+    per batch.
+    RESULTS_JOURNAL (str or None): Path of the write-behind journal,
+    required in write-behind mode (one path per worker process).
+    RESULTS_RETRY_ATTEMPTS (int): Number of times a batch is written
+    again after a transient database error (e.g. a locked database).
+    RESULTS_RETRY_DELAY (float): Delay before the first retry,
+    in seconds, doubled on each following one.
+    QUIZ_TIME_LIMIT (int): Time allowed to take a quiz, in seconds.
+    QUIZ_GRACE_PERIOD (int): Extra seconds accepted after the time limit,
+    to allow for the automatic submission to reach the server.
+    QUIZ_LATE_POLICY (str): What happens to late submissions: 'reject'
+    refuses them, 'flag' records them as late.
+    ITEM_BANK_CACHE_SIZE (int): Maximum number of item banks kept
+    in memory for the adaptive mode (0 disables the cache).
+    ADAPTIVE_QUIZ_LENGTH (int): Number of questions asked in adaptive
+    mode, unless the quiz sets its own `draw_count`.
+    LEADERBOARD_RETENTION_DAYS (int): Number of days the daily leaderboard
+    buckets are kept (at least 31 for the monthly leaderboard).
+    SINGLE_FLIGHT_TIMEOUT (float): Maximum time a request waits for
+    the result of a concurrent identical read, in seconds (0 disables
+    coalescing).
     TESTING (bool): Flag to enable/disable testing mode.
 '''
 
@@ -29,10 +70,74 @@ class Config:
         like sessions.
         SQLALCHEMY_TRACK_MODIFICATIONS (bool): Flag to disable tracking
         modifications in SQLAlchemy.
+        API_STREAM_BATCH_SIZE (int): Number of quizzes read from
+        the database per batch when streaming `/api/quizzes`.
+        API_MAX_LIMIT (int): Maximum page size for cursor pagination
+        of `/api/quizzes`.
+        PAYLOAD_CACHE_MAX_BYTES (int): Byte budget of the in-process cache
+        of encoded quiz payloads (0 disables the cache).
+        API_MAX_IDS (int): Maximum number of IDs accepted
+        by `/api/questions`.
+        JSON_COMPACT (bool or None): Whether JSON responses use compact
+        separators (None indents them in debug mode only).
+        JSON_FAST_ENCODER (bool): Whether `orjson` is used to encode JSON
+        when it is installed.
+        ANSWER_KEY_CACHE_SIZE (int): Maximum number of compiled answer keys
+        kept in memory for grading (0 disables the cache).
+        API_MAX_SUBMISSIONS (int): Maximum number of answer sheets
+        accepted by `/api/results` in one request.
+        RESULTS_WRITE_BEHIND (bool): Whether graded results are journaled,
+        queued and written in batches by a background thread.
+        RESULTS_FLUSH_INTERVAL (float): Maximum time a queued result waits
+        before its batch is written, in seconds.
+        RESULTS_FLUSH_ROWS (int): Maximum number of results written
+        per batch.
+        RESULTS_JOURNAL (str or None): Path of the write-behind journal,
+        required in write-behind mode (one path per worker process).
+        RESULTS_RETRY_ATTEMPTS (int): Number of times a batch is written
+        again after a transient database error (e.g. a locked database).
+        RESULTS_RETRY_DELAY (float): Delay before the first retry,
+        in seconds, doubled on each following one.
+        QUIZ_TIME_LIMIT (int): Time allowed to take a quiz, in seconds.
+        QUIZ_GRACE_PERIOD (int): Extra seconds accepted after the time
+        limit, to allow for the automatic submission to reach the server.
+        QUIZ_LATE_POLICY (str): What happens to late submissions: 'reject'
+        refuses them, 'flag' records them as late.
+        ITEM_BANK_CACHE_SIZE (int): Maximum number of item banks kept
+        in memory for the adaptive mode (0 disables the cache).
+        ADAPTIVE_QUIZ_LENGTH (int): Number of questions asked in adaptive
+        mode, unless the quiz sets its own `draw_count`.
+        LEADERBOARD_RETENTION_DAYS (int): Number of days the daily
+        leaderboard buckets are kept (at least 31 for the monthly
+        leaderboard).
+        SINGLE_FLIGHT_TIMEOUT (float): Maximum time a request waits for
+        the result of a concurrent identical read, in seconds (0 disables
+        coalescing).
     '''
 
     SECRET_KEY = 'your_secret_key'
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+    API_STREAM_BATCH_SIZE = 100
+    API_MAX_LIMIT = 100
+    PAYLOAD_CACHE_MAX_BYTES = 16 * 1024 * 1024
+    API_MAX_IDS = 100
+    JSON_COMPACT = True
+    JSON_FAST_ENCODER = True
+    ANSWER_KEY_CACHE_SIZE = 1024
+    API_MAX_SUBMISSIONS = 500
+    RESULTS_WRITE_BEHIND = False
+    RESULTS_FLUSH_INTERVAL = 0.005
+    RESULTS_FLUSH_ROWS = 200
+    RESULTS_JOURNAL = None
+    RESULTS_RETRY_ATTEMPTS = 5
+    RESULTS_RETRY_DELAY = 0.05
+    QUIZ_TIME_LIMIT = 65
+    QUIZ_GRACE_PERIOD = 5
+    QUIZ_LATE_POLICY = 'reject'
+    ITEM_BANK_CACHE_SIZE = 256
+    ADAPTIVE_QUIZ_LENGTH = 10
+    LEADERBOARD_RETENTION_DAYS = 35
+    SINGLE_FLIGHT_TIMEOUT = 5.0
 
 
 class ProductionConfig(Config):
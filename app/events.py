@@ -0,0 +1,141 @@
+'''
+app/events.py
+
+This module tracks changes to quizzes and their questions and announces
+them once they are committed.
+
+SQLAlchemy session events collect the IDs of the quizzes whose `Quiz` or
+`Question` rows were inserted, updated or deleted during a flush, and bump
+the `version` of those quizzes in the same transaction, so API ETags and
+the caches of other processes see every change made through the ORM. When
+the transaction commits, the `quizzes_changed` signal is sent with those
+IDs, so in-process caches can drop what they hold for them. Rolled back
+changes are discarded.
+
+Changes made with Core statements, outside the unit of work, must bump
+the versions themselves (see `bump_versions`).
+
+Writers of results and leaderboards mark their transaction instead (see
+`mark_results_saved`), and the `results_saved` signal is sent once it
+commits, so readers of this process can tell reads started before the
+write from the ones started after it.
+
+Functions:
+    bump_versions: Bumps the version of the given quizzes.
+    mark_results_saved: Marks a transaction as writing results.
+
+Signals:
+    quizzes_changed: Sent after a commit that changed quizzes or questions,
+    with the set of changed quiz IDs as `quiz_ids`.
+    results_saved: Sent after a commit that wrote results or leaderboard
+    rows.
+'''
+
+from app.extensions import db
+from app.models import Quiz, Question
+from blinker import Namespace
+from itertools import chain
+from sqlalchemy import event, update
+
+signals = Namespace()
+quizzes_changed = signals.signal('quizzes-changed')
+results_saved = signals.signal('results-saved')
+
+
+def bump_versions(connection, quiz_ids):
+    '''
+    Bumps the version of the given quizzes.
+
+    The caller commits the transaction.
+
+    Args:
+        connection (Connection or Session): Executes the statement.
+        quiz_ids (iterable): The IDs of the quizzes.
+    '''
+
+    table = Quiz.__table__
+    connection.execute(
+            update(table).where(table.c.id.in_(set(quiz_ids))).values(
+                version=table.c.version + 1
+                )
+            )
+
+
+def mark_results_saved(session):
+    '''
+    Marks the transaction of a session as writing results, so
+    `results_saved` is sent once it commits.
+
+    Args:
+        session (Session): The session writing the results.
+    '''
+
+    session.info['results_saved'] = True
+
+
+@event.listens_for(db.session, 'after_flush')
+def collect_changed_quizzes(session, flush_context):
+    '''
+    Collects the IDs of the quizzes changed by a flush and bumps
+    their versions.
+
+    Quizzes inserted by the flush keep their initial version.
+
+    Args:
+        session (Session): The flushed session.
+        flush_context (UOWTransaction): The flush context.
+    '''
+
+    changed = set()
+    for obj in chain(session.new, session.dirty, session.deleted):
+        if isinstance(obj, Quiz):
+            changed.add(obj.id)
+        elif isinstance(obj, Question):
+            changed.add(obj.quiz_id)
+    if not changed:
+        return
+    session.info.setdefault('changed_quiz_ids', set()).update(changed)
+    changed -= {obj.id for obj in session.new if isinstance(obj, Quiz)}
+    if changed:
+        bump_versions(session.connection(), changed)
+
+
+@event.listens_for(db.session, 'after_commit')
+def send_quizzes_changed(session):
+    '''
+    Sends `quizzes_changed` for the quizzes changed by the committed
+    transaction.
+
+    Args:
+        session (Session): The committed session.
+    '''
+
+    quiz_ids = session.info.pop('changed_quiz_ids', None)
+    if quiz_ids:
+        quizzes_changed.send(session, quiz_ids=quiz_ids)
+
+
+@event.listens_for(db.session, 'after_commit')
+def send_results_saved(session):
+    '''
+    Sends `results_saved` if the committed transaction wrote results.
+
+    Args:
+        session (Session): The committed session.
+    '''
+
+    if session.info.pop('results_saved', False):
+        results_saved.send(session)
+
+
+@event.listens_for(db.session, 'after_rollback')
+def discard_changed_quizzes(session):
+    '''
+    Discards the changes collected for a rolled back transaction.
+
+    Args:
+        session (Session): The rolled back session.
+    '''
+
+    session.info.pop('changed_quiz_ids', None)
+    session.info.pop('results_saved', None)
@@ -7,10 +7,18 @@ Extensions:
     db: An instance of SQLAlchemy used for database interactions.
     login_manager: An instance of LoginManager used for managing user sessions
     in Flask-Login.
+    payload_cache: An instance of PayloadCache used for caching the encoded
+    JSON payloads of quizzes served by the API.
+    single_flight: An instance of SingleFlight used for coalescing
+    concurrent calls of expensive read functions.
 '''
 
 from flask_sqlalchemy import SQLAlchemy
 from flask_login import LoginManager
+from .payload_cache import PayloadCache
+from .single_flight import SingleFlight
 
 db = SQLAlchemy()
 login_manager = LoginManager()
+payload_cache = PayloadCache()
+single_flight = SingleFlight()
@@ -0,0 +1,206 @@
+'''
+app/item_bank.py
+
+This module defines the item banks used by the adaptive quiz mode, and the
+in-process cache that holds them.
+
+Adaptive quizzes follow the Rasch (one-parameter logistic) model: the
+probability that a student of ability `theta` answers a question of
+difficulty `b` correctly is `1 / (1 + exp(b - theta))`. The difficulties
+are precomputed offline from the item statistics (see the
+`calibrate-items` command) and stored on the questions.
+
+An item bank holds the questions of a quiz sorted by difficulty in
+parallel arrays, so the next question, the one whose difficulty is closest
+to the current ability estimate, is found with a binary search instead
+of a query.
+
+Classes:
+    ItemBank: The questions of a quiz, sorted by difficulty.
+    ItemBankCache: A bounded LRU cache of item banks.
+
+Functions:
+    compile_item_bank: Builds the item bank of a quiz with one query.
+    estimate_ability: Estimates the ability of a student from
+    their answers.
+
+Attributes:
+    item_banks (ItemBankCache): The cache used by the application,
+    initialized in `create_app`.
+'''
+
+from app.extensions import db
+from app.models import Question
+from app.answer_keys import AnswerKeyCache
+from array import array
+from bisect import bisect_left
+from math import exp
+from sqlalchemy import select
+
+
+class ItemBank:
+    '''
+    The questions of a quiz, sorted by difficulty.
+
+    Attributes:
+        question_ids (array): The question IDs.
+        difficulties (array): The difficulty of each question, ascending.
+        correct_options (str): The correct option of each question.
+        positions (dict): The index of each question, keyed by ID
+        as a string.
+    '''
+
+    __slots__ = (
+            'question_ids',
+            'difficulties',
+            'correct_options',
+            'positions'
+            )
+
+    def __init__(self, rows):
+        '''
+        Creates an item bank.
+
+        Args:
+            rows (list): `(id, correct_option, difficulty)` tuples,
+            sorted by difficulty.
+        '''
+
+        self.question_ids = array('q', (row[0] for row in rows))
+        self.difficulties = array('d', (row[2] for row in rows))
+        self.correct_options = ''.join(row[1] for row in rows)
+        self.positions = {
+                str(question_id): index
+                for index, question_id in enumerate(self.question_ids)
+                }
+
+    def __len__(self):
+        '''
+        Returns the number of questions of the bank.
+        '''
+
+        return len(self.question_ids)
+
+    def next_item(self, ability, used):
+        '''
+        Returns the unused question that is the most informative for
+        a given ability.
+
+        Under the Rasch model, this is the question whose difficulty is
+        the closest to the ability. It is found with a binary search, then
+        by walking outwards past the questions already used.
+
+        Args:
+            ability (float): The current ability estimate.
+            used (set): The indexes of the questions already asked.
+
+        Returns:
+            int or None: The index of the question, or None if every
+            question was used.
+        '''
+
+        difficulties = self.difficulties
+        size = len(difficulties)
+        upper = bisect_left(difficulties, ability)
+        lower = upper - 1
+        while lower >= 0 or upper < size:
+            if upper >= size or (
+                    lower >= 0
+                    and ability - difficulties[lower]
+                    <= difficulties[upper] - ability):
+                index = lower
+                lower -= 1
+            else:
+                index = upper
+                upper += 1
+            if index not in used:
+                return index
+        return None
+
+
+def compile_item_bank(quiz_id):
+    '''
+    Builds the item bank of a quiz with one query.
+
+    Questions that were not calibrated yet get a difficulty of 0.
+
+    Args:
+        quiz_id (int): The ID of the quiz.
+
+    Returns:
+        ItemBank: The item bank (empty if the quiz has no questions).
+    '''
+
+    rows = db.session.execute(
+            select(
+                Question.id,
+                Question.correct_option,
+                Question.difficulty
+                ).where(Question.quiz_id == quiz_id)
+            ).all()
+    return ItemBank(sorted(
+        ((question_id, option, difficulty or 0.0)
+         for question_id, option, difficulty in rows),
+        key=lambda row: (row[2], row[0])
+        ))
+
+
+def estimate_ability(difficulties, responses, iterations=20):
+    '''
+    Estimates the ability of a student from their answers.
+
+    This is the maximum a posteriori estimate under the Rasch model with
+    a standard normal prior, computed with Newton's method. The prior
+    keeps the estimate finite when every answer is right (or wrong).
+
+    Args:
+        difficulties (list): The difficulty of each question asked.
+        responses (list): Whether each answer was correct.
+        iterations (int, optional): The maximum number of Newton steps.
+
+    Returns:
+        float: The ability estimate.
+    '''
+
+    ability = 0.0
+    for _ in range(iterations):
+        gradient = -ability
+        information = 1.0
+        for difficulty, correct in zip(difficulties, responses):
+            probability = 1 / (1 + exp(difficulty - ability))
+            gradient += correct - probability
+            information += probability * (1 - probability)
+        step = gradient / information
+        ability += step
+        if abs(step) < 1e-6:
+            break
+    return ability
+
+
+class ItemBankCache(AnswerKeyCache):
+    '''
+    A bounded LRU cache of item banks, keyed by quiz ID.
+
+    Item banks are invalidated like answer keys, whenever the version
+    of the quiz changes, including when the `calibrate-items` command
+    updates the difficulties from another process.
+    '''
+
+    size_setting = 'ITEM_BANK_CACHE_SIZE'
+    extension_name = 'item_banks'
+
+    def compile(self, quiz_id):
+        '''
+        Builds the item bank of a quiz.
+
+        Args:
+            quiz_id (int): The ID of the quiz.
+
+        Returns:
+            ItemBank: The item bank of the quiz.
+        '''
+
+        return compile_item_bank(quiz_id)
+
+
+item_banks = ItemBankCache()
@@ -0,0 +1,224 @@
+'''
+app/item_stats.py
+
+This module maintains the item statistics of the questions and computes
+the item analysis of a quiz from them.
+
+Every graded submission adds to the counters of each question of the quiz
+(see `QuestionStat`): the option picked, whether it was correct, and the
+sums of quiz scores needed for the discrimination index. The analysis is
+then computed from the counters alone, without reading any attempt.
+
+Functions:
+    collect_item_stats: Adds up the counters of a batch of results.
+    save_item_stats: Adds the counters of a batch of results
+    to the stored ones.
+    item_analysis: Computes the item analysis of a quiz.
+'''
+
+from app.extensions import db
+from app.models import QuestionStat
+from app.answer_keys import answer_keys, stored_question_ids
+from app.packed_answers import unpack_answers
+from app.upsert import upsert
+from sqlalchemy import bindparam, insert, select, update
+from math import sqrt
+
+COUNTERS = (
+        'responses',
+        'count_a',
+        'count_b',
+        'count_c',
+        'count_d',
+        'correct',
+        'sum_score',
+        'sum_score_sq',
+        'sum_score_correct'
+        )
+
+
+def collect_item_stats(results):
+    '''
+    Adds up the counters of a batch of results.
+
+    The selected options are read from the packed answers of each result
+    and matched with its questions, and the correct ones are read from the
+    cached answer key of the quiz. Questions deleted from the quiz since
+    the result was graded are left out.
+
+    Args:
+        results (list): Graded results, as returned by `grade_submission`.
+
+    Returns:
+        dict: The counters to add to each question, keyed by question ID.
+    '''
+
+    stats = {}
+    options = {}
+    for result in results:
+        quiz_id = result['quiz_id']
+        correct_options = options.get(quiz_id)
+        if correct_options is None:
+            answer_key = answer_keys.get(quiz_id)
+            correct_options = options[quiz_id] = dict(zip(
+                answer_key.question_ids,
+                answer_key.correct_options
+                ))
+        question_ids = stored_question_ids(result['question_ids'])
+        score = result['score']
+        selected = unpack_answers(result['answers'], len(question_ids))
+        for question_id, option in zip(question_ids, selected):
+            correct_option = correct_options.get(question_id)
+            if correct_option is None:
+                continue
+            row = stats.get(question_id)
+            if row is None:
+                row = stats[question_id] = dict.fromkeys(COUNTERS, 0)
+                row['question_id'] = int(question_id)
+                row['quiz_id'] = quiz_id
+            row['responses'] += 1
+            row['sum_score'] += score
+            row['sum_score_sq'] += score * score
+            if option is not None:
+                row[f'count_{option}'] += 1
+            if option == correct_option:
+                row['correct'] += 1
+                row['sum_score_correct'] += score
+    return stats
+
+
+def save_item_stats(results):
+    '''
+    Adds the counters of a batch of results to the stored ones.
+
+    All the questions are written with a single `INSERT ... ON CONFLICT
+    DO UPDATE` statement that increments the counters in the database.
+    On dialects without `ON CONFLICT`, the missing rows are inserted
+    first, then all the counters are incremented with one batched
+    `UPDATE`. The caller commits the transaction.
+
+    Args:
+        results (list): Graded results, as returned by `grade_submission`.
+    '''
+
+    rows = list(collect_item_stats(results).values())
+    if not rows:
+        return
+    table = QuestionStat.__table__
+    dialect_insert = upsert(db.session.get_bind().dialect.name)
+    if dialect_insert is not None:
+        statement = dialect_insert(table)
+        statement = statement.on_conflict_do_update(
+                index_elements=[table.c.question_id],
+                set_={
+                    counter: table.c[counter] + statement.excluded[counter]
+                    for counter in COUNTERS
+                    }
+                )
+        db.session.execute(statement, rows)
+        return
+
+    existing = set(db.session.scalars(
+        select(table.c.question_id).where(
+            table.c.question_id.in_([row['question_id'] for row in rows])
+            )
+        ))
+    missing = [
+            dict(
+                dict.fromkeys(COUNTERS, 0),
+                question_id=row['question_id'],
+                quiz_id=row['quiz_id']
+                )
+            for row in rows
+            if row['question_id'] not in existing
+            ]
+    if missing:
+        db.session.execute(insert(table), missing)
+    db.session.execute(
+            update(table).where(
+                table.c.question_id == bindparam('b_question_id')
+                ).values({
+                    counter: table.c[counter] + bindparam(f'b_{counter}')
+                    for counter in COUNTERS
+                    }),
+            [
+                {f'b_{key}': value for key, value in row.items()}
+                for row in rows
+                ]
+            )
+
+
+def _discrimination(stat):
+    '''
+    Computes the discrimination index of a question.
+
+    This is the item-rest point-biserial correlation: the correlation
+    between answering the question correctly and the score on the other
+    questions of the quiz.
+
+    Args:
+        stat (Row): The counters of the question.
+
+    Returns:
+        float or None: The correlation, between -1 and 1, or None when
+        it is undefined (no responses, or no variation).
+    '''
+
+    n = stat.responses
+    if not n:
+        return None
+    correct = stat.correct
+    rest = stat.sum_score - correct
+    rest_sq = stat.sum_score_sq - 2 * stat.sum_score_correct + correct
+    cross = stat.sum_score_correct - correct
+    p = correct / n
+    covariance = cross / n - p * rest / n
+    variance = (p * (1 - p)) * (rest_sq / n - (rest / n) ** 2)
+    if variance <= 0:
+        return None
+    return round(covariance / sqrt(variance), 4)
+
+
+def item_analysis(quiz_id):
+    '''
+    Computes the item analysis of a quiz.
+
+    Args:
+        quiz_id (int): The ID of the quiz.
+
+    Returns:
+        list: One dictionary per question that has statistics, ordered
+        by question ID, with `id`, `responses`, `difficulty` (the share
+        of correct answers), `discrimination`, `options` (the share of
+        each option) and `unanswered` (the share of blank answers).
+    '''
+
+    stats = db.session.execute(
+            select(QuestionStat).where(
+                QuestionStat.quiz_id == quiz_id
+                ).order_by(QuestionStat.question_id)
+            ).scalars()
+    analysis = []
+    for stat in stats:
+        n = stat.responses or 1
+        counts = {
+                'a': stat.count_a,
+                'b': stat.count_b,
+                'c': stat.count_c,
+                'd': stat.count_d
+                }
+        analysis.append({
+            'id': stat.question_id,
+            'responses': stat.responses,
+            'difficulty': round(stat.correct / n, 4),
+            'discrimination': _discrimination(stat),
+            'options': {
+                option: round(count / n, 4)
+                for option, count in counts.items()
+                },
+            'unanswered': round(
+                (stat.responses - sum(counts.values())) / n,
+                4
+                )
+            })
+    return analysis
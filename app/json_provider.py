@@ -0,0 +1,176 @@
+'''
+app/json_provider.py
+
+This module defines the JSON provider used by `jsonify` and the API routes.
+
+The provider extends Flask's `DefaultJSONProvider` with:
+    - Pre-encoded passthrough: `PreEncoded` payloads (e.g. cached quiz JSON)
+    are sent as they are, without being decoded and encoded again.
+    - Compact output: `JSON_COMPACT` controls whether separators without
+    spaces are used (True), output is indented (False) or Flask's default
+    applies (None: indented in debug mode only).
+    - Fast encoding: when `JSON_FAST_ENCODER` is set and `orjson` is
+    installed, it is used to encode; otherwise the standard library is used.
+    Note that `orjson` writes non-ASCII characters as UTF-8 instead of
+    escaping them.
+
+Classes:
+    PreEncoded: Wraps an already encoded JSON payload.
+    QuizJSONProvider: The JSON provider registered in `create_app`.
+'''
+
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None
+
+
+class PreEncoded:
+    '''
+    Wraps an already encoded JSON payload so that it is sent as it is.
+
+    Attributes:
+        payload (bytes): The encoded JSON.
+    '''
+
+    __slots__ = ('payload',)
+
+    def __init__(self, payload):
+        '''
+        Wraps a payload.
+
+        Args:
+            payload (bytes): The encoded JSON.
+        '''
+
+        self.payload = payload
+
+
+class QuizJSONProvider(DefaultJSONProvider):
+    '''
+    JSON provider with pre-encoded passthrough, compact separators and
+    an optional fast encoder.
+
+    Attributes:
+        fast (bool): Whether `orjson` is used to encode.
+        item_separator (bytes): The separator between items of an array
+        or object, used when splicing pre-encoded payloads.
+        key_separator (bytes): The separator between a key and its value.
+    '''
+
+    def __init__(self, app):
+        '''
+        Creates the provider from the application's configuration.
+
+        Args:
+            app (Flask): The Flask application instance.
+        '''
+
+        super().__init__(app)
+        self.compact = app.config['JSON_COMPACT']
+        self.fast = bool(app.config['JSON_FAST_ENCODER']) and (
+                orjson is not None
+                )
+        if self.is_compact():
+            self.item_separator, self.key_separator = b',', b':'
+        else:
+            self.item_separator, self.key_separator = b', ', b': '
+
+    def is_compact(self):
+        '''
+        Returns whether the output is compact, following Flask's rules
+        for `compact`.
+
+        Returns:
+            bool: True if separators without spaces are used.
+        '''
+
+        if self.compact is None:
+            return not self._app.debug
+        return self.compact
+
+    def dumps_bytes(self, obj):
+        '''
+        Serializes data as UTF-8 encoded JSON.
+
+        Args:
+            obj: The data to serialize.
+
+        Returns:
+            bytes: The encoded JSON.
+        '''
+
+        if self.fast:
+            option = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+            if self.sort_keys:
+                option |= orjson.OPT_SORT_KEYS
+            if not self.is_compact():
+                option |= orjson.OPT_INDENT_2
+            return orjson.dumps(obj, default=self.default, option=option)
+        return self.dumps(obj).encode('utf-8')
+
+    def dumps(self, obj, **kwargs):
+        '''
+        Serializes data as JSON to a string.
+
+        Without keyword arguments, the configured encoder and separators
+        are used. Keyword arguments are passed to `json.dumps`.
+
+        Args:
+            obj: The data to serialize.
+            **kwargs: Passed to `json.dumps`.
+
+        Returns:
+            str: The JSON.
+        '''
+
+        if kwargs:
+            return super().dumps(obj, **kwargs)
+        if self.fast:
+            return self.dumps_bytes(obj).decode('utf-8')
+        if self.is_compact():
+            return super().dumps(obj, separators=(',', ':'))
+        return super().dumps(obj, indent=2)
+
+    def loads(self, s, **kwargs):
+        '''
+        Deserializes data from JSON.
+
+        Args:
+            s (str or bytes): The JSON.
+            **kwargs: Passed to `json.loads`.
+
+        Returns:
+            The deserialized data.
+        '''
+
+        if self.fast and not kwargs:
+            return orjson.loads(s)
+        return super().loads(s, **kwargs)
+
+    def response(self, *args, **kwargs):
+        '''
+        Serializes the given arguments as JSON and returns a response.
+
+        A single `PreEncoded` argument is sent as it is.
+
+        Args:
+            *args: A single value to serialize, or multiple values
+            to serialize as a list.
+            **kwargs: Values to serialize as a dict.
+
+        Returns:
+            Response: A response with the JSON mimetype.
+        '''
+
+        obj = self._prepare_response_obj(args, kwargs)
+        if isinstance(obj, PreEncoded):
+            payload = obj.payload
+        else:
+            payload = self.dumps_bytes(obj)
+        return self._app.response_class(
+                payload + b'\n',
+                mimetype=self.mimetype
+                )
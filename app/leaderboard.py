@@ -0,0 +1,507 @@
+'''
+app/leaderboard.py
+
+This module maintains the leaderboard read model (see `LeaderboardEntry`)
+and reads the leaderboards from it.
+
+The entries are written in the same transaction as the result rollups,
+with the names of the users and the titles of the quizzes copied in, so
+reading a leaderboard takes one query on an index. The names are
+refreshed on every write and when a user edits their profile.
+
+The score histogram of each quiz (see `ScoreBucket`) is updated with the
+entries: the bucket of the previous percent of a user, read from the
+entry locked for the update, is decremented and the bucket of the new one
+incremented. The rank and percentile of a user
+on a quiz are then computed from the 101 buckets of the quiz, however many
+users took it. The daily buckets of the leaderboards of a period and the
+overall standings of the users are updated with the entries (see
+`app.leaderboard_windows` and `app.standings`).
+
+Concurrent reads of the same leaderboard are coalesced. Their key holds
+the generation of the results, incremented whenever a transaction of this
+process that wrote results or leaderboard rows commits (see
+`app.events.results_saved`), so a read started after a write is never
+answered with a read started before it. Writes committed by other
+processes are only seen by reads started after them.
+
+Functions:
+    save_leaderboard: Writes the leaderboard entries of result rollups
+    and updates the score histograms, daily buckets and standings.
+    rebuild_histogram: Rebuilds the score histograms from the entries.
+    rebuild_leaderboard: Rebuilds every entry, histogram, daily bucket
+    and standing from the stored results.
+    top_entries: Returns the best leaderboard entries, overall
+    or on a quiz.
+    rank_entries: Numbers leaderboard entries with their rank.
+    ranked_leaderboard: Returns a ranked leaderboard, coalescing
+    concurrent identical reads.
+    user_rank: Returns the rank and percentile of a user on a quiz.
+'''
+
+from app.extensions import db, single_flight
+from app.events import mark_results_saved, results_saved
+from app.models import (
+        LeaderboardEntry,
+        Quiz,
+        QuizResult,
+        ScoreBucket,
+        User
+        )
+from app.upsert import upsert
+from app.leaderboard_windows import (
+        rebuild_days,
+        save_daily_scores,
+        window_entries
+        )
+from app.standings import rebuild_standings, save_standings
+from collections import Counter
+from threading import Lock
+from sqlalchemy import (
+        Integer,
+        bindparam,
+        case,
+        cast,
+        delete,
+        func,
+        insert,
+        select,
+        tuple_,
+        update
+        )
+
+_generation_lock = Lock()
+_generation = 0
+
+
+def _names(rollups):
+    '''
+    Looks up the names needed by the entries of result rollups.
+
+    Args:
+        rollups (dict): The rollup rows, keyed by `(user_id, quiz_id)`.
+
+    Returns:
+        tuple: The rows of the users (with `name` and `username`)
+        and the titles of the quizzes, both keyed by ID.
+    '''
+
+    users = {
+            row.id: row
+            for row in db.session.execute(
+                select(User.id, User.name, User.username).where(
+                    User.id.in_({user_id for user_id, _ in rollups})
+                    )
+                )
+            }
+    quizzes = dict(db.session.execute(
+        select(Quiz.id, Quiz.title).where(
+            Quiz.id.in_({quiz_id for _, quiz_id in rollups})
+            )
+        ).all())
+    return users, quizzes
+
+
+def save_leaderboard(rollups, results):
+    '''
+    Writes the leaderboard entries of result rollups and updates
+    the score histograms, daily buckets and standings.
+
+    The new entries are inserted first, with one `INSERT ... ON CONFLICT
+    DO NOTHING RETURNING` statement that reports which ones it created.
+    The previous score and percent of the other entries are then read with
+    `SELECT ... FOR UPDATE`, to move their users out of their old bucket
+    and to compute the changes of their standings, and the entries are
+    updated with one batched statement. The lock serializes concurrent
+    writes of the same entry, so each one computes its changes from the
+    values left by the previous one. On dialects without `ON CONFLICT`,
+    the entries are looked up and locked first, then updated and inserted
+    with batched statements. The caller commits the transaction.
+
+    Args:
+        rollups (dict): The rollup rows, keyed by `(user_id, quiz_id)`,
+        as built by `save_results`.
+        results (list): The graded results of the rollups.
+    '''
+
+    users, quizzes = _names(rollups)
+    rows = {
+            (user_id, quiz_id): {
+                'user_id': user_id,
+                'quiz_id': quiz_id,
+                'score': rollup['score'],
+                'percent': rollup['percent'],
+                'name': users[user_id].name,
+                'username': users[user_id].username,
+                'quiz_title': quizzes[quiz_id],
+                'timestamp': rollup['timestamp']
+                }
+            for (user_id, quiz_id), rollup in rollups.items()
+            }
+    dialect_insert = upsert(db.session.get_bind().dialect.name)
+    inserted = set()
+    if dialect_insert is not None:
+        statement = dialect_insert(LeaderboardEntry).on_conflict_do_nothing(
+                index_elements=[
+                    LeaderboardEntry.user_id,
+                    LeaderboardEntry.quiz_id
+                    ]
+                ).returning(LeaderboardEntry.user_id, LeaderboardEntry.quiz_id)
+        inserted = {
+                tuple(row)
+                for row in db.session.execute(statement, list(rows.values()))
+                }
+    pairs = [pair for pair in rows if pair not in inserted]
+    existing = {}
+    if pairs:
+        existing = {
+                (row.user_id, row.quiz_id): row
+                for row in db.session.execute(
+                    select(
+                        LeaderboardEntry.user_id,
+                        LeaderboardEntry.quiz_id,
+                        LeaderboardEntry.id,
+                        LeaderboardEntry.score,
+                        LeaderboardEntry.percent
+                        ).where(
+                            tuple_(
+                                LeaderboardEntry.user_id,
+                                LeaderboardEntry.quiz_id
+                                ).in_(pairs)
+                            ).with_for_update()
+                    )
+                }
+    updates = [
+            dict(rows[pair], id=stored.id)
+            for pair, stored in existing.items()
+            ]
+    inserts = [rows[pair] for pair in pairs if pair not in existing]
+    if updates:
+        db.session.execute(update(LeaderboardEntry), updates)
+    if inserts:
+        db.session.execute(insert(LeaderboardEntry), inserts)
+
+    deltas = Counter()
+    standings = {}
+    for (user_id, quiz_id), row in rows.items():
+        standing = standings.get(user_id)
+        if standing is None:
+            standing = standings[user_id] = {
+                    'user_id': user_id,
+                    'name': row['name'],
+                    'username': row['username'],
+                    'total_score': 0,
+                    'quizzes_completed': 0,
+                    'percent_sum': 0
+                    }
+        standing['total_score'] += row['score']
+        standing['percent_sum'] += row['percent']
+        stored = existing.get((user_id, quiz_id))
+        if stored is not None:
+            deltas[(quiz_id, int(stored.percent))] -= 1
+            standing['total_score'] -= stored.score
+            standing['percent_sum'] -= stored.percent
+        else:
+            standing['quizzes_completed'] += 1
+        deltas[(quiz_id, int(row['percent']))] += 1
+    _save_buckets(dialect_insert, deltas)
+    save_daily_scores(results, users, quizzes)
+    save_standings(list(standings.values()))
+    mark_results_saved(db.session)
+
+
+def _save_buckets(dialect_insert, deltas):
+    '''
+    Adds changes to the counters of the score histograms.
+
+    Args:
+        dialect_insert (function): The `insert` of the dialect that
+        supports `ON CONFLICT`, or None.
+        deltas (Counter): The change of each bucket, keyed by
+        `(quiz_id, percent)`.
+    '''
+
+    rows = [
+            {'quiz_id': quiz_id, 'percent': percent, 'count': delta}
+            for (quiz_id, percent), delta in deltas.items()
+            if delta
+            ]
+    if not rows:
+        return
+    table = ScoreBucket.__table__
+    if dialect_insert is not None:
+        statement = dialect_insert(table)
+        statement = statement.on_conflict_do_update(
+                index_elements=[table.c.quiz_id, table.c.percent],
+                set_={'count': table.c.count + statement.excluded.count}
+                )
+        db.session.execute(statement, rows)
+        return
+
+    existing = set(db.session.execute(
+        select(table.c.quiz_id, table.c.percent).where(
+            tuple_(table.c.quiz_id, table.c.percent).in_(list(deltas))
+            )
+        ).all())
+    missing = [
+            dict(row, count=0)
+            for row in rows
+            if (row['quiz_id'], row['percent']) not in existing
+            ]
+    if missing:
+        db.session.execute(insert(table), missing)
+    db.session.execute(
+            update(table).where(
+                table.c.quiz_id == bindparam('b_quiz_id'),
+                table.c.percent == bindparam('b_percent')
+                ).values(count=table.c.count + bindparam('b_count')),
+            [
+                {f'b_{key}': value for key, value in row.items()}
+                for row in rows
+                ]
+            )
+
+
+def rebuild_histogram(quiz_id=None):
+    '''
+    Rebuilds the score histograms from the leaderboard entries.
+
+    The caller commits the transaction.
+
+    Args:
+        quiz_id (int, optional): The ID of the quiz whose histogram is
+        rebuilt. All the histograms are rebuilt by default.
+    '''
+
+    bucket = cast(LeaderboardEntry.percent, Integer)
+    counts = select(
+            LeaderboardEntry.quiz_id,
+            bucket,
+            func.count()
+            ).group_by(LeaderboardEntry.quiz_id, bucket)
+    statement = delete(ScoreBucket)
+    if quiz_id is not None:
+        counts = counts.where(LeaderboardEntry.quiz_id == quiz_id)
+        statement = statement.where(ScoreBucket.quiz_id == quiz_id)
+    db.session.execute(statement)
+    db.session.execute(insert(ScoreBucket).from_select(
+        ('quiz_id', 'percent', 'count'),
+        counts
+        ))
+
+
+def rebuild_leaderboard():
+    '''
+    Rebuilds every leaderboard entry, histogram, daily bucket and
+    standing from the stored results.
+
+    The entries are replaced with one `INSERT ... SELECT` statement over
+    the results joined with their users and quizzes, the histograms and
+    standings with one statement each over the entries and the daily
+    buckets with a last one over the recent attempts, and committed.
+
+    Returns:
+        int: The number of entries.
+    '''
+
+    db.session.execute(delete(LeaderboardEntry))
+    columns = (
+            'user_id',
+            'quiz_id',
+            'score',
+            'percent',
+            'name',
+            'username',
+            'quiz_title',
+            'timestamp'
+            )
+    db.session.execute(insert(LeaderboardEntry).from_select(
+        columns,
+        select(
+            QuizResult.user_id,
+            QuizResult.quiz_id,
+            QuizResult.score,
+            QuizResult.percent,
+            User.name,
+            User.username,
+            Quiz.title,
+            QuizResult.timestamp
+            ).join(User, User.id == QuizResult.user_id).join(
+                Quiz,
+                Quiz.id == QuizResult.quiz_id
+                )
+        ))
+    rebuild_histogram()
+    rebuild_days()
+    rebuild_standings()
+    mark_results_saved(db.session)
+    db.session.commit()
+    return db.session.scalar(
+            select(func.count()).select_from(LeaderboardEntry)
+            )
+
+
+def top_entries(limit=10, quiz_id=None):
+    '''
+    Returns the best leaderboard entries, overall or on a quiz.
+
+    Args:
+        limit (int, optional): The number of entries.
+        quiz_id (int, optional): The ID of the quiz, for the leaderboard
+        of a single quiz.
+
+    Returns:
+        list: The rows of the entries (with the `LeaderboardEntry`
+        columns) with the highest percent scores, best first.
+    '''
+
+    statement = select(*LeaderboardEntry.__table__.c)
+    if quiz_id is not None:
+        statement = statement.where(LeaderboardEntry.quiz_id == quiz_id)
+    return db.session.execute(
+            statement.order_by(
+                LeaderboardEntry.percent.desc(),
+                LeaderboardEntry.id
+                ).limit(limit)
+            ).all()
+
+
+def rank_entries(entries, key='percent'):
+    '''
+    Numbers leaderboard entries with their rank.
+
+    Entries with the same value share a rank, and the next rank skips
+    as many places.
+
+    Args:
+        entries (list): The best entries, as returned by `top_entries`.
+        key (str, optional): The attribute the entries are ranked by.
+
+    Returns:
+        list: `(rank, entry)` tuples.
+    '''
+
+    ranked = []
+    previous = None
+    for index, entry in enumerate(entries):
+        value = getattr(entry, key)
+        if not ranked or value != previous:
+            rank = index + 1
+            previous = value
+        ranked.append((rank, entry))
+    return ranked
+
+
+def _ranked_leaderboard(limit, quiz_id, window):
+    '''
+    Reads and ranks a leaderboard.
+
+    Args:
+        limit (int): The number of entries.
+        quiz_id (int or None): The ID of the quiz, if any.
+        window (str): `all`, or one of the periods of
+        `app.leaderboard_windows`.
+
+    Returns:
+        list: `(rank, row)` tuples.
+    '''
+
+    if window == 'all':
+        return rank_entries(top_entries(limit, quiz_id))
+    return rank_entries(window_entries(window, limit, quiz_id))
+
+
+@results_saved.connect
+def _on_results_saved(sender):
+    '''
+    Increments the generation of the results.
+
+    Args:
+        sender: The session that committed the results.
+    '''
+
+    global _generation
+    with _generation_lock:
+        _generation += 1
+
+
+def ranked_leaderboard(limit=10, quiz_id=None, window='all'):
+    '''
+    Returns a ranked leaderboard, coalescing concurrent identical reads.
+
+    When many users open the same leaderboard at once, it is read once
+    and shared (see `SingleFlight`). The key includes the generation of
+    the results, so a request made after results were saved by this
+    process starts a new read instead of waiting for an older one.
+
+    Args:
+        limit (int, optional): The number of entries.
+        quiz_id (int, optional): The ID of the quiz, for the leaderboard
+        of a single quiz.
+        window (str, optional): `all` (default), or one of the periods
+        of `app.leaderboard_windows`.
+
+    Returns:
+        list: `(rank, row)` tuples, best first.
+    '''
+
+    return single_flight.do(
+            ('leaderboard', _generation, limit, quiz_id, window),
+            _ranked_leaderboard,
+            limit,
+            quiz_id,
+            window
+            )
+
+
+def user_rank(user_id, quiz_id):
+    '''
+    Returns the rank and percentile of a user on a quiz.
+
+    The latest percent of the user is read from their entry, then the
+    users above, in the same bucket and in total are added up from the
+    histogram of the quiz with one aggregate query.
+
+    Args:
+        user_id (int): The ID of the user.
+        quiz_id (int): The ID of the quiz.
+
+    Returns:
+        dict or None: The `percent` of the user, their `rank` (1 for the
+        best bucket), the `total` number of users and the `percentile`
+        (the share of users below, counting half of the bucket of the
+        user), or None if the user did not take the quiz or the histogram
+        of the quiz is empty (before `rebuild-leaderboard` was run).
+    '''
+
+    percent = db.session.scalar(
+            select(LeaderboardEntry.percent).where(
+                LeaderboardEntry.user_id == user_id,
+                LeaderboardEntry.quiz_id == quiz_id
+                )
+            )
+    if percent is None:
+        return None
+    bucket = int(percent)
+    above, same, total = db.session.execute(
+            select(
+                func.sum(case(
+                    (ScoreBucket.percent > bucket, ScoreBucket.count),
+                    else_=0
+                    )),
+                func.sum(case(
+                    (ScoreBucket.percent == bucket, ScoreBucket.count),
+                    else_=0
+                    )),
+                func.sum(ScoreBucket.count)
+                ).where(ScoreBucket.quiz_id == quiz_id)
+            ).one()
+    if not total:
+        return None
+    below = total - above - same
+    return {
+            'percent': percent,
+            'rank': above + 1,
+            'total': total,
+            'percentile': round((below + same / 2) / total * 100, 2)
+            }
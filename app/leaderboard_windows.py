@@ -0,0 +1,313 @@
+'''
+app/leaderboard_windows.py
+
+This module maintains the daily leaderboard buckets (see `LeaderboardDay`)
+and reads the leaderboards of a period (today, this week or this month)
+from them.
+
+Every saved result raises the best percent of its user on its quiz for
+the UTC day of the result. The leaderboard of a period is then merged from
+the best rows of each of its days, at most 31 small indexed reads, instead
+of filtering and sorting the attempts. Buckets older than
+`LEADERBOARD_RETENTION_DAYS` are deleted by the first write of each day.
+
+Functions:
+    window_start: Returns the first day of a period.
+    save_daily_scores: Raises the daily best scores of a batch of results.
+    purge_days: Deletes the buckets older than the retention period.
+    rebuild_days: Rebuilds the buckets of the retention period
+    from the attempts.
+    window_entries: Returns the best entries of a period.
+
+Attributes:
+    WINDOWS (tuple): The names of the periods.
+'''
+
+from app.extensions import db
+from app.models import LeaderboardDay, Quiz, QuizAttempt, User
+from app.upsert import upsert
+from datetime import datetime, timedelta
+from flask import current_app
+from sqlalchemy import Date, case, cast, delete, func, insert, select, update
+
+WINDOWS = ('today', 'week', 'month')
+
+_last_purge = None
+
+
+def window_start(window, today):
+    '''
+    Returns the first day of a period.
+
+    Weeks start on Monday, and months on their first day.
+
+    Args:
+        window (str): One of `WINDOWS`.
+        today (date): The current UTC day.
+
+    Returns:
+        date: The first day of the period that contains `today`.
+    '''
+
+    if window == 'week':
+        return today - timedelta(days=today.weekday())
+    if window == 'month':
+        return today.replace(day=1)
+    return today
+
+
+def save_daily_scores(results, users, quizzes):
+    '''
+    Raises the daily best scores of a batch of results.
+
+    The rows are written with a single `INSERT ... ON CONFLICT DO UPDATE`
+    statement that keeps the greater percent, or, on dialects without
+    `ON CONFLICT`, updated and inserted after looking up the existing
+    ones. The first call of each day also purges the expired buckets.
+    The caller commits the transaction.
+
+    Args:
+        results (list): Graded results, as returned by `grade_submission`.
+        users (dict): The rows of the users (with `name` and `username`),
+        keyed by ID.
+        quizzes (dict): The titles of the quizzes, keyed by ID.
+    '''
+
+    rows = {}
+    for result in results:
+        key = (
+                result['timestamp'].date(),
+                result['user_id'],
+                result['quiz_id']
+                )
+        row = rows.get(key)
+        if row is None:
+            user = users[result['user_id']]
+            rows[key] = {
+                    'day': key[0],
+                    'user_id': key[1],
+                    'quiz_id': key[2],
+                    'percent': result['percent'],
+                    'name': user.name,
+                    'username': user.username,
+                    'quiz_title': quizzes[key[2]]
+                    }
+        elif result['percent'] > row['percent']:
+            row['percent'] = result['percent']
+
+    dialect_insert = upsert(db.session.get_bind().dialect.name)
+    if dialect_insert is not None:
+        statement = dialect_insert(LeaderboardDay)
+        excluded = statement.excluded
+        statement = statement.on_conflict_do_update(
+                index_elements=[
+                    LeaderboardDay.day,
+                    LeaderboardDay.user_id,
+                    LeaderboardDay.quiz_id
+                    ],
+                set_={
+                    'percent': case(
+                        (
+                            LeaderboardDay.percent > excluded.percent,
+                            LeaderboardDay.percent
+                            ),
+                        else_=excluded.percent
+                        ),
+                    'name': excluded.name,
+                    'username': excluded.username,
+                    'quiz_title': excluded.quiz_title
+                    }
+                )
+        db.session.execute(statement, list(rows.values()))
+    else:
+        _save_daily_scores_with_lookup(rows)
+
+    today = datetime.utcnow().date()
+    if _last_purge != today:
+        purge_days(today)
+
+
+def _save_daily_scores_with_lookup(rows):
+    '''
+    Raises daily best scores by looking up the existing rows first.
+
+    Args:
+        rows (dict): The bucket rows, keyed by `(day, user_id, quiz_id)`.
+    '''
+
+    days = {day for day, _, _ in rows}
+    existing = {
+            (row.day, row.user_id, row.quiz_id): row
+            for row in db.session.execute(
+                select(
+                    LeaderboardDay.day,
+                    LeaderboardDay.user_id,
+                    LeaderboardDay.quiz_id,
+                    LeaderboardDay.id,
+                    LeaderboardDay.percent
+                    ).where(
+                        LeaderboardDay.day.in_(days),
+                        LeaderboardDay.user_id.in_(
+                            {user_id for _, user_id, _ in rows}
+                            ),
+                        LeaderboardDay.quiz_id.in_(
+                            {quiz_id for _, _, quiz_id in rows}
+                            )
+                        )
+                )
+            }
+    updates = []
+    inserts = []
+    for key, row in rows.items():
+        stored = existing.get(key)
+        if stored is None:
+            inserts.append(row)
+        else:
+            updates.append(dict(
+                row,
+                id=stored.id,
+                percent=max(stored.percent, row['percent'])
+                ))
+    if updates:
+        db.session.execute(update(LeaderboardDay), updates)
+    if inserts:
+        db.session.execute(insert(LeaderboardDay), inserts)
+
+
+def purge_days(today):
+    '''
+    Deletes the buckets older than the retention period.
+
+    The caller commits the transaction.
+
+    Args:
+        today (date): The current UTC day.
+    '''
+
+    global _last_purge
+    retention = current_app.config['LEADERBOARD_RETENTION_DAYS']
+    db.session.execute(delete(LeaderboardDay).where(
+        LeaderboardDay.day <= today - timedelta(days=retention)
+        ))
+    _last_purge = today
+
+
+def _day(column):
+    '''
+    Returns the UTC day of a timestamp column.
+
+    Args:
+        column (Column): The timestamp column.
+
+    Returns:
+        ColumnElement: The day of the timestamp, as stored by `Date`
+        columns of the dialect.
+    '''
+
+    if db.session.get_bind().dialect.name == 'sqlite':
+        return func.date(column)
+    return cast(column, Date)
+
+
+def rebuild_days(quiz_id=None):
+    '''
+    Rebuilds the buckets of the retention period from the attempts.
+
+    The buckets are replaced with one `INSERT ... SELECT` statement that
+    groups the attempts of the period by day, user and quiz. The caller
+    commits the transaction.
+
+    Args:
+        quiz_id (int, optional): The ID of the quiz whose buckets are
+        rebuilt. All the buckets are rebuilt by default.
+    '''
+
+    retention = current_app.config['LEADERBOARD_RETENTION_DAYS']
+    today = datetime.utcnow().date()
+    start = datetime.combine(
+            today - timedelta(days=retention - 1),
+            datetime.min.time()
+            )
+    day = _day(QuizAttempt.timestamp)
+    best = select(
+            day,
+            QuizAttempt.user_id,
+            QuizAttempt.quiz_id,
+            func.max(QuizAttempt.percent),
+            User.name,
+            User.username,
+            Quiz.title
+            ).join(User, User.id == QuizAttempt.user_id).join(
+                Quiz,
+                Quiz.id == QuizAttempt.quiz_id
+                ).where(QuizAttempt.timestamp >= start).group_by(
+                    day,
+                    QuizAttempt.user_id,
+                    QuizAttempt.quiz_id,
+                    User.name,
+                    User.username,
+                    Quiz.title
+                    )
+    statement = delete(LeaderboardDay)
+    if quiz_id is not None:
+        best = best.where(QuizAttempt.quiz_id == quiz_id)
+        statement = statement.where(LeaderboardDay.quiz_id == quiz_id)
+    db.session.execute(statement)
+    db.session.execute(insert(LeaderboardDay).from_select(
+        (
+            'day',
+            'user_id',
+            'quiz_id',
+            'percent',
+            'name',
+            'username',
+            'quiz_title'
+            ),
+        best
+        ))
+
+
+def window_entries(window, limit=10, quiz_id=None, today=None):
+    '''
+    Returns the best entries of a period.
+
+    The best `limit` rows of each day of the period are read, then merged
+    by keeping the best row of each user and quiz. This is exact: a row
+    among the best ones of the period is also among the best ones of the
+    day it was scored.
+
+    Args:
+        window (str): One of `WINDOWS`.
+        limit (int, optional): The number of entries.
+        quiz_id (int, optional): The ID of the quiz, for the leaderboard
+        of a single quiz.
+        today (date, optional): The current UTC day (defaults to today).
+
+    Returns:
+        list: The best rows of the period (with the `LeaderboardDay`
+        columns), one per user and quiz, best first.
+    '''
+
+    today = today or datetime.utcnow().date()
+    best = {}
+    day = window_start(window, today)
+    while day <= today:
+        statement = select(*LeaderboardDay.__table__.c).where(
+                LeaderboardDay.day == day
+                )
+        if quiz_id is not None:
+            statement = statement.where(LeaderboardDay.quiz_id == quiz_id)
+        for row in db.session.execute(
+                statement.order_by(
+                    LeaderboardDay.percent.desc(),
+                    LeaderboardDay.id
+                    ).limit(limit)
+                ):
+            key = (row.user_id, row.quiz_id)
+            if key not in best or row.percent > best[key].percent:
+                best[key] = row
+        day += timedelta(days=1)
+    return sorted(
+            best.values(),
+            key=lambda row: (-row.percent, row.day, row.id)
+            )[:limit]
@@ -9,9 +9,23 @@ It imports the following models:
     - Quiz: Represents a quiz in the system.
     - Question: Represents a question in a quiz.
     - QuizResult: Represents the result of a user taking a quiz.
+    - QuizAttempt: Represents one submission of a quiz by a user.
+    - QuestionStat: Holds the running item statistics of a question.
+    - LeaderboardEntry: The leaderboard row of a user on a quiz.
+    - ScoreBucket: One bucket of the score histogram of a quiz.
+    - LeaderboardDay: The best score of a user on a quiz during a day.
+    - UserStanding: The overall standing of a user over all quizzes.
+    - AdaptiveAttempt: The state of an adaptive quiz attempt in progress.
 '''
 
 from .user import User
 from .quiz import Quiz
 from .question import Question
 from .quiz_result import QuizResult
+from .quiz_attempt import QuizAttempt
+from .question_stat import QuestionStat
+from .leaderboard_entry import LeaderboardEntry
+from .score_bucket import ScoreBucket
+from .leaderboard_day import LeaderboardDay
+from .user_standing import UserStanding
+from .adaptive_attempt import AdaptiveAttempt
@@ -0,0 +1,66 @@
+'''
+app/models/adaptive_attempt.py
+
+This module defines the AdaptiveAttempt model for a Flask application.
+
+Classes:
+    AdaptiveAttempt: The state of an adaptive quiz attempt in progress.
+
+Attributes:
+    user_id (int): Part of the primary key, referencing the user.
+    quiz_id (int): Part of the primary key, referencing the quiz.
+    question_ids (str): Questions asked so far, comma-separated.
+    answers (str): Options selected so far, one character per answer.
+    ability (float): Running ability estimate of the user.
+    length (int): Number of questions of the attempt.
+    step (int): Number of times the attempt was saved.
+    started (datetime): Timestamp when the attempt was started.
+'''
+
+from app.extensions import db
+from datetime import datetime
+
+
+class AdaptiveAttempt(db.Model):
+    '''
+    The state of an adaptive quiz attempt in progress.
+
+    The state is kept on the server rather than in the session cookie,
+    so an earlier state cannot be replayed to answer a question again.
+    There is at most one attempt in progress per user and quiz, and it is
+    deleted once the attempt is graded. `step` is the version counter of
+    the row: saving a state that was changed concurrently fails instead
+    of overwriting it.
+
+    Attributes:
+        user_id (int): Identifier of the user taking the quiz.
+        quiz_id (int): Identifier of the quiz.
+        question_ids (str): Comma-separated IDs of the questions asked,
+        in order (empty before the first one).
+        answers (str): The option selected for each answered question,
+        in order, one character each ('-' when left blank).
+        ability (float): Ability estimate of the user after the answered
+        questions.
+        length (int): Number of questions of the attempt.
+        step (int): Number of times the attempt was saved.
+        started (datetime): The timestamp when the attempt was started.
+    '''
+
+    user_id = db.Column(
+            db.Integer,
+            db.ForeignKey('user.id'),
+            primary_key=True
+            )
+    quiz_id = db.Column(
+            db.Integer,
+            db.ForeignKey('quiz.id'),
+            primary_key=True
+            )
+    question_ids = db.Column(db.Text, nullable=False, default='')
+    answers = db.Column(db.Text, nullable=False, default='')
+    ability = db.Column(db.Float, nullable=False, default=0.0)
+    length = db.Column(db.Integer, nullable=False)
+    step = db.Column(db.Integer, nullable=False)
+    started = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+    __mapper_args__ = {'version_id_col': step}
@@ -0,0 +1,69 @@
+'''
+app/models/leaderboard_day.py
+
+This module defines the LeaderboardDay model for a Flask application.
+
+Classes:
+    LeaderboardDay: The best percent score of a user on a quiz during
+    one day, with the names needed to display it.
+
+Attributes:
+    id (int): Primary key for the bucket row.
+    day (date): The UTC day of the bucket.
+    user_id (int): Foreign key referencing the user.
+    quiz_id (int): Foreign key referencing the quiz.
+    percent (int): Best percent score of the user on the quiz that day.
+    name (str): Name of the user.
+    username (str): Username of the user.
+    quiz_title (str): Title of the quiz.
+'''
+
+from app.extensions import db
+
+
+class LeaderboardDay(db.Model):
+    '''
+    The best percent score of a user on a quiz during one day.
+
+    The rows of a day form a daily bucket of the leaderboard, maintained
+    as results are saved and deleted once they are older than the
+    retention period (see `app.leaderboard_windows`). The leaderboards
+    of a period are merged from the best rows of each of its days, read
+    with the `(day, percent)` or `(day, quiz_id, percent)` index.
+
+    Attributes:
+        id (int): Unique identifier for the bucket row.
+        day (date): The UTC day of the bucket.
+        user_id (int): Identifier of the user.
+        quiz_id (int): Identifier of the quiz.
+        percent (int): Best percent score of the user on the quiz
+        that day.
+        name (str): Name of the user.
+        username (str): Username of the user.
+        quiz_title (str): Title of the quiz.
+    '''
+
+    __table_args__ = (
+            db.UniqueConstraint(
+                'day',
+                'user_id',
+                'quiz_id',
+                name='uq_leaderboard_day_user_quiz'
+                ),
+            db.Index('ix_leaderboard_day_percent', 'day', 'percent'),
+            db.Index(
+                'ix_leaderboard_day_quiz_percent',
+                'day',
+                'quiz_id',
+                'percent'
+                ),
+            )
+
+    id = db.Column(db.Integer, primary_key=True)
+    day = db.Column(db.Date, nullable=False)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+    quiz_id = db.Column(db.Integer, db.ForeignKey('quiz.id'), nullable=False)
+    percent = db.Column(db.Integer, nullable=False)
+    name = db.Column(db.String(80), nullable=False)
+    username = db.Column(db.String(80), nullable=False)
+    quiz_title = db.Column(db.String(200), nullable=False)
@@ -0,0 +1,68 @@
+'''
+app/models/leaderboard_entry.py
+
+This module defines the LeaderboardEntry model for a Flask application.
+
+Classes:
+    LeaderboardEntry: The leaderboard row of a user on a quiz, with the
+    names needed to display it.
+
+Attributes:
+    id (int): Primary key for the entry.
+    user_id (int): Foreign key referencing the user.
+    quiz_id (int): Foreign key referencing the quiz.
+    score (int): Score of the latest attempt of the user.
+    percent (int): Percent score of the latest attempt of the user.
+    name (str): Name of the user.
+    username (str): Username of the user.
+    quiz_title (str): Title of the quiz.
+    timestamp (datetime): Timestamp of the latest attempt.
+'''
+
+from app.extensions import db
+
+
+class LeaderboardEntry(db.Model):
+    '''
+    The leaderboard row of a user on a quiz.
+
+    This is a read model of `QuizResult`: it is written with the results
+    (see `app.leaderboard`) and holds the user and quiz names, so the
+    leaderboard is read with one query on the `percent` index (or the
+    `(quiz_id, percent)` index for the leaderboard of a quiz), without
+    joining or loading the users and quizzes.
+
+    Attributes:
+        id (int): Unique identifier for the entry.
+        user_id (int): Identifier of the user.
+        quiz_id (int): Identifier of the quiz.
+        score (int): Score of the latest attempt of the user.
+        percent (int): Percent score of the latest attempt of the user.
+        name (str): Name of the user.
+        username (str): Username of the user.
+        quiz_title (str): Title of the quiz.
+        timestamp (datetime): Timestamp of the latest attempt.
+    '''
+
+    __table_args__ = (
+            db.UniqueConstraint(
+                'user_id',
+                'quiz_id',
+                name='uq_leaderboard_entry_user_quiz'
+                ),
+            db.Index(
+                'ix_leaderboard_entry_quiz_percent',
+                'quiz_id',
+                'percent'
+                ),
+            )
+
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+    quiz_id = db.Column(db.Integer, db.ForeignKey('quiz.id'), nullable=False)
+    score = db.Column(db.Integer, nullable=False, default=0)
+    percent = db.Column(db.Integer, nullable=False, index=True)
+    name = db.Column(db.String(80), nullable=False)
+    username = db.Column(db.String(80), nullable=False)
+    quiz_title = db.Column(db.String(200), nullable=False)
+    timestamp = db.Column(db.DateTime)
@@ -16,6 +16,7 @@ Attributes:
     option_c (str): Option C for the question.
     option_d (str): Option D for the question.
     correct_option (str): Indicates the correct option ('a', 'b', 'c', or 'd').
+    difficulty (float): Difficulty of the question for the adaptive mode.
 '''
 
 from app.extensions import db
@@ -36,6 +37,8 @@ class Question(db.Model):
         option_c (str): Third option.
         option_d (str): Fourth option.
         correct_option (str): Correct answer ('a', 'b', 'c', or 'd').
+        difficulty (float): Rasch difficulty of the question, precomputed
+        by the `calibrate-items` command (None until calibrated).
     '''
 
     id = db.Column(db.Integer, primary_key=True)
@@ -46,3 +49,4 @@ class Question(db.Model):
     option_c = db.Column(db.String(100), nullable=False)
     option_d = db.Column(db.String(100), nullable=False)
     correct_option = db.Column(db.String(1), nullable=False)  # a, b, c, or d
+    difficulty = db.Column(db.Float, nullable=True)
@@ -0,0 +1,70 @@
+'''
+app/models/question_stat.py
+
+This module defines the QuestionStat model for a Flask application.
+
+Classes:
+    QuestionStat: Holds the running item statistics of a question,
+    updated on every graded submission.
+
+Attributes:
+    question_id (int): Primary key, referencing the question.
+    quiz_id (int): Foreign key referencing the quiz of the question.
+    responses (int): Number of graded submissions of the quiz.
+    count_a (int): Number of submissions that picked option A.
+    count_b (int): Number of submissions that picked option B.
+    count_c (int): Number of submissions that picked option C.
+    count_d (int): Number of submissions that picked option D.
+    correct (int): Number of submissions that answered correctly.
+    sum_score (int): Sum of the quiz scores of all the submissions.
+    sum_score_sq (int): Sum of the squared quiz scores.
+    sum_score_correct (int): Sum of the quiz scores of the submissions
+    that answered correctly.
+'''
+
+from app.extensions import db
+
+
+class QuestionStat(db.Model):
+    '''
+    Holds the running item statistics of a question.
+
+    The counters are only ever incremented, so option shares, difficulty
+    and discrimination can be computed from them without rescanning
+    the attempts (see `app.item_stats`).
+
+    Attributes:
+        question_id (int): Identifier of the question.
+        quiz_id (int): Identifier of the quiz of the question.
+        responses (int): Number of graded submissions of the quiz.
+        count_a (int): Number of submissions that picked option A.
+        count_b (int): Number of submissions that picked option B.
+        count_c (int): Number of submissions that picked option C.
+        count_d (int): Number of submissions that picked option D.
+        correct (int): Number of submissions that answered correctly.
+        sum_score (int): Sum of the quiz scores of all the submissions.
+        sum_score_sq (int): Sum of the squared quiz scores.
+        sum_score_correct (int): Sum of the quiz scores of the submissions
+        that answered correctly.
+    '''
+
+    question_id = db.Column(
+            db.Integer,
+            db.ForeignKey('question.id'),
+            primary_key=True
+            )
+    quiz_id = db.Column(
+            db.Integer,
+            db.ForeignKey('quiz.id'),
+            nullable=False,
+            index=True
+            )
+    responses = db.Column(db.Integer, nullable=False, default=0)
+    count_a = db.Column(db.Integer, nullable=False, default=0)
+    count_b = db.Column(db.Integer, nullable=False, default=0)
+    count_c = db.Column(db.Integer, nullable=False, default=0)
+    count_d = db.Column(db.Integer, nullable=False, default=0)
+    correct = db.Column(db.Integer, nullable=False, default=0)
+    sum_score = db.Column(db.Integer, nullable=False, default=0)
+    sum_score_sq = db.Column(db.Integer, nullable=False, default=0)
+    sum_score_correct = db.Column(db.Integer, nullable=False, default=0)
@@ -9,6 +9,10 @@ Attributes:
     title (str): The title of the quiz.
     description (str): The description of the quiz.
     questions (list): List of related questions for the quiz.
+    version (int): Version of the quiz, bumped whenever the quiz or
+    its questions change.
+    draw_count (int): Number of questions drawn at random for each
+    attempt (None to use every question).
 '''
 
 from app.extensions import db
@@ -25,9 +29,16 @@ class Quiz(db.Model):
         title (str): Title of the quiz.
         description (str): Description of the quiz.
         questions (list): List of Question objects related to the quiz.
+        version (int): Version of the quiz, bumped whenever the quiz or
+        its questions change. Used to build API ETags.
+        draw_count (int): Number of questions drawn at random from the
+        quiz for each attempt, for quizzes used as question banks
+        (None to use every question).
     '''
 
     id = db.Column(db.Integer, primary_key=True)
     title = db.Column(db.String(200), nullable=False)
     description = db.Column(db.Text, nullable=True)
     questions = db.relationship('Question')
+    version = db.Column(db.Integer, nullable=False, default=1)
+    draw_count = db.Column(db.Integer, nullable=True)
@@ -0,0 +1,85 @@
+'''
+app/models/quiz_attempt.py
+
+This module defines the QuizAttempt model for a Flask application.
+
+Classes:
+    QuizAttempt: Represents one submission of a quiz by a user, with
+    the selected options packed into a binary blob.
+
+Attributes:
+    id (int): Primary key for the attempt.
+    user_id (int): Foreign key referencing the user who took the quiz.
+    quiz_id (int): Foreign key referencing the quiz taken by the user.
+    score (int): Score obtained in the attempt.
+    percent (int): Percent score obtained in the attempt.
+    question_count (int): Number of questions of the quiz at the time.
+    answers (bytes): Selected options, packed 3 bits per question.
+    duration (int): Time taken to submit the attempt, in seconds.
+    late (bool): Whether the attempt was submitted after the time limit.
+    seed (int): Seed the questions of the attempt were drawn with.
+    question_ids (str): Questions of the attempt, comma-separated.
+    ability (float): Ability estimate at the end of an adaptive attempt.
+    timestamp (datetime): Timestamp when the attempt was submitted.
+    user (User): The user who took the quiz.
+    quiz (Quiz): The quiz that the user took.
+'''
+
+from app.extensions import db
+from datetime import datetime
+
+
+class QuizAttempt(db.Model):
+    '''
+    Represents one submission of a quiz by a user.
+
+    Every submission is kept, while `QuizResult` holds the rollup of
+    the attempts of a user on a quiz. The selected options are packed
+    in the order of `question_ids` (see `app.packed_answers`), so they can
+    be mapped back to their questions however the quiz changes later.
+
+    Attributes:
+        id (int): Unique identifier for the attempt.
+        user_id (int): Identifier of the user who took the quiz.
+        quiz_id (int): Identifier of the quiz taken by the user.
+        score (int): Score obtained in the attempt.
+        percent (int): Percent score obtained in the attempt.
+        question_count (int): Number of questions of the quiz
+        at the time of the attempt.
+        answers (bytes): Selected options, packed 3 bits per question.
+        duration (int): Time taken to submit the attempt, in seconds
+        (None when unknown).
+        late (bool): Whether the attempt was submitted after the time
+        limit (when late submissions are flagged rather than refused).
+        seed (int): Seed the questions of the attempt were drawn with
+        (None when the attempt covered every question).
+        question_ids (str): Comma-separated IDs of the questions of the
+        attempt, in the order of the packed answers: by ID, or in the
+        order they were asked in adaptive mode (empty for a quiz without
+        questions).
+        ability (float): Ability estimate of the user at the end of
+        an adaptive attempt (None otherwise).
+        timestamp (datetime): The timestamp when the attempt was submitted.
+        user (User): The user who took the quiz.
+        quiz (Quiz): The quiz that the user took.
+    '''
+
+    __table_args__ = (
+            db.Index('ix_quiz_attempt_user_quiz', 'user_id', 'quiz_id'),
+            )
+
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+    quiz_id = db.Column(db.Integer, db.ForeignKey('quiz.id'), nullable=False)
+    score = db.Column(db.Integer, nullable=False)
+    percent = db.Column(db.Integer, nullable=False)
+    question_count = db.Column(db.Integer, nullable=False)
+    answers = db.Column(db.LargeBinary, nullable=False)
+    duration = db.Column(db.Integer)
+    late = db.Column(db.Boolean, nullable=False, default=False)
+    seed = db.Column(db.Integer)
+    question_ids = db.Column(db.Text, nullable=False)
+    ability = db.Column(db.Float)
+    timestamp = db.Column(db.DateTime, default=datetime.utcnow)
+    user = db.Relationship('User')
+    quiz = db.Relationship('Quiz')
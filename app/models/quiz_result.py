@@ -11,8 +11,11 @@ Attributes:
     id (int): Primary key for the quiz result.
     user_id (int): Foreign key referencing the user who took the quiz.
     quiz_id (int): Foreign key referencing the quiz taken by the user.
-    score (int): Score obtained by the user in the quiz.
-    percent (int): Percent score obtained by the user.
+    score (int): Score obtained by the user in the latest attempt.
+    percent (int): Percent score obtained in the latest attempt.
+    best_score (int): Best score obtained over all the attempts.
+    best_percent (int): Best percent score obtained over all the attempts.
+    attempt_count (int): Number of attempts of the user on the quiz.
     timestamp (datetime): Timestamp when the result was created or updated.
     user (User): The user who took the quiz.
     quiz (Quiz): The quiz that the user took.
@@ -27,23 +30,42 @@ class QuizResult(db.Model):
     '''
     Represents the result of a user taking a quiz.
 
+    A user has at most one result per quiz, which is enforced by a unique
+    constraint on `(user_id, quiz_id)`. The result is the rollup of the
+    user's attempts (see `QuizAttempt`), maintained on every submission.
+
     Attributes:
         id (int): Unique identifier for the quiz result.
         user_id (int): Identifier of the user who took the quiz.
         quiz_id (int): Identifier of the quiz taken by the user.
-        score (int): Score obtained by the user.
-        percent (int): Percent score obtained by the user.
+        score (int): Score obtained in the latest attempt.
+        percent (int): Percent score obtained in the latest attempt.
+        best_score (int): Best score obtained over all the attempts.
+        best_percent (int): Best percent score obtained over
+        all the attempts.
+        attempt_count (int): Number of attempts of the user on the quiz.
         timestamp (datetime): The timestamp when the result was created
         or updated.
         user (User): The user who took the quiz.
         quiz (Quiz): The quiz that the user took.
     '''
 
+    __table_args__ = (
+            db.UniqueConstraint(
+                'user_id',
+                'quiz_id',
+                name='uq_quiz_result_user_quiz'
+                ),
+            )
+
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
     quiz_id = db.Column(db.Integer, db.ForeignKey('quiz.id'), nullable=False)
     score = db.Column(db.Integer, nullable=False)
     percent = db.Column(db.Integer, nullable=False)
+    best_score = db.Column(db.Integer, nullable=False, default=0)
+    best_percent = db.Column(db.Integer, nullable=False, default=0)
+    attempt_count = db.Column(db.Integer, nullable=False, default=1)
     timestamp = db.Column(
             db.DateTime,
             default=datetime.utcnow,
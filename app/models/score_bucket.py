@@ -0,0 +1,42 @@
+'''
+app/models/score_bucket.py
+
+This module defines the ScoreBucket model for a Flask application.
+
+Classes:
+    ScoreBucket: The number of users whose latest percent score on a quiz
+    falls in a one-point bucket.
+
+Attributes:
+    quiz_id (int): Part of the primary key, referencing the quiz.
+    percent (int): Part of the primary key, the bucket (0 to 100).
+    count (int): Number of users whose latest percent score is at least
+    `percent` and below `percent + 1`.
+'''
+
+from app.extensions import db
+
+
+class ScoreBucket(db.Model):
+    '''
+    The number of users whose latest percent score on a quiz falls in
+    a one-point bucket.
+
+    Together, the 101 buckets of a quiz form the histogram of its
+    leaderboard entries, so the rank and percentile of a score are
+    computed by adding up at most 101 counters instead of counting
+    the entries (see `app.leaderboard`).
+
+    Attributes:
+        quiz_id (int): Identifier of the quiz.
+        percent (int): The bucket, the percent score rounded down.
+        count (int): Number of users in the bucket.
+    '''
+
+    quiz_id = db.Column(
+            db.Integer,
+            db.ForeignKey('quiz.id'),
+            primary_key=True
+            )
+    percent = db.Column(db.Integer, primary_key=True)
+    count = db.Column(db.Integer, nullable=False, default=0)
@@ -0,0 +1,61 @@
+'''
+app/models/user_standing.py
+
+This module defines the UserStanding model for a Flask application.
+
+Classes:
+    UserStanding: The overall standing of a user over all the quizzes
+    they took.
+
+Attributes:
+    user_id (int): Primary key, referencing the user.
+    name (str): Name of the user.
+    username (str): Username of the user.
+    total_score (int): Sum of the latest scores of the user on each quiz.
+    quizzes_completed (int): Number of quizzes the user took.
+    percent_sum (float): Sum of the latest percent scores of the user
+    on each quiz.
+    mean_percent (float): Mean of the latest percent scores of the user.
+'''
+
+from app.extensions import db
+
+
+class UserStanding(db.Model):
+    '''
+    The overall standing of a user over all the quizzes they took.
+
+    This is a rollup of the leaderboard entries of the user, maintained
+    incrementally with them (see `app.standings`), so the overall
+    standings are read with one query on the `total_score` or
+    `mean_percent` index instead of grouping the results of every user.
+
+    Attributes:
+        user_id (int): Identifier of the user.
+        name (str): Name of the user.
+        username (str): Username of the user.
+        total_score (int): Sum of the latest scores of the user
+        on each quiz.
+        quizzes_completed (int): Number of quizzes the user took.
+        percent_sum (float): Sum of the latest percent scores of the user
+        on each quiz.
+        mean_percent (float): Mean of the latest percent scores
+        of the user.
+    '''
+
+    user_id = db.Column(
+            db.Integer,
+            db.ForeignKey('user.id'),
+            primary_key=True
+            )
+    name = db.Column(db.String(80), nullable=False)
+    username = db.Column(db.String(80), nullable=False)
+    total_score = db.Column(db.Integer, nullable=False, default=0, index=True)
+    quizzes_completed = db.Column(db.Integer, nullable=False, default=0)
+    percent_sum = db.Column(db.Float, nullable=False, default=0)
+    mean_percent = db.Column(
+            db.Float,
+            nullable=False,
+            default=0,
+            index=True
+            )
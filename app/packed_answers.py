@@ -0,0 +1,70 @@
+'''
+app/packed_answers.py
+
+This module packs the selected options of a quiz attempt into a compact
+binary blob, so every attempt can be kept without storing one row
+per answer.
+
+Each answer takes 3 bits: 0 when the question was not answered, or 1 to 4
+for options 'a' to 'd'. The answers are stored in the order of the answer
+key (questions ordered by ID), little-endian, and the blob is padded to
+a whole number of bytes.
+
+Functions:
+    pack_answers: Packs the answers of a submission.
+    unpack_answers: Unpacks the answers of an attempt.
+
+Attributes:
+    BITS_PER_ANSWER (int): The number of bits used by each answer.
+'''
+
+BITS_PER_ANSWER = 3
+OPTIONS = 'abcd'
+CODES = {option: code for code, option in enumerate(OPTIONS, 1)}
+
+
+def pack_answers(question_ids, answers):
+    '''
+    Packs the answers of a submission.
+
+    Args:
+        question_ids (tuple): The question IDs of the answer key,
+        as strings.
+        answers (Mapping): The selected options, keyed by question ID
+        as a string. Options are case-insensitive; anything other than
+        'a' to 'd' counts as unanswered.
+
+    Returns:
+        bytes: The packed answers, 3 bits per question.
+    '''
+
+    packed = 0
+    for index, question_id in enumerate(question_ids):
+        option = answers.get(question_id)
+        code = CODES.get(option.lower(), 0) if option else 0
+        packed |= code << (index * BITS_PER_ANSWER)
+    size = (len(question_ids) * BITS_PER_ANSWER + 7) // 8
+    return packed.to_bytes(size, 'little')
+
+
+def unpack_answers(blob, question_count):
+    '''
+    Unpacks the answers of an attempt.
+
+    Args:
+        blob (bytes): The packed answers.
+        question_count (int): The number of questions of the quiz
+        when the attempt was made.
+
+    Returns:
+        list: The selected option of each question, in answer key
+        order, or None for the unanswered ones.
+    '''
+
+    packed = int.from_bytes(blob, 'little')
+    mask = (1 << BITS_PER_ANSWER) - 1
+    codes = (
+            packed >> (index * BITS_PER_ANSWER) & mask
+            for index in range(question_count)
+            )
+    return [OPTIONS[code - 1] if code else None for code in codes]
@@ -0,0 +1,187 @@
+'''
+app/payload_cache.py
+
+This module defines a size-bounded, in-process LRU cache for the encoded
+JSON payloads of quizzes served by the API.
+
+Payloads are cached per quiz with the version of the quiz they were built
+from, and only served for that version. Callers read the current version
+from the database (it is also the ETag of the quiz), so changes committed
+by other processes or by CLI commands are picked up as soon as they bump
+the version (see `app.events`). Entries are evicted in least recently used
+order once the total size of the cached payloads exceeds
+`PAYLOAD_CACHE_MAX_BYTES`, and they are dropped as soon as a commit of
+this process changes the quiz or its questions.
+
+Classes:
+    PayloadCache: The cache, with hit, miss and eviction counters.
+'''
+
+from collections import OrderedDict
+from threading import Lock
+
+
+class PayloadCache:
+    '''
+    A size-bounded LRU cache of encoded payloads.
+
+    Attributes:
+        max_bytes (int): The byte budget of the cache (0 disables it).
+        size (int): The total size of the cached payloads, in bytes.
+        hits (int): The number of lookups answered from the cache.
+        misses (int): The number of lookups not found in the cache.
+        evictions (int): The number of entries evicted to stay
+        within the byte budget.
+        generation (int): Incremented on every invalidation. A payload
+        built from data read before an invalidation is not cached.
+    '''
+
+    def __init__(self, app=None):
+        '''
+        Creates the cache, optionally binding it to an application.
+
+        Args:
+            app (Flask, optional): The Flask application instance.
+        '''
+
+        self._lock = Lock()
+        self._entries = OrderedDict()
+        self.max_bytes = 0
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.generation = 0
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        '''
+        Configures the cache for an application and empties it.
+
+        The cache subscribes to `quizzes_changed`, so committed changes
+        to quizzes and questions invalidate their payloads.
+
+        Args:
+            app (Flask): The Flask application instance.
+        '''
+
+        from .events import quizzes_changed
+
+        self.max_bytes = app.config['PAYLOAD_CACHE_MAX_BYTES']
+        self.clear()
+        quizzes_changed.connect(self._on_quizzes_changed)
+        app.extensions['payload_cache'] = self
+
+    def get(self, key, version):
+        '''
+        Returns the payload cached under a key for a version.
+
+        Args:
+            key: The cache key (a quiz ID).
+            version (int): The current version of the quiz.
+
+        Returns:
+            bytes or None: The payload, or None on a miss (including
+            a payload built for another version).
+        '''
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] != version:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key, version, payload, generation):
+        '''
+        Caches a payload under a key, evicting the least recently used
+        entries if the byte budget is exceeded.
+
+        Payloads larger than the whole budget are not cached, and neither
+        are payloads built before the latest invalidation, as they may
+        be stale.
+
+        Args:
+            key: The cache key (a quiz ID).
+            version (int): The version of the quiz the payload was
+            built from.
+            payload (bytes): The encoded payload.
+            generation (int): The value of `generation` read before
+            loading the data the payload was built from.
+        '''
+
+        if len(payload) > self.max_bytes:
+            return
+        with self._lock:
+            if generation != self.generation:
+                return
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.size -= len(old[1])
+            self._entries[key] = (version, payload)
+            self.size += len(payload)
+            while self.size > self.max_bytes:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self.size -= len(evicted)
+                self.evictions += 1
+
+    def invalidate(self, keys):
+        '''
+        Removes the payloads cached under the given keys.
+
+        Args:
+            keys (iterable): The cache keys to remove.
+        '''
+
+        with self._lock:
+            self.generation += 1
+            for key in keys:
+                entry = self._entries.pop(key, None)
+                if entry is not None:
+                    self.size -= len(entry[1])
+
+    def clear(self):
+        '''
+        Empties the cache and resets its counters.
+        '''
+
+        with self._lock:
+            self.generation += 1
+            self._entries.clear()
+            self.size = 0
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+
+    def stats(self):
+        '''
+        Returns the cache counters.
+
+        Returns:
+            dict: The number of entries, size, byte budget, hits, misses
+            and evictions.
+        '''
+
+        with self._lock:
+            return {
+                    'entries': len(self._entries),
+                    'size': self.size,
+                    'max_bytes': self.max_bytes,
+                    'hits': self.hits,
+                    'misses': self.misses,
+                    'evictions': self.evictions
+                    }
+
+    def _on_quizzes_changed(self, sender, quiz_ids):
+        '''
+        Invalidates the payloads of changed quizzes.
+
+        Args:
+            sender: The session that committed the changes.
+            quiz_ids (set): The IDs of the changed quizzes.
+        '''
+
+        self.invalidate(quiz_ids)
@@ -0,0 +1,310 @@
+'''
+app/regrade.py
+
+This module regrades the stored attempts of a quiz after its answer key
+was corrected.
+
+Attempts keep the packed answer sheet of every submission and the IDs of
+its questions (see `QuizAttempt`), so their scores can be recomputed
+against the current answer key. The job first bumps the version of the
+quiz, so running workers compile the corrected key before grading new
+submissions, and resets the item statistics of the quiz. The attempts
+stored before that are then streamed in chunks of increasing ID, and each
+chunk is updated with one batched statement and its item statistics added
+in the same transaction, so the job holds the database write lock only
+briefly, live submissions are not blocked and their statistics are kept.
+The `QuizResult` rollups and their leaderboard entries are rebuilt in
+locked chunks of users, and the score histogram and daily leaderboard
+buckets of the quiz, and the overall standings, are rebuilt from them.
+
+Attempts with a question deleted since cannot be regraded: they keep
+their scores and are reported as skipped (their other questions still
+count in the item statistics).
+
+Results queued by the write-behind writer of this process are written
+before the attempts are read. Results queued in the journals of other
+processes were graded with the old key, and are only regraded if they
+are saved before the regrade starts, so workers in write-behind mode
+should be idle (or restarted, which replays their journals) first.
+
+The regrade is not isolated from concurrent writers on SQLite, which
+ignores `SELECT ... FOR UPDATE`: a submission saved while the rollups
+of its user are rebuilt may be overwritten by them, so on SQLite the
+regrade should run while no results are being saved.
+
+Functions:
+    regrade_quiz: Regrades every attempt of a quiz.
+'''
+
+from app.extensions import db
+from app.events import bump_versions, mark_results_saved
+from app.models import (
+        LeaderboardEntry,
+        QuestionStat,
+        QuizAttempt,
+        QuizResult
+        )
+from app.answer_keys import answer_keys, stored_question_ids
+from app.item_stats import save_item_stats
+from app.leaderboard import rebuild_histogram
+from app.leaderboard_windows import rebuild_days
+from app.standings import rebuild_standings
+from app.packed_answers import unpack_answers
+from app.result_writer import result_writer
+from sqlalchemy import bindparam, delete, func, select, update
+
+
+def _regrade_chunk(quiz_id, after, last, chunk_size):
+    '''
+    Regrades a chunk of attempts and adds their item statistics.
+
+    Args:
+        quiz_id (int): The ID of the quiz.
+        after (int): The ID of the last attempt of the previous chunk.
+        last (int): The ID of the last attempt to regrade.
+        chunk_size (int): The maximum number of attempts in the chunk.
+
+    Returns:
+        tuple: The ID of the last attempt of the chunk (None if the chunk
+        is empty), the number of attempts read, the number of attempts
+        whose score changed and the number of attempts skipped.
+    '''
+
+    rows = db.session.execute(
+            select(
+                QuizAttempt.id,
+                QuizAttempt.score,
+                QuizAttempt.question_count,
+                QuizAttempt.seed,
+                QuizAttempt.question_ids,
+                QuizAttempt.answers
+                ).where(
+                    QuizAttempt.quiz_id == quiz_id,
+                    QuizAttempt.id > after,
+                    QuizAttempt.id <= last
+                    ).order_by(QuizAttempt.id).limit(chunk_size)
+            ).all()
+    if not rows:
+        return None, 0, 0, 0
+
+    answer_key = answer_keys.get(quiz_id)
+    options = dict(zip(answer_key.question_ids, answer_key.correct_options))
+    changes = []
+    results = []
+    skipped = 0
+    for row in rows:
+        question_ids = stored_question_ids(row.question_ids)
+        score = row.score
+        if all(question_id in options for question_id in question_ids):
+            selected = unpack_answers(row.answers, len(question_ids))
+            score = sum(
+                    option == options[question_id]
+                    for question_id, option in zip(question_ids, selected)
+                    )
+            if score != row.score:
+                total = len(question_ids)
+                changes.append({
+                    'b_id': row.id,
+                    'b_score': score,
+                    'b_percent': round(score / total * 100, 2)
+                    })
+        else:
+            skipped += 1
+        results.append({
+            'quiz_id': quiz_id,
+            'score': score,
+            'total': row.question_count,
+            'seed': row.seed,
+            'question_ids': question_ids,
+            'answers': row.answers
+            })
+
+    if changes:
+        table = QuizAttempt.__table__
+        db.session.execute(
+                update(table).where(
+                    table.c.id == bindparam('b_id')
+                    ).values(
+                        score=bindparam('b_score'),
+                        percent=bindparam('b_percent')
+                        ),
+                changes
+                )
+    save_item_stats(results)
+    db.session.commit()
+    return rows[-1].id, len(rows), len(changes), skipped
+
+
+def _rebuild_results(quiz_id, chunk_size):
+    '''
+    Rebuilds the `QuizResult` rollups of a quiz from its attempts.
+
+    The latest and best scores of each user are recomputed in chunks
+    of users; the number of attempts is left as it is. The latest scores
+    of the leaderboard entries are updated with them. The entries and
+    results of each chunk are locked before the attempts are read, in the
+    order `save_results` writes them, so a submission saved concurrently
+    is either included or waits for the chunk to be committed. SQLite
+    ignores the locks: there, a submission saved between the read of the
+    attempts and the commit of the chunk is overwritten.
+
+    Args:
+        quiz_id (int): The ID of the quiz.
+        chunk_size (int): The number of users per chunk.
+
+    Returns:
+        int: The number of results rebuilt.
+    '''
+
+    table = QuizResult.__table__
+    statement = update(table).where(
+            table.c.user_id == bindparam('b_user_id'),
+            table.c.quiz_id == quiz_id
+            ).values(
+                score=bindparam('b_score'),
+                percent=bindparam('b_percent'),
+                best_score=bindparam('b_best_score'),
+                best_percent=bindparam('b_best_percent')
+                )
+    entries = LeaderboardEntry.__table__
+    entry_statement = update(entries).where(
+            entries.c.user_id == bindparam('b_user_id'),
+            entries.c.quiz_id == quiz_id
+            ).values(
+                score=bindparam('b_score'),
+                percent=bindparam('b_percent')
+                )
+    rebuilt = 0
+    after = 0
+    while True:
+        user_ids = db.session.scalars(
+                select(QuizResult.user_id).where(
+                    QuizResult.quiz_id == quiz_id,
+                    QuizResult.user_id > after
+                    ).order_by(QuizResult.user_id).limit(chunk_size)
+                ).all()
+        if not user_ids:
+            return rebuilt
+        db.session.execute(
+                select(LeaderboardEntry.id).where(
+                    LeaderboardEntry.quiz_id == quiz_id,
+                    LeaderboardEntry.user_id.in_(user_ids)
+                    ).with_for_update()
+                ).all()
+        db.session.execute(
+                select(QuizResult.id).where(
+                    QuizResult.quiz_id == quiz_id,
+                    QuizResult.user_id.in_(user_ids)
+                    ).with_for_update()
+                ).all()
+        users = db.session.execute(
+                select(
+                    QuizAttempt.user_id,
+                    func.max(QuizAttempt.score),
+                    func.max(QuizAttempt.percent),
+                    func.max(QuizAttempt.id)
+                    ).where(
+                        QuizAttempt.quiz_id == quiz_id,
+                        QuizAttempt.user_id.in_(user_ids)
+                        ).group_by(QuizAttempt.user_id)
+                ).all()
+        latest = {
+                row.id: row
+                for row in db.session.execute(
+                    select(
+                        QuizAttempt.id,
+                        QuizAttempt.score,
+                        QuizAttempt.percent
+                        ).where(
+                            QuizAttempt.id.in_([user[3] for user in users])
+                            )
+                    )
+                }
+        rows = [
+                {
+                    'b_user_id': user_id,
+                    'b_score': latest[latest_id].score,
+                    'b_percent': latest[latest_id].percent,
+                    'b_best_score': best_score,
+                    'b_best_percent': best_percent
+                    }
+                for user_id, best_score, best_percent, latest_id in users
+                ]
+        if rows:
+            db.session.execute(statement, rows)
+            db.session.execute(entry_statement, rows)
+            mark_results_saved(db.session)
+        db.session.commit()
+        rebuilt += len(rows)
+        after = user_ids[-1]
+
+
+def regrade_quiz(quiz_id, chunk_size=1000):
+    '''
+    Regrades every attempt of a quiz.
+
+    The version of the quiz is bumped first, so new submissions are
+    graded with the corrected key, then the results queued by the
+    write-behind writer of this process, graded with the old one, are
+    written. In one transaction, the item statistics of the quiz are then
+    reset and the ID of its last attempt is read. Attempts up to that one
+    are then streamed in chunks of `chunk_size` and graded
+    against the current answer key, on the questions stored with each
+    attempt. Only the attempts whose score changed are written, and the
+    item statistics of each chunk are added to the reset ones. Later
+    attempts are graded by the workers with the corrected key and counted
+    by them. The rollups are then rebuilt, and in one last transaction the
+    score histogram and daily buckets of the quiz and the standings are
+    rebuilt from the leaderboard entries and attempts.
+
+    Args:
+        quiz_id (int): The ID of the quiz.
+        chunk_size (int, optional): The number of attempts (or users)
+        read and written per transaction.
+
+    Returns:
+        dict: The number of `attempts` read, of attempts whose score
+        `changed`, of attempts `skipped` because one of their questions
+        was deleted, and of `results` rebuilt.
+    '''
+
+    bump_versions(db.session, [quiz_id])
+    db.session.commit()
+    result_writer.drain()
+    db.session.execute(
+            delete(QuestionStat).where(QuestionStat.quiz_id == quiz_id)
+            )
+    last = db.session.scalar(
+            select(func.max(QuizAttempt.id)).where(
+                QuizAttempt.quiz_id == quiz_id
+                )
+            ) or 0
+    db.session.commit()
+
+    attempts = changed = skipped = 0
+    after = 0
+    while True:
+        after, read, chunk_changed, chunk_skipped = _regrade_chunk(
+                quiz_id,
+                after,
+                last,
+                chunk_size
+                )
+        if after is None:
+            break
+        attempts += read
+        changed += chunk_changed
+        skipped += chunk_skipped
+    results = _rebuild_results(quiz_id, chunk_size)
+
+    rebuild_histogram(quiz_id)
+    rebuild_days(quiz_id)
+    rebuild_standings()
+    mark_results_saved(db.session)
+    db.session.commit()
+    return {
+            'attempts': attempts,
+            'changed': changed,
+            'skipped': skipped,
+            'results': results
+            }
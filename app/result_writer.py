@@ -0,0 +1,624 @@
+'''
+app/result_writer.py
+
+This module defines the writer that stores graded submissions, either
+directly or in write-behind mode.
+
+By default, results are saved and committed by the request that graded
+them. When `RESULTS_WRITE_BEHIND` is enabled, the request only appends them
+to a local journal (flushed to disk before the request returns) and queues
+them. A writer thread then saves the queued results in batches, with one
+commit every `RESULTS_FLUSH_INTERVAL` seconds or `RESULTS_FLUSH_ROWS`
+results, so grading requests no longer wait for the database write lock.
+
+The journal is an append-only JSON lines file. Every result gets a sequence
+number, and every committed batch is recorded with the range of sequence
+numbers it contains. On startup, the results of the journal that are not in
+a committed range are saved again, so an acknowledged submission survives
+a crash of the process. The journal is emptied whenever every journaled
+result has been committed.
+
+A journal must only be used by one process, so `RESULTS_JOURNAL` must be
+set in write-behind mode, with one path per worker process. Where file
+locks are available, the journal is locked while it is open, and a second
+process opening it fails to start instead of replaying the journal of the
+first one.
+
+A batch that fails with a transient database error (`OperationalError`,
+e.g. a locked database under peak load) is written again after a delay
+doubled on each attempt, up to `RESULTS_RETRY_ATTEMPTS` times, and queued
+again if it still fails: its results stay in the journal until they are
+committed. A batch that fails with any other error (e.g. an integrity
+error) is split in halves that are written again, down to single results.
+A result that cannot be saved on its own is moved to the failed journal
+(the journal path with a `.failed` suffix, in the same format) and logged,
+so it neither blocks the others nor keeps the journal from being emptied.
+Once the cause is fixed, the `replay-failed-results` command saves the
+results of a failed journal again (see `ResultWriter.replay_failed`).
+
+Classes:
+    ResultWriter: Stores graded results, directly or through the queue.
+
+Functions:
+    encode_entry: Encodes a graded result as a journal line.
+    decode_entry: Decodes a journal line.
+
+Attributes:
+    result_writer (ResultWriter): The writer used by the application,
+    initialized in `create_app`.
+'''
+
+from app.extensions import db
+from app.results import save_results
+from base64 import b64decode, b64encode
+from datetime import datetime
+from flask import current_app
+from queue import Empty, Queue
+from sqlalchemy.exc import OperationalError
+from threading import Lock, Thread
+from time import monotonic, perf_counter, sleep
+import atexit
+import json
+import os
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - depends on the platform
+    fcntl = None
+
+_STOP = object()
+
+
+def encode_entry(sequence, result):
+    '''
+    Encodes a graded result as a journal line.
+
+    Args:
+        sequence (int): The sequence number of the result.
+        result (dict): The graded result, as returned by `grade_submission`.
+
+    Returns:
+        str: The JSON line, including the trailing newline.
+    '''
+
+    entry = dict(
+            result,
+            seq=sequence,
+            answers=b64encode(result['answers']).decode('ascii'),
+            timestamp=result['timestamp'].isoformat()
+            )
+    return json.dumps(entry) + '\n'
+
+
+def decode_entry(line):
+    '''
+    Decodes a journal line.
+
+    Args:
+        line (str): The JSON line.
+
+    Returns:
+        dict: Either a graded result with its `seq` number, or a committed
+        range as `{'flushed': [first, last]}`.
+    '''
+
+    entry = json.loads(line)
+    if 'flushed' not in entry:
+        entry['answers'] = b64decode(entry['answers'])
+        entry['timestamp'] = datetime.fromisoformat(entry['timestamp'])
+    return entry
+
+
+class ResultWriter:
+    '''
+    Stores graded results, directly or through a write-behind queue.
+
+    Attributes:
+        enabled (bool): Whether write-behind mode is enabled.
+        flush_interval (float): The maximum time a queued result waits
+        for its batch to be written, in seconds.
+        flush_rows (int): The maximum number of results per batch.
+        journal_path (str): The path of the journal.
+        retry_attempts (int): The number of times a batch is written again
+        after a transient database error.
+        retry_delay (float): The delay before the first retry, in seconds.
+        pending (int): The number of journaled results not committed yet
+        (the queue depth).
+        flushes (int): The number of committed batches.
+        rows_flushed (int): The number of committed results.
+        errors (int): The number of batches that failed to commit.
+        retries (int): The number of batches written again after
+        a transient database error.
+        failed (int): The number of results that could not be saved
+        and were moved to the failed journal.
+        flush_time (float): The total time spent writing batches,
+        in seconds.
+        last_flush_time (float): The time taken by the last batch.
+        max_flush_time (float): The time taken by the slowest batch.
+    '''
+
+    def __init__(self, app=None):
+        '''
+        Creates the writer, optionally binding it to an application.
+
+        Args:
+            app (Flask, optional): The Flask application instance.
+        '''
+
+        self._lock = Lock()
+        self._queue = Queue()
+        self._thread = None
+        self._journal = None
+        self._sequence = 0
+        self._exit_registered = False
+        self.enabled = False
+        self.flush_interval = 0
+        self.flush_rows = 0
+        self.journal_path = None
+        self.retry_attempts = 0
+        self.retry_delay = 0
+        self._reset_stats()
+        if app is not None:
+            self.init_app(app)
+
+    def _reset_stats(self):
+        '''
+        Resets the counters of the writer.
+        '''
+
+        self.pending = 0
+        self.flushes = 0
+        self.rows_flushed = 0
+        self.errors = 0
+        self.retries = 0
+        self.failed = 0
+        self.flush_time = 0.0
+        self.last_flush_time = 0.0
+        self.max_flush_time = 0.0
+
+    def init_app(self, app):
+        '''
+        Configures the writer for an application.
+
+        In write-behind mode, the journal is opened and locked, the results
+        left in it by a previous process are saved, then the writer thread
+        is started.
+
+        Args:
+            app (Flask): The Flask application instance.
+
+        Raises:
+            RuntimeError: If write-behind mode is enabled without
+            `RESULTS_JOURNAL`, or if the journal is locked by another
+            process.
+        '''
+
+        self.stop()
+        self._reset_stats()
+        self.enabled = app.config['RESULTS_WRITE_BEHIND']
+        self.flush_interval = app.config['RESULTS_FLUSH_INTERVAL']
+        self.flush_rows = app.config['RESULTS_FLUSH_ROWS']
+        self.journal_path = app.config['RESULTS_JOURNAL']
+        self.retry_attempts = app.config['RESULTS_RETRY_ATTEMPTS']
+        self.retry_delay = app.config['RESULTS_RETRY_DELAY']
+        app.extensions['result_writer'] = self
+        if not self.enabled:
+            return
+        if not self.journal_path:
+            raise RuntimeError(
+                    'RESULTS_JOURNAL must be set when RESULTS_WRITE_BEHIND '
+                    'is enabled, with one path per process.'
+                    )
+
+        directory = os.path.dirname(self.journal_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._open_journal()
+        with app.app_context():
+            self.replay()
+        self._thread = Thread(
+                target=self._run,
+                args=(app,),
+                name='result-writer',
+                daemon=True
+                )
+        self._thread.start()
+        if not self._exit_registered:
+            atexit.register(self.stop)
+            self._exit_registered = True
+
+    def submit(self, results):
+        '''
+        Stores graded results.
+
+        Without write-behind, the results are saved and committed at once.
+        Otherwise they are journaled and queued, and this method returns
+        once the journal is on disk.
+
+        Args:
+            results (list): Graded results, as returned by
+            `grade_submission`.
+        '''
+
+        if not self.enabled:
+            save_results(results)
+            db.session.commit()
+            return
+        with self._lock:
+            entries = []
+            for result in results:
+                self._sequence += 1
+                entries.append((self._sequence, result))
+                self._journal.write(encode_entry(self._sequence, result))
+            self._sync_journal()
+            self.pending += len(entries)
+            for entry in entries:
+                self._queue.put(entry)
+
+    def drain(self):
+        '''
+        Waits until every queued result has been written.
+        '''
+
+        if self._thread is not None:
+            self._queue.join()
+
+    def stop(self):
+        '''
+        Writes the queued results and stops the writer thread.
+
+        Results queued again after a transient database error are left
+        in the journal.
+        '''
+
+        if self._thread is None:
+            return
+        self._queue.put(_STOP)
+        self._thread.join()
+        self._thread = None
+        # Results queued again after a transient error are still in the
+        # journal, and saved by the next replay.
+        self._queue = Queue()
+        self._journal.close()
+        self._journal = None
+
+    def _open_journal(self):
+        '''
+        Opens the journal and locks it for this process.
+
+        Raises:
+            RuntimeError: If another process holds the lock.
+        '''
+
+        self._journal = open(self.journal_path, 'a+', encoding='utf-8')
+        if fcntl is None:
+            return
+        try:
+            fcntl.flock(self._journal.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            self._journal.close()
+            self._journal = None
+            raise RuntimeError(
+                    f'The journal {self.journal_path} is used by another '
+                    'process.'
+                    )
+
+    def replay(self):
+        '''
+        Saves the results of the journal that were not committed.
+
+        The results are written like a queued batch: the ones that cannot
+        be saved are moved to the failed journal, and the ones deferred by
+        a transient database error are queued for the writer thread, so
+        they stay in the journal. Lines that cannot be decoded are moved
+        to the failed journal. The journal is emptied once every result
+        is settled.
+        '''
+
+        self._journal.seek(0)
+        flushed = []
+        results = []
+        undecodable = []
+        for line in self._journal:
+            if not line.strip():
+                continue
+            try:
+                entry = decode_entry(line)
+            except (ValueError, KeyError, TypeError):
+                undecodable.append(line)
+                continue
+            if 'flushed' in entry:
+                flushed.append(entry['flushed'])
+            else:
+                results.append(entry)
+        self._sequence = max(
+                [last for _, last in flushed] +
+                [entry['seq'] for entry in results],
+                default=0
+                )
+        if undecodable:
+            current_app.logger.error(
+                    'Could not decode %d journal lines, moved to %s.failed.',
+                    len(undecodable),
+                    self.journal_path
+                    )
+            self._write_failed(undecodable)
+            self.failed += len(undecodable)
+        batch = [
+                (entry['seq'], entry)
+                for entry in results
+                if not any(
+                    first <= entry['seq'] <= last for first, last in flushed
+                    )
+                ]
+        self.pending = len(batch)
+        if batch:
+            self._flush(batch)
+        else:
+            self._journal.truncate(0)
+            self._sync_journal()
+
+    def replay_failed(self, path):
+        '''
+        Saves the results of a failed journal again.
+
+        The results are written with the same retries and splitting as
+        queued batches. The failed journal is locked while it is read and
+        rewritten, and keeps only the lines that still cannot be saved.
+
+        Args:
+            path (str): The path of the failed journal.
+
+        Returns:
+            tuple: The number of results saved, and the number of lines
+            left in the failed journal.
+        '''
+
+        with open(path, 'r+', encoding='utf-8') as failed:
+            if fcntl is not None:
+                fcntl.flock(failed.fileno(), fcntl.LOCK_EX)
+            left = []
+            batch = []
+            for line in failed:
+                if not line.strip():
+                    continue
+                try:
+                    entry = decode_entry(line)
+                except (ValueError, KeyError, TypeError):
+                    left.append(line)
+                    continue
+                if 'flushed' not in entry:
+                    batch.append((entry['seq'], entry))
+            written, unsaved, deferred = self._write(batch) if batch else (
+                    [], [], []
+                    )
+            left.extend(encode_entry(*entry) for entry in unsaved + deferred)
+            failed.seek(0)
+            failed.truncate()
+            failed.writelines(left)
+            failed.flush()
+            os.fsync(failed.fileno())
+        return len(written), len(left)
+
+    def stats(self):
+        '''
+        Returns the metrics of the writer.
+
+        Returns:
+            dict: The queue depth, the number of committed batches
+            and results, the number of failed and retried batches,
+            the number of failed results,
+            and the last, maximum and average batch write time
+            in milliseconds.
+        '''
+
+        flushes = self.flushes or 1
+        return {
+                'enabled': self.enabled,
+                'queue_depth': self.pending,
+                'flushes': self.flushes,
+                'rows_flushed': self.rows_flushed,
+                'errors': self.errors,
+                'retries': self.retries,
+                'failed': self.failed,
+                'last_flush_ms': round(self.last_flush_time * 1000, 3),
+                'max_flush_ms': round(self.max_flush_time * 1000, 3),
+                'avg_flush_ms': round(self.flush_time / flushes * 1000, 3)
+                }
+
+    def _sync_journal(self):
+        '''
+        Flushes the journal to disk.
+        '''
+
+        self._journal.flush()
+        os.fsync(self._journal.fileno())
+
+    def _write_failed(self, lines):
+        '''
+        Appends journal lines to the failed journal.
+
+        Args:
+            lines (list): The lines, including their trailing newlines.
+        '''
+
+        path = self.journal_path + '.failed'
+        with open(path, 'a', encoding='utf-8') as failed:
+            if fcntl is not None:
+                fcntl.flock(failed.fileno(), fcntl.LOCK_EX)
+            failed.writelines(lines)
+            failed.flush()
+            os.fsync(failed.fileno())
+
+    def _next_batch(self):
+        '''
+        Waits for the next batch of queued results.
+
+        Returns:
+            tuple: The list of `(sequence, result)` entries of the batch,
+            and whether the writer was asked to stop.
+        '''
+
+        entry = self._queue.get()
+        if entry is _STOP:
+            return [], True
+        batch = [entry]
+        deadline = monotonic() + self.flush_interval
+        while len(batch) < self.flush_rows:
+            timeout = deadline - monotonic()
+            if timeout <= 0:
+                break
+            try:
+                entry = self._queue.get(timeout=timeout)
+            except Empty:
+                break
+            if entry is _STOP:
+                return batch, True
+            batch.append(entry)
+        return batch, False
+
+    def _run(self, app):
+        '''
+        Writes batches of queued results until the writer is stopped.
+
+        Args:
+            app (Flask): The application whose database is written.
+        '''
+
+        with app.app_context():
+            stopping = False
+            while not stopping:
+                batch, stopping = self._next_batch()
+                if batch:
+                    self._flush(batch)
+                for _ in batch:
+                    self._queue.task_done()
+                if stopping:
+                    self._queue.task_done()
+
+    def _save(self, results):
+        '''
+        Saves and commits results, retrying transient database errors.
+
+        Args:
+            results (list): The graded results.
+
+        Raises:
+            OperationalError: If the database still fails after
+            `retry_attempts` retries.
+            Exception: Any other error raised while saving the results.
+        '''
+
+        attempt = 0
+        while True:
+            try:
+                save_results(results)
+                db.session.commit()
+                return
+            except OperationalError:
+                db.session.rollback()
+                if attempt >= self.retry_attempts:
+                    raise
+            except Exception:
+                db.session.rollback()
+                raise
+            sleep(self.retry_delay * 2 ** attempt)
+            attempt += 1
+            self.retries += 1
+
+    def _write(self, batch):
+        '''
+        Saves a batch of results with one commit.
+
+        A batch that fails with an error other than a transient database
+        error is split in halves that are written separately, down to
+        single results.
+
+        Args:
+            batch (list): The `(sequence, result)` entries of the batch.
+
+        Returns:
+            tuple: The entries written, the entries that cannot be saved,
+            and the entries deferred by a transient database error.
+        '''
+
+        start = perf_counter()
+        try:
+            self._save([result for _, result in batch])
+        except OperationalError:
+            self.errors += 1
+            current_app.logger.exception(
+                    'Could not write %d results, the database is '
+                    'unavailable.',
+                    len(batch)
+                    )
+            return [], [], batch
+        except Exception:
+            self.errors += 1
+            if len(batch) == 1:
+                current_app.logger.exception(
+                        'Could not save the result %d.',
+                        batch[0][0]
+                        )
+                return [], batch, []
+            middle = len(batch) // 2
+            first = self._write(batch[:middle])
+            second = self._write(batch[middle:])
+            return tuple(a + b for a, b in zip(first, second))
+        elapsed = perf_counter() - start
+        self.flushes += 1
+        self.rows_flushed += len(batch)
+        self.flush_time += elapsed
+        self.last_flush_time = elapsed
+        self.max_flush_time = max(self.max_flush_time, elapsed)
+        return batch, [], []
+
+    def _flush(self, batch):
+        '''
+        Writes a batch of journaled results and settles it in the journal.
+
+        The results that cannot be saved are moved to the failed journal.
+        The ones deferred by a transient database error are queued again
+        and stay in the journal.
+
+        Args:
+            batch (list): The `(sequence, result)` entries of the batch.
+        '''
+
+        written, failed, deferred = self._write(batch)
+        if failed:
+            self._write_failed([encode_entry(*entry) for entry in failed])
+            self.failed += len(failed)
+        for entry in deferred:
+            self._queue.put(entry)
+        if written or failed:
+            self._settle(written + failed)
+
+    def _settle(self, batch):
+        '''
+        Records settled results in the journal, emptying the journal once
+        every journaled result is settled.
+
+        Results queued again are written after later ones, so the results
+        are recorded as ranges of consecutive sequence numbers.
+
+        Args:
+            batch (list): The `(sequence, result)` entries of the results.
+        '''
+
+        ranges = []
+        for sequence in sorted(sequence for sequence, _ in batch):
+            if ranges and sequence == ranges[-1][1] + 1:
+                ranges[-1][1] = sequence
+            else:
+                ranges.append([sequence, sequence])
+        with self._lock:
+            for flushed in ranges:
+                self._journal.write(json.dumps({'flushed': flushed}) + '\n')
+            self.pending -= len(batch)
+            if self.pending == 0:
+                self._journal.truncate(0)
+            self._sync_journal()
+
+
+result_writer = ResultWriter()
@@ -0,0 +1,254 @@
+'''
+app/results.py
+
+This module defines how graded submissions are stored. Every submission
+is kept as a `QuizAttempt`, the `QuizResult` of the user on the quiz
+is maintained as the rollup of the attempts (latest and best score, number
+of attempts), and the item statistics of the questions and the leaderboard
+are updated.
+It is shared by the quiz page and the bulk grading API, so both apply
+the same grading and storage rules.
+
+Functions:
+    grade_submission: Grades the answers of one submission.
+    save_results: Stores graded submissions as attempts and updates
+    the result rollups, item statistics and leaderboard.
+'''
+
+from app.extensions import db
+from app.models import QuizAttempt, QuizResult
+from app.answer_keys import attempt_answer_key, grade
+from app.packed_answers import pack_answers
+from app.upsert import upsert
+from app.item_stats import save_item_stats
+from app.leaderboard import save_leaderboard
+from datetime import datetime
+from sqlalchemy import case, insert, select, tuple_, update
+
+
+def grade_submission(
+        user_id,
+        quiz_id,
+        answers,
+        duration=None,
+        late=False,
+        draw_count=None,
+        seed=None,
+        question_ids=None
+        ):
+    '''
+    Grades the answers of one submission.
+
+    Args:
+        user_id (int): The ID of the user who took the quiz.
+        quiz_id (int): The ID of the quiz.
+        answers (Mapping): The selected options, keyed by question ID
+        as a string.
+        duration (int, optional): The time taken to submit, in seconds.
+        late (bool, optional): Whether the submission exceeded
+        the time limit.
+        draw_count (int, optional): The number of questions drawn
+        for the attempt.
+        seed (int, optional): The seed the questions were drawn with.
+        question_ids (tuple, optional): The questions asked, as strings,
+        for attempts whose questions were chosen one by one.
+
+    Returns:
+        dict: The graded result, with `user_id`, `quiz_id`, `score`,
+        `total` (the number of questions), `percent`, `duration`, `late`,
+        `seed`, `question_ids` (the questions graded, in the order of
+        the packed answers), `ability` (set by adaptive mode), the packed
+        `answers` and the submission `timestamp`.
+    '''
+
+    answer_key = attempt_answer_key(quiz_id, draw_count, seed, question_ids)
+    total = len(answer_key.question_ids)
+    score = grade(answer_key, answers)
+    return {
+            'user_id': user_id,
+            'quiz_id': quiz_id,
+            'score': score,
+            'total': total,
+            'percent': round(score / total * 100, 2) if total else 0,
+            'duration': duration,
+            'late': late,
+            'seed': seed,
+            'question_ids': answer_key.question_ids,
+            'ability': None,
+            'answers': pack_answers(answer_key.question_ids, answers),
+            'timestamp': datetime.utcnow()
+            }
+
+
+def _greatest(current, new):
+    '''
+    Returns the greater of a column and a new value, in SQL.
+
+    Args:
+        current (Column): The stored value.
+        new (ColumnElement): The new value.
+
+    Returns:
+        Case: A portable `CASE` expression (`max()` with two arguments is
+        specific to SQLite, and `greatest()` is not available there).
+    '''
+
+    return case((current > new, current), else_=new)
+
+
+def _rollups(results):
+    '''
+    Rolls up graded results per user and quiz.
+
+    Args:
+        results (list): Graded results, in submission order.
+
+    Returns:
+        dict: The rollup row of each `(user_id, quiz_id)` pair: the latest
+        score and percent, the best ones and the number of attempts.
+    '''
+
+    rollups = {}
+    for result in results:
+        pair = (result['user_id'], result['quiz_id'])
+        rollup = rollups.get(pair)
+        if rollup is None:
+            rollups[pair] = {
+                    'user_id': result['user_id'],
+                    'quiz_id': result['quiz_id'],
+                    'score': result['score'],
+                    'percent': result['percent'],
+                    'best_score': result['score'],
+                    'best_percent': result['percent'],
+                    'attempt_count': 1,
+                    'timestamp': result['timestamp']
+                    }
+        else:
+            rollup.update(
+                    score=result['score'],
+                    percent=result['percent'],
+                    best_score=max(rollup['best_score'], result['score']),
+                    best_percent=max(
+                        rollup['best_percent'],
+                        result['percent']
+                        ),
+                    attempt_count=rollup['attempt_count'] + 1,
+                    timestamp=result['timestamp']
+                    )
+    return rollups
+
+
+def save_results(results):
+    '''
+    Stores graded submissions as attempts and updates the result rollups.
+
+    All the attempts are inserted with one batched statement. The rollups
+    are then written with a single `INSERT ... ON CONFLICT DO UPDATE`
+    statement on the unique `(user_id, quiz_id)` constraint, which merges
+    them with the stored ones in the database, so concurrent submissions
+    of the same quiz cannot create duplicates or lose an attempt from the
+    count. On dialects without `ON CONFLICT`, existing results are looked
+    up with one query, then updated and inserted with batched statements.
+    The item statistics of the questions are incremented with one more
+    statement (see `app.item_stats`), and the leaderboard entries are
+    written with the rollups (see `app.leaderboard`). The caller commits
+    the transaction.
+
+    Args:
+        results (list): Graded results, as returned by `grade_submission`,
+        in submission order.
+    '''
+
+    if not results:
+        return
+    db.session.execute(insert(QuizAttempt), [
+        {
+            'user_id': result['user_id'],
+            'quiz_id': result['quiz_id'],
+            'score': result['score'],
+            'percent': result['percent'],
+            'question_count': result['total'],
+            'answers': result['answers'],
+            'duration': result['duration'],
+            'late': result['late'],
+            'seed': result['seed'],
+            'question_ids': ','.join(result['question_ids']),
+            'ability': result['ability'],
+            'timestamp': result['timestamp']
+            }
+        for result in results
+        ])
+    save_item_stats(results)
+    rollups = _rollups(results)
+    save_leaderboard(rollups, results)
+    dialect_insert = upsert(db.session.get_bind().dialect.name)
+    if dialect_insert is None:
+        _save_results_with_lookup(rollups)
+        return
+    statement = dialect_insert(QuizResult)
+    excluded = statement.excluded
+    statement = statement.on_conflict_do_update(
+            index_elements=[QuizResult.user_id, QuizResult.quiz_id],
+            set_={
+                'score': excluded.score,
+                'percent': excluded.percent,
+                'best_score': _greatest(
+                    QuizResult.best_score,
+                    excluded.best_score
+                    ),
+                'best_percent': _greatest(
+                    QuizResult.best_percent,
+                    excluded.best_percent
+                    ),
+                'attempt_count': (
+                    QuizResult.attempt_count + excluded.attempt_count
+                    ),
+                'timestamp': excluded.timestamp
+                }
+            )
+    db.session.execute(statement, list(rollups.values()))
+
+
+def _save_results_with_lookup(rollups):
+    '''
+    Stores result rollups by looking up the existing ones first.
+
+    Args:
+        rollups (dict): The rollup rows, keyed by `(user_id, quiz_id)`.
+    '''
+
+    existing = {
+            (row.user_id, row.quiz_id): row
+            for row in db.session.execute(
+                select(
+                    QuizResult.user_id,
+                    QuizResult.quiz_id,
+                    QuizResult.id,
+                    QuizResult.best_score,
+                    QuizResult.best_percent,
+                    QuizResult.attempt_count
+                    ).where(
+                        tuple_(QuizResult.user_id, QuizResult.quiz_id).in_(
+                            list(rollups)
+                            )
+                        )
+                )
+            }
+    updates = []
+    inserts = []
+    for pair, rollup in rollups.items():
+        stored = existing.get(pair)
+        if stored is None:
+            inserts.append(rollup)
+            continue
+        updates.append(dict(
+            rollup,
+            id=stored.id,
+            best_score=max(stored.best_score, rollup['best_score']),
+            best_percent=max(stored.best_percent, rollup['best_percent']),
+            attempt_count=stored.attempt_count + rollup['attempt_count']
+            ))
+    if updates:
+        db.session.execute(update(QuizResult), updates)
+    if inserts:
+        db.session.execute(insert(QuizResult), inserts)
@@ -22,7 +22,8 @@ def add_question(quiz_id):
 
     This function creates a new `Question` object using the data
     from the form request,
-    adds it to the database, and commits the transaction.
+    adds it to the database, and commits the transaction
+    (which bumps the version of the quiz, see `app.events`).
 
     Args:
         quiz_id (int): The ID of the quiz to which the question will be added.
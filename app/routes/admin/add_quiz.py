@@ -20,7 +20,8 @@ def add_quiz():
     '''
     Adds a new quiz to the database.
 
-    This function retrieves the quiz title and description
+    This function retrieves the quiz title, description
+    and optional number of questions drawn per attempt
     from the form request,
     creates a new `Quiz` object, adds it to the database,
     and commits the transaction.
@@ -31,7 +32,12 @@ def add_quiz():
 
     title = request.form['title']
     description = request.form['description']
-    quiz = Quiz(title=title, description=description)
+    draw_count = request.form.get('draw_count', type=int)
+    quiz = Quiz(
+            title=title,
+            description=description,
+            draw_count=draw_count if draw_count and draw_count > 0 else None
+            )
     db.session.add(quiz)
     db.session.commit()
     return quiz.id
@@ -10,6 +10,12 @@ Imports:
     - quizzes: API routes related to quizzes.
     - quiz: API routes for individual quizzes.
     - question: API routes for questions.
+    - questions: API routes for fetching several questions at once.
+    - results: API routes for submitting a batch of answer sheets.
+    - attempts: API routes for reviewing the attempts on a quiz.
+    - stats: API routes for the item statistics of a quiz (admins only).
+    - leaderboard: API routes for the overall and per-quiz leaderboards.
+    - standings: API routes for the overall standings of the users.
     - doc: API routes for API documentation.
 '''
 
@@ -20,4 +26,10 @@ api_bp = Blueprint('api', __name__, url_prefix='/api')
 from .quizzes import quizzes  # noqa: E402
 from .quiz import quiz  # noqa: E402
 from .question import question  # noqa: E402
+from .questions import questions  # noqa: E402
+from .results import results  # noqa: E402
+from .attempts import attempts  # noqa: E402
+from .stats import stats  # noqa: E402
+from .leaderboard import leaderboard  # noqa: E402
+from .standings import standings  # noqa: E402
 from .doc import doc  # noqa: E402
@@ -0,0 +1,76 @@
+'''
+app/routes/api/attempts.py
+
+This module defines the API route for reviewing the attempts of the current
+user on a quiz.
+
+Routes:
+    /api/quiz/<int:quiz_id>/attempts: Returns the attempts of the current
+    user on a quiz, with the selected options.
+'''
+
+from . import api_bp
+from app.extensions import db
+from app.models import QuizAttempt
+from app.answer_keys import stored_question_ids
+from app.packed_answers import unpack_answers
+from flask import jsonify
+from flask_login import current_user, login_required
+from sqlalchemy import select
+
+
+@api_bp.route('/quiz/<int:quiz_id>/attempts')
+@login_required
+def attempts(quiz_id):
+    '''
+    Returns the attempts of the current user on a quiz, newest first.
+
+    The packed answers of each attempt are mapped back to the question
+    IDs stored with the attempt, so questions added to or deleted from
+    the quiz since do not shift them.
+
+    Args:
+        quiz_id (int): The ID of the quiz.
+
+    Returns:
+        Response: A JSON object containing:
+            - attempts (list): One entry per attempt, with `id`, `score`,
+            `percent`, `duration` (in seconds, or null), `ability`
+            (the ability estimate of adaptive attempts, or null),
+            `timestamp` and `answers` (the selected option of each
+            question, keyed by question ID, or null when unanswered).
+    '''
+
+    rows = db.session.execute(
+            select(
+                QuizAttempt.id,
+                QuizAttempt.score,
+                QuizAttempt.percent,
+                QuizAttempt.duration,
+                QuizAttempt.timestamp,
+                QuizAttempt.question_count,
+                QuizAttempt.question_ids,
+                QuizAttempt.ability,
+                QuizAttempt.answers
+                ).where(
+                    QuizAttempt.user_id == current_user.id,
+                    QuizAttempt.quiz_id == quiz_id
+                    ).order_by(QuizAttempt.id.desc())
+            )
+    return jsonify({
+        'attempts': [
+            {
+                'id': row.id,
+                'score': row.score,
+                'percent': row.percent,
+                'duration': row.duration,
+                'ability': row.ability,
+                'timestamp': row.timestamp,
+                'answers': dict(zip(
+                    stored_question_ids(row.question_ids),
+                    unpack_answers(row.answers, row.question_count)
+                    ))
+                }
+            for row in rows
+            ]
+        })
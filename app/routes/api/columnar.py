@@ -0,0 +1,70 @@
+'''
+app/routes/api/columnar.py
+
+This module defines the columnar encoding of questions used by
+`/api/quizzes?format=columnar`, and the helpers to decode it.
+
+In the columnar format, the questions of a quiz are not a list of objects
+but one object of parallel arrays, one array per field, so the field names
+are written once per quiz instead of once per question:
+
+    {"id": [1, 2], "text": ["...", "..."], ..., "correct_option": ["a", "b"]}
+
+Functions:
+    encode_columns: Converts question rows into parallel arrays.
+    decode_columns: Converts parallel arrays back into question objects.
+    decode_quizzes: Converts a columnar `/api/quizzes` response back into
+    the default format.
+'''
+
+from .rows import QUESTION_COLUMNS
+
+
+def encode_columns(questions):
+    '''
+    Converts question rows into parallel arrays.
+
+    Args:
+        questions (list): The question rows.
+
+    Returns:
+        dict: One list per question column, in the order of the rows.
+    '''
+
+    return {
+            column: [getattr(question, column) for question in questions]
+            for column in QUESTION_COLUMNS
+            }
+
+
+def decode_columns(columns):
+    '''
+    Converts parallel arrays back into question objects.
+
+    Args:
+        columns (dict): One list per question field.
+
+    Returns:
+        list: One dictionary per question.
+    '''
+
+    names = list(columns)
+    return [dict(zip(names, values)) for values in zip(*columns.values())]
+
+
+def decode_quizzes(data):
+    '''
+    Converts a columnar `/api/quizzes` response back into the default format.
+
+    Args:
+        data (dict): The decoded JSON response.
+
+    Returns:
+        dict: The same response, with the questions of every quiz
+        as a list of objects. The argument is modified in place.
+    '''
+
+    for quiz in data['quizzes']:
+        if 'questions' in quiz:
+            quiz['questions'] = decode_columns(quiz['questions'])
+    return data
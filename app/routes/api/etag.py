@@ -0,0 +1,130 @@
+'''
+app/routes/api/etag.py
+
+This module defines the helpers used by the API routes to answer
+conditional GET requests.
+
+Every quiz has a `version` that is bumped whenever it or its questions
+change, so the ETag of a resource can be computed from the version alone,
+without loading the quiz or its questions.
+
+Functions:
+    make_etag: Builds a strong ETag from the given parts and
+    the request's query string.
+    quiz_version: Returns the version of a quiz.
+    quiz_etag: Returns the ETag of a quiz.
+    question_etag: Returns the ETag of a question.
+    quizzes_etag: Returns the ETag of the list of quizzes.
+    not_modified: Builds a 304 Not Modified response.
+'''
+
+from app.extensions import db
+from app.models import Quiz, Question
+from flask import current_app, request
+from sqlalchemy import func
+from hashlib import sha1
+
+
+def make_etag(*parts):
+    '''
+    Builds a strong ETag from the given parts and the request's query string.
+
+    The query string is part of the tag because it selects
+    the representation (pagination, fields, format, ...).
+
+    Args:
+        *parts: Values identifying the resource and its version.
+
+    Returns:
+        str: The ETag, without quotes.
+    '''
+
+    args = sorted(request.args.items(multi=True))
+    return sha1(repr((parts, args)).encode('utf-8')).hexdigest()
+
+
+def quiz_version(quiz_id):
+    '''
+    Returns the version of a quiz.
+
+    Args:
+        quiz_id (int): The ID of the quiz.
+
+    Returns:
+        int or None: The version, or None if the quiz does not exist.
+    '''
+
+    return db.session.query(Quiz.version).filter(
+            Quiz.id == quiz_id
+            ).scalar()
+
+
+def quiz_etag(quiz_id, version):
+    '''
+    Returns the ETag of a quiz.
+
+    Args:
+        quiz_id (int): The ID of the quiz.
+        version (int): The version of the quiz (see `quiz_version`).
+
+    Returns:
+        str: The ETag.
+    '''
+
+    return make_etag('quiz', quiz_id, version)
+
+
+def question_etag(question_id):
+    '''
+    Returns the ETag of a question, based on the version of its quiz.
+
+    Args:
+        question_id (int): The ID of the question.
+
+    Returns:
+        str or None: The ETag, or None if the question does not exist.
+    '''
+
+    row = db.session.query(Question.quiz_id, Quiz.version).join(
+            Quiz,
+            Quiz.id == Question.quiz_id
+            ).filter(Question.id == question_id).first()
+    if row is None:
+        return None
+    return make_etag('question', question_id, *row)
+
+
+def quizzes_etag():
+    '''
+    Returns the ETag of the list of quizzes.
+
+    Versions only ever grow, so the number of quizzes, the highest ID
+    and the sum of all versions change whenever a quiz is added or
+    any quiz changes.
+
+    Returns:
+        str: The ETag.
+    '''
+
+    row = db.session.query(
+            func.count(Quiz.id),
+            func.max(Quiz.id),
+            func.sum(Quiz.version)
+            ).one()
+    return make_etag('quizzes', *row)
+
+
+def not_modified(etag):
+    '''
+    Builds a 304 Not Modified response.
+
+    Args:
+        etag (str): The current ETag of the resource.
+
+    Returns:
+        Response: An empty response with status 304 and the ETag header.
+    '''
+
+    response = current_app.response_class(status=304)
+    response.set_etag(etag)
+    return response
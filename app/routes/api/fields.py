@@ -0,0 +1,50 @@
+'''
+app/routes/api/fields.py
+
+This module defines the sparse fieldsets supported by the quiz API routes.
+
+A representation of a quiz is described by a tuple of field names. The quiz
+columns are `id`, `title` and `description`; `questions` stands for the
+embedded list of questions.
+
+Constants:
+    QUIZ_FIELDS: The quiz columns that can be requested.
+    DEFAULT_FIELDS: The full representation, used when neither `fields`
+    nor `include` is given.
+
+Functions:
+    parse_fields: Reads the `fields` and `include` query parameters.
+'''
+
+from flask import request
+
+QUIZ_FIELDS = ('id', 'title', 'description')
+DEFAULT_FIELDS = QUIZ_FIELDS + ('questions',)
+
+
+def parse_fields():
+    '''
+    Reads the `fields` and `include` query parameters.
+
+    `fields` is a comma-separated list of quiz columns. `include` is
+    a comma-separated list of embedded relationships, of which only
+    `questions` exists. Questions are embedded by default, unless
+    `fields` is given without `include=questions`.
+
+    Returns:
+        tuple or None: The requested field names, in canonical order,
+        or None if an unknown field or relationship was requested.
+    '''
+
+    fields = request.args.get('fields')
+    include = request.args.get('include')
+    columns = QUIZ_FIELDS if fields is None else fields.split(',')
+    if include is None:
+        include = 'questions' if fields is None else ''
+    relationships = [name for name in include.split(',') if name]
+    if not set(columns) <= set(QUIZ_FIELDS):
+        return None
+    if not set(relationships) <= {'questions'}:
+        return None
+    requested = set(columns) | set(relationships)
+    return tuple(field for field in DEFAULT_FIELDS if field in requested)
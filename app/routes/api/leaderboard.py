@@ -0,0 +1,73 @@
+'''
+app/routes/api/leaderboard.py
+
+This module defines the API routes for the leaderboards.
+
+Routes:
+    /api/leaderboard: Returns the best results over all quizzes,
+    of all time or of a period.
+    /api/quiz/<int:quiz_id>/leaderboard: Returns the best results on
+    a quiz, with the rank and percentile of the current user.
+'''
+
+from . import api_bp
+from app.leaderboard import ranked_leaderboard, user_rank
+from app.leaderboard_windows import WINDOWS
+from flask import jsonify, request
+from flask_login import current_user, login_required
+
+
+@api_bp.route('/leaderboard')
+@api_bp.route('/quiz/<int:quiz_id>/leaderboard')
+@login_required
+def leaderboard(quiz_id=None):
+    '''
+    Returns the best results, overall or on a quiz.
+
+    The results are read from the leaderboard entries, and the rank of
+    the current user from the score histogram of the quiz, without
+    counting results (see `app.leaderboard`). The leaderboards of
+    a period are merged from its daily buckets and rank the best score
+    of each user in the period (see `app.leaderboard_windows`).
+    Concurrent requests for the same leaderboard share one read.
+
+    Args:
+        quiz_id (int, optional): The ID of the quiz.
+
+    Query Parameters:
+        limit (int, optional): The number of results (1 to 100, default 10).
+        window (str, optional): The period: `all` (default), `today`,
+        `week` or `month`.
+
+    Returns:
+        Response: A JSON object containing:
+            - entries (list): The best results, with `rank`, `user_id`,
+            `name`, `username`, `quiz_id`, `quiz_title` and `percent`.
+            - you (dict or null): For the all-time leaderboard of a quiz
+            only, the `percent`, `rank`, `total` number of users and
+            `percentile` of the current user, or null if they did not
+            take the quiz or the histogram of the quiz is empty.
+        A 400 error is returned if the period is unknown.
+    '''
+
+    limit = min(max(request.args.get('limit', 10, type=int), 1), 100)
+    window = request.args.get('window', 'all')
+    if window != 'all' and window not in WINDOWS:
+        return jsonify({'error': 'Unknown window.'}), 400
+    data = {
+            'entries': [
+                {
+                    'rank': rank,
+                    'user_id': entry.user_id,
+                    'name': entry.name,
+                    'username': entry.username,
+                    'quiz_id': entry.quiz_id,
+                    'quiz_title': entry.quiz_title,
+                    'percent': entry.percent
+                    }
+                for rank, entry in ranked_leaderboard(limit, quiz_id, window)
+                ]
+            }
+    if quiz_id is not None and window == 'all':
+        data['you'] = user_rank(current_user.id, quiz_id)
+    return jsonify(data)
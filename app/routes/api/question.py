@@ -8,9 +8,11 @@ Routes:
     of a question as a JSON response.
 '''
 
-from app.models import Question
 from . import api_bp
-from flask import jsonify
+from .rows import question_table, question_select, fetch_rows
+from .serialize_quizzes import serialize_question
+from .etag import question_etag, not_modified
+from flask import jsonify, request, abort
 
 
 @api_bp.route('/question/<int:question_id>')
@@ -23,6 +25,10 @@ def question(question_id):
     it raises a 404 error. The question details are returned
     as a JSON response.
 
+    The response carries an ETag built from the version of the question's
+    quiz. If the request's `If-None-Match` matches it, a 304 response
+    is returned without loading the question.
+
     Args:
         question_id (int): The unique identifier of the question.
 
@@ -37,14 +43,17 @@ def question(question_id):
             - correct_option (str): The correct option ('a', 'b', 'c', or 'd').
     '''
 
-    question = Question.query.get_or_404(question_id)
-    question_data = {
-            'id': question.id,
-            'text': question.text,
-            'option_a': question.option_a,
-            'option_b': question.option_b,
-            'option_c': question.option_c,
-            'option_d': question.option_d,
-            'correct_option': question.correct_option,
-            }
-    return jsonify(question_data)
+    etag = question_etag(question_id)
+    if etag is None:
+        abort(404)
+    if etag in request.if_none_match:
+        return not_modified(etag)
+    questions = fetch_rows(
+            question_select().where(question_table.c.id == question_id)
+            )
+    if not questions:
+        abort(404)
+    question_data = serialize_question(questions[0])
+    response = jsonify(question_data)
+    response.set_etag(etag)
+    return response
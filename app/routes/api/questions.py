@@ -0,0 +1,62 @@
+'''
+app/routes/api/questions.py
+
+This module defines the API route for retrieving several questions at once.
+
+Routes:
+    /api/questions: Fetches and returns the details of the questions whose
+    IDs are given in the `ids` query parameter.
+'''
+
+from . import api_bp
+from .rows import question_table, question_select, fetch_rows
+from .serialize_quizzes import serialize_question
+from flask import current_app, jsonify, request
+
+
+@api_bp.route('/questions')
+def questions():
+    '''
+    Fetches and returns the details of several questions.
+
+    The IDs are given as a comma-separated list in the `ids` query
+    parameter, up to `API_MAX_IDS` of them. All the questions are loaded
+    with a single `IN` query and returned in the order of the request.
+    IDs that do not match a question are returned as
+    `{"id": <id>, "missing": true}`.
+
+    Query Parameters:
+        ids (str): A comma-separated list of question IDs (e.g. `1,2,3`).
+
+    Returns:
+        Response: A JSON object containing:
+            - questions (list): One entry per requested ID, either the
+            question details (same format as `/api/question/<id>`)
+            or a missing marker.
+        A 400 error is returned if `ids` is empty, malformed
+        or too long.
+    '''
+
+    try:
+        ids = [
+                int(question_id)
+                for question_id in request.args.get('ids', '').split(',')
+                ]
+    except ValueError:
+        return jsonify({'error': 'ids must be a list of integers.'}), 400
+    max_ids = current_app.config['API_MAX_IDS']
+    if len(ids) > max_ids:
+        return jsonify({'error': f'At most {max_ids} ids are allowed.'}), 400
+
+    found = {
+            question.id: serialize_question(question)
+            for question in fetch_rows(
+                question_select().where(question_table.c.id.in_(set(ids)))
+                )
+            }
+    return jsonify({
+        'questions': [
+            found.get(question_id, {'id': question_id, 'missing': True})
+            for question_id in ids
+            ]
+        })
@@ -10,8 +10,11 @@ Routes:
 '''
 
 from . import api_bp
-from app.models import Quiz
-from flask import jsonify
+from .serialize_quizzes import encode_quiz
+from .etag import quiz_version, quiz_etag, not_modified
+from .fields import parse_fields
+from app.json_provider import PreEncoded
+from flask import current_app, request, abort, jsonify
 
 
 @api_bp.route('/quiz/<int:quiz_id>')
@@ -25,9 +28,21 @@ def quiz(quiz_id):
     it raises a 404 error. The quiz details, including the list of questions,
     are returned as a JSON response.
 
+    The response carries an ETag built from the quiz version. If the
+    request's `If-None-Match` matches it, a 304 response is returned
+    without loading the quiz or its questions. Otherwise the encoded
+    quiz is served from the payload cache when it holds the payload of
+    the same version.
+
     Args:
         quiz_id (int): The unique identifier of the quiz.
 
+    Query Parameters:
+        fields (str, optional): A comma-separated list of the quiz
+        fields to return (`id`, `title`, `description`).
+        include (str, optional): Set to `questions` to embed the questions
+        when `fields` is given, or to an empty value to leave them out.
+
     Returns:
         Response: A JSON object containing the quiz details:
             - id (int): The ID of the quiz.
@@ -45,22 +60,17 @@ def quiz(quiz_id):
                 ('a', 'b', 'c', or 'd').
     '''
 
-    quiz = Quiz.query.get_or_404(quiz_id)
-    quiz_data = {
-            'id': quiz.id,
-            'title': quiz.title,
-            'description': quiz.description,
-            'questions': [
-                {
-                    'id': question.id,
-                    'text': question.text,
-                    'option_a': question.option_a,
-                    'option_b': question.option_b,
-                    'option_c': question.option_c,
-                    'option_d': question.option_d,
-                    'correct_option': question.correct_option,
-                    }
-                for question in quiz.questions
-                ]
-            }
-    return jsonify(quiz_data)
+    fields = parse_fields()
+    if fields is None:
+        return jsonify({'error': 'Unknown field or include.'}), 400
+    version = quiz_version(quiz_id)
+    if version is None:
+        abort(404)
+    etag = quiz_etag(quiz_id, version)
+    if etag in request.if_none_match:
+        return not_modified(etag)
+    response = current_app.json.response(
+            PreEncoded(encode_quiz(quiz_id, version, fields))
+            )
+    response.set_etag(etag)
+    return response
@@ -6,13 +6,19 @@ with support for pagination.
 
 Routes:
     /api/quizzes: Fetches and returns the list of quizzes.
-    Supports pagination if `page` and `per_page` query parameters are provided.
+    Supports pagination if `page` and `per_page` query parameters are provided,
+    cursor pagination if `limit` is provided,
+    and streaming of the whole list if `stream` is set.
 '''
 
 from . import api_bp
 from .quizzes_with_pagination import quizzes_with_pagination
 from .quizzes_without_pagination import quizzes_without_pagination
-from flask import request
+from .quizzes_streamed import quizzes_streamed
+from .quizzes_with_cursor import quizzes_with_cursor, decode_cursor
+from .etag import quizzes_etag, not_modified
+from .fields import parse_fields
+from flask import request, jsonify
 
 
 @api_bp.route('/quizzes')
@@ -22,23 +28,80 @@ def quizzes():
 
     If the query parameters `page` and `per_page` are provided,
     the quizzes will be paginated.
-    Otherwise, all quizzes are returned without pagination.
+    If `limit` is provided, the quizzes after `after` (or `cursor`)
+    are returned using keyset pagination.
+    Otherwise, all quizzes are returned without pagination, streamed
+    in batches if `stream` is `true` or `1`.
 
     Query Parameters:
         page (int, optional): The page number for pagination.
         per_page (int, optional): The number of quizzes
         per page for pagination.
+        limit (int, optional): The number of quizzes per page
+        for cursor pagination.
+        after (int, optional): Returns the quizzes whose ID is greater
+        than this one (cursor pagination).
+        cursor (str, optional): The `next_cursor` of a previous page
+        (cursor pagination).
+        stream (str, optional): Streams the unpaginated list as
+        a chunked response when set to `true` or `1`.
+        fields (str, optional): A comma-separated list of the quiz
+        fields to return (`id`, `title`, `description`).
+        include (str, optional): Set to `questions` to embed the questions
+        when `fields` is given, or to an empty value to leave them out.
+        format (str, optional): `columnar` encodes the questions of each
+        quiz as parallel arrays, one per field (default `rows`).
+
+    The response carries an ETag built from the versions of all quizzes.
+    If the request's `If-None-Match` matches it, a 304 response is
+    returned without loading any quiz.
 
     Returns:
         Response: A JSON response containing the list of quizzes.
         The format depends on whether pagination is used.
     '''
 
+    etag = quizzes_etag()
+    if etag in request.if_none_match:
+        return not_modified(etag)
+
     page = request.args.get('page', type=int)
     per_page = request.args.get('per_page', type=int)
+    limit = request.args.get('limit', type=int)
+    after = request.args.get('after', default=0, type=int)
+    cursor = request.args.get('cursor')
+    stream = request.args.get('stream', '').lower() in ('1', 'true')
+    fields = parse_fields()
+    if fields is None:
+        return jsonify({'error': 'Unknown field or include.'}), 400
+    response_format = request.args.get('format', 'rows')
+    if response_format not in ('rows', 'columnar'):
+        return jsonify({'error': 'Unknown format.'}), 400
+    columnar = response_format == 'columnar'
 
-    if page is not None and per_page is not None:
-        quizzes = quizzes_with_pagination(page, per_page)
+    if limit is not None:
+        if cursor is not None:
+            after = decode_cursor(cursor)
+            if after is None:
+                return jsonify({'error': 'Invalid cursor.'}), 400
+        quizzes = quizzes_with_cursor(
+                etag,
+                after,
+                limit,
+                fields,
+                columnar
+                )
+    elif page is not None and per_page is not None:
+        quizzes = quizzes_with_pagination(
+                etag,
+                page,
+                per_page,
+                fields,
+                columnar
+                )
+    elif stream:
+        quizzes = quizzes_streamed(fields, columnar)
     else:
-        quizzes = quizzes_without_pagination()
+        quizzes = quizzes_without_pagination(etag, fields, columnar)
+    quizzes.set_etag(etag)
     return quizzes
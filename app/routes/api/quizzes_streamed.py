@@ -0,0 +1,78 @@
+'''
+app/routes/api/quizzes_streamed.py
+
+This module defines the function to stream all quizzes as a chunked
+JSON response.
+
+Function:
+    quizzes_streamed: Streams the list of all quizzes with their details,
+    including associated questions, reading them from the database
+    in batches.
+
+Returns:
+    Response: A streamed JSON response with the same format as
+    `quizzes_without_pagination`.
+'''
+
+from .fields import DEFAULT_FIELDS
+from .rows import quiz_table, fetch_rows
+from .serialize_quizzes import quiz_select_fields, encode_quizzes
+from flask import Response, current_app, stream_with_context
+
+
+def quizzes_streamed(fields=DEFAULT_FIELDS, columnar=False):
+    '''
+    Streams the list of all quizzes with their details.
+
+    Quizzes are read in batches of `API_STREAM_BATCH_SIZE`, seeking on
+    the primary key, and each batch is serialized and written out before
+    the next one is loaded. Only one batch is held in memory at a time,
+    and the first bytes are sent as soon as the first batch is ready.
+
+    Args:
+        fields (tuple, optional): The requested field names. Only these
+        columns are loaded, and questions only if requested.
+        columnar (bool, optional): Encodes the questions of each quiz
+        as parallel arrays.
+
+    Returns:
+        Response: A streamed JSON response containing the following
+        information:
+            - quizzes (list): A list of quizzes, in the same format
+            as `quizzes_without_pagination`.
+            - total (int): The total number of quizzes.
+    '''
+
+    batch_size = current_app.config['API_STREAM_BATCH_SIZE']
+    item_separator = current_app.json.item_separator
+    key_separator = current_app.json.key_separator
+
+    def generate():
+        yield b'{"quizzes"' + key_separator + b'['
+        total = 0
+        last_id = 0
+        while True:
+            quizzes = fetch_rows(
+                    quiz_select_fields(fields).where(
+                        quiz_table.c.id > last_id
+                        ).order_by(quiz_table.c.id).limit(batch_size)
+                    )
+            if not quizzes:
+                break
+            for payload in encode_quizzes(quizzes, fields, columnar):
+                yield (item_separator if total else b'') + payload
+                total += 1
+            last_id = quizzes[-1].id
+        yield b''.join([
+            b']',
+            item_separator,
+            b'"total"',
+            key_separator,
+            str(total).encode('utf-8'),
+            b'}'
+            ])
+
+    return Response(
+            stream_with_context(generate()),
+            mimetype='application/json'
+            )
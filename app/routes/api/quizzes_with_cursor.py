@@ -0,0 +1,153 @@
+'''
+app/routes/api/quizzes_with_cursor.py
+
+This module defines the functions to fetch quizzes with keyset
+(cursor) pagination.
+
+Functions:
+    encode_cursor: Encodes the ID of the last returned quiz into
+    an opaque cursor.
+    decode_cursor: Decodes an opaque cursor back into a quiz ID.
+    quizzes_with_cursor: Retrieves the quizzes that come after a given
+    quiz ID, seeking on the primary key.
+'''
+
+from .fields import DEFAULT_FIELDS
+from .rows import quiz_table, fetch_rows
+from .serialize_quizzes import (
+        quiz_select_fields,
+        encode_quizzes,
+        quizzes_response
+        )
+from app.extensions import single_flight
+from flask import current_app
+from itsdangerous import URLSafeSerializer, BadSignature
+
+
+def _serializer():
+    '''
+    Returns the serializer used to sign cursors with the app's secret key.
+    '''
+
+    return URLSafeSerializer(
+            current_app.config['SECRET_KEY'],
+            salt='quizzes-cursor'
+            )
+
+
+def encode_cursor(quiz_id):
+    '''
+    Encodes the ID of the last returned quiz into an opaque cursor.
+
+    Args:
+        quiz_id (int): The ID of the last quiz of a page.
+
+    Returns:
+        str: A signed, URL-safe cursor.
+    '''
+
+    return _serializer().dumps(quiz_id)
+
+
+def decode_cursor(cursor):
+    '''
+    Decodes an opaque cursor back into a quiz ID.
+
+    Args:
+        cursor (str): A cursor returned as `next_cursor`.
+
+    Returns:
+        int or None: The quiz ID, or None if the cursor is invalid.
+    '''
+
+    try:
+        quiz_id = _serializer().loads(cursor)
+    except BadSignature:
+        return None
+    return quiz_id if isinstance(quiz_id, int) else None
+
+
+def _load_after(after, limit, fields, columnar):
+    '''
+    Reads and encodes the quizzes that come after a given quiz ID.
+
+    Args:
+        after (int): The ID of the last quiz of the previous page.
+        limit (int): The number of quizzes per page.
+        fields (tuple): The requested field names.
+        columnar (bool): Encodes the questions as parallel arrays.
+
+    Returns:
+        tuple: The encoded JSON payload of each quiz of the page, and
+        the ID of its last quiz if there is a next page (None otherwise).
+    '''
+
+    quizzes = fetch_rows(
+            quiz_select_fields(fields).where(
+                quiz_table.c.id > after
+                ).order_by(quiz_table.c.id).limit(limit + 1)
+            )
+    last_id = None
+    if len(quizzes) > limit:
+        quizzes = quizzes[:limit]
+        last_id = quizzes[-1].id
+    return encode_quizzes(quizzes, fields, columnar), last_id
+
+
+def quizzes_with_cursor(
+        etag,
+        after,
+        limit,
+        fields=DEFAULT_FIELDS,
+        columnar=False
+        ):
+    '''
+    Retrieves the quizzes that come after a given quiz ID.
+
+    The page is read with `WHERE id > after ORDER BY id LIMIT limit + 1`,
+    which seeks on the primary key index, so every page costs the same
+    no matter how deep it is and no `COUNT(*)` is needed. The extra row
+    only tells whether there is a next page. Concurrent requests for
+    the same page share one read (see `SingleFlight`), keyed by the ETag
+    of the list.
+
+    Args:
+        etag (str): The ETag of the list of quizzes (see `quizzes_etag`),
+        read from the database, which keys the concurrent reads.
+        after (int): The ID of the last quiz of the previous page
+        (0 for the first page).
+        limit (int): The number of quizzes per page, capped
+        at `API_MAX_LIMIT`.
+        fields (tuple, optional): The requested field names. Only these
+        columns are loaded, and questions only if requested.
+        columnar (bool, optional): Encodes the questions of each quiz
+        as parallel arrays.
+
+    Returns:
+        Response: A JSON response containing the following information:
+            - quizzes (list): A list of quizzes, in the same format
+            as `quizzes_with_pagination`.
+            - next_cursor (str or None): The cursor of the next page,
+            or None on the last page.
+    '''
+
+    limit = max(1, min(limit, current_app.config['API_MAX_LIMIT']))
+    payloads, last_id = single_flight.do(
+            (
+                'quizzes-after',
+                etag,
+                after,
+                limit,
+                fields,
+                columnar
+                ),
+            _load_after,
+            after,
+            limit,
+            fields,
+            columnar
+            )
+    return quizzes_response(
+            payloads,
+            next_cursor=None if last_id is None else encode_cursor(last_id)
+            )
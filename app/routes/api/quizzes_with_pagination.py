@@ -8,19 +8,62 @@ Function:
     their details, including associated questions.
 
 Args:
+    etag (str): The ETag of the list of quizzes.
     page (int): The page number for pagination.
     per_page (int): The number of quizzes per page for pagination.
+    fields (tuple, optional): The requested field names.
+    columnar (bool, optional): Encodes the questions as parallel arrays.
 
 Returns:
     Response: A JSON response containing the list of quizzes, total count,
     total pages, and the current page.
 '''
 
-from app.models import Quiz
-from flask import jsonify
+from .fields import DEFAULT_FIELDS
+from .rows import quiz_table, fetch_rows
+from .serialize_quizzes import (
+        quiz_select_fields,
+        encode_quizzes,
+        quizzes_response
+        )
+from app.extensions import db, single_flight
+from sqlalchemy import select, func
+from math import ceil
 
 
-def quizzes_with_pagination(page, per_page):
+def _load_page(page, per_page, fields, columnar):
+    '''
+    Counts the quizzes, then reads and encodes a page of them.
+
+    Args:
+        page (int): The page number.
+        per_page (int): The number of quizzes per page.
+        fields (tuple): The requested field names.
+        columnar (bool): Encodes the questions as parallel arrays.
+
+    Returns:
+        tuple: The total number of quizzes, and the encoded JSON payload
+        of each quiz of the page.
+    '''
+
+    total = db.session.execute(
+            select(func.count()).select_from(quiz_table)
+            ).scalar()
+    quizzes = fetch_rows(
+            quiz_select_fields(fields).order_by(
+                quiz_table.c.id
+                ).limit(per_page).offset((page - 1) * per_page)
+            )
+    return total, encode_quizzes(quizzes, fields, columnar)
+
+
+def quizzes_with_pagination(
+        etag,
+        page,
+        per_page,
+        fields=DEFAULT_FIELDS,
+        columnar=False
+        ):
     '''
     Retrieves a paginated list of quizzes with their details.
 
@@ -30,9 +73,20 @@ def quizzes_with_pagination(page, per_page):
     information such as total quizzes, total pages,
     and the current page number.
 
+    Out-of-range values are handled like `paginate(error_out=False)`:
+    a page below 1 is read as 1 and a page size below 1 as 20.
+    Concurrent requests for the same page share one read
+    (see `SingleFlight`), keyed by the ETag of the list.
+
     Args:
+        etag (str): The ETag of the list of quizzes (see `quizzes_etag`),
+        read from the database, which keys the concurrent reads.
         page (int): The page number for pagination.
         per_page (int): The number of quizzes per page.
+        fields (tuple, optional): The requested field names. Only these
+        columns are loaded, and questions only if requested.
+        columnar (bool, optional): Encodes the questions of each quiz
+        as parallel arrays.
 
     Returns:
         Response: A JSON response containing the following information:
@@ -55,34 +109,26 @@ def quizzes_with_pagination(page, per_page):
             - current_page (int): The current page number.
     '''
 
-    quizzes = Quiz.query.paginate(
-            page=page,
-            per_page=per_page,
-            error_out=False
+    page = max(page, 1)
+    per_page = per_page if per_page >= 1 else 20
+    total, payloads = single_flight.do(
+            (
+                'quizzes-page',
+                etag,
+                page,
+                per_page,
+                fields,
+                columnar
+                ),
+            _load_page,
+            page,
+            per_page,
+            fields,
+            columnar
+            )
+    return quizzes_response(
+            payloads,
+            total=total,
+            pages=ceil(total / per_page),
+            current_page=page
             )
-    quizzes_data = [
-            {
-                'id': quiz.id,
-                'title': quiz.title,
-                'description': quiz.description,
-                'questions': [
-                    {
-                        'id': question.id,
-                        'text': question.text,
-                        'option_a': question.option_a,
-                        'option_b': question.option_b,
-                        'option_c': question.option_c,
-                        'option_d': question.option_d,
-                        'correct_option': question.correct_option,
-                        }
-                    for question in quiz.questions
-                    ]
-                }
-            for quiz in quizzes
-            ]
-    return jsonify({
-        'quizzes': quizzes_data,
-        'total': quizzes.total,
-        'pages': quizzes.pages,
-        'current_page': quizzes.page
-        })
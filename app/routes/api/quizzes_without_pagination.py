@@ -12,18 +12,53 @@ Returns:
     and the total number of quizzes.
 '''
 
-from app.models import Quiz
-from flask import jsonify
+from .fields import DEFAULT_FIELDS
+from .rows import quiz_table, fetch_rows
+from .serialize_quizzes import (
+        quiz_select_fields,
+        encode_quizzes,
+        quizzes_response
+        )
+from app.extensions import single_flight
 
 
-def quizzes_without_pagination():
+def _load_quizzes(fields, columnar):
+    '''
+    Reads and encodes all quizzes.
+
+    Args:
+        fields (tuple): The requested field names.
+        columnar (bool): Encodes the questions as parallel arrays.
+
+    Returns:
+        list: The encoded JSON payload of each quiz, ordered by ID.
+    '''
+
+    quizzes = fetch_rows(
+            quiz_select_fields(fields).order_by(quiz_table.c.id)
+            )
+    return encode_quizzes(quizzes, fields, columnar)
+
+
+def quizzes_without_pagination(etag, fields=DEFAULT_FIELDS, columnar=False):
     '''
     Retrieves a list of all quizzes with their details.
 
     This function queries the database to retrieve all quizzes.
     Each quiz includes its ID, title, description,
     and associated questions. The response includes the total number
-    of quizzes.
+    of quizzes. Concurrent requests for the same list share one read
+    (see `SingleFlight`). The key includes the ETag of the list, so
+    a request made after a quiz changed, in any process, never gets
+    a list read before the change.
+
+    Args:
+        etag (str): The ETag of the list of quizzes (see `quizzes_etag`),
+        read from the database, which keys the concurrent reads.
+        fields (tuple, optional): The requested field names. Only these
+        columns are loaded, and questions only if requested.
+        columnar (bool, optional): Encodes the questions of each quiz
+        as parallel arrays.
 
     Returns:
         Response: A JSON response containing the following information:
@@ -44,28 +79,10 @@ def quizzes_without_pagination():
             - total (int): The total number of quizzes.
     '''
 
-    quizzes = Quiz.query.all()
-    quizzes_data = [
-            {
-                'id': quiz.id,
-                'title': quiz.title,
-                'description': quiz.description,
-                'questions': [
-                    {
-                        'id': question.id,
-                        'text': question.text,
-                        'option_a': question.option_a,
-                        'option_b': question.option_b,
-                        'option_c': question.option_c,
-                        'option_d': question.option_d,
-                        'correct_option': question.correct_option,
-                        }
-                    for question in quiz.questions
-                    ]
-                }
-            for quiz in quizzes
-            ]
-    return jsonify({
-        'quizzes': quizzes_data,
-        'total': len(quizzes_data)
-        })
+    payloads = single_flight.do(
+            ('quizzes', etag, fields, columnar),
+            _load_quizzes,
+            fields,
+            columnar
+            )
+    return quizzes_response(payloads, total=len(payloads))
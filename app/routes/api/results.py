@@ -0,0 +1,147 @@
+'''
+app/routes/api/results.py
+
+This module defines the API route for submitting a batch of answer sheets,
+e.g. when a classroom device syncs the quizzes taken offline.
+
+Routes:
+    /api/results: Grades a batch of answer sheets and stores the results.
+
+Functions:
+    parse_submissions: Validates the submissions of a request body.
+
+Attributes:
+    RESULT_FIELDS (tuple): The fields of a graded result returned
+    by the route.
+'''
+
+from . import api_bp
+from app.extensions import db
+from app.models import Quiz, User
+from app.results import grade_submission
+from app.result_writer import result_writer
+from flask import current_app, jsonify, request
+from flask_login import current_user, login_required
+from sqlalchemy import select
+
+RESULT_FIELDS = ('user_id', 'quiz_id', 'score', 'total', 'percent')
+
+
+def parse_submissions(body):
+    '''
+    Validates the submissions of a request body.
+
+    Args:
+        body: The decoded JSON body of the request.
+
+    Returns:
+        tuple: The list of `(user_id, quiz_id, answers, duration)`
+        submissions
+        and None, or None and an error message.
+    '''
+
+    submissions = body.get('submissions') if isinstance(body, dict) else None
+    if not isinstance(submissions, list) or not submissions:
+        return None, 'submissions must be a non-empty list.'
+    max_submissions = current_app.config['API_MAX_SUBMISSIONS']
+    if len(submissions) > max_submissions:
+        return None, f'At most {max_submissions} submissions are allowed.'
+
+    parsed = []
+    for index, submission in enumerate(submissions):
+        if not isinstance(submission, dict):
+            return None, f'submissions[{index}] must be an object.'
+        quiz_id = submission.get('quiz_id')
+        user_id = submission.get('user_id', current_user.id)
+        answers = submission.get('answers', {})
+        duration = submission.get('duration')
+        if type(quiz_id) is not int or type(user_id) is not int:
+            return None, (
+                    f'submissions[{index}]: quiz_id and user_id '
+                    'must be integers.'
+                    )
+        if not isinstance(answers, dict) or not all(
+                isinstance(option, str) for option in answers.values()):
+            return None, (
+                    f'submissions[{index}]: answers must map question IDs '
+                    'to options.'
+                    )
+        if duration is not None and (
+                type(duration) is not int or duration < 0):
+            return None, (
+                    f'submissions[{index}]: duration must be a number '
+                    'of seconds.'
+                    )
+        parsed.append((user_id, quiz_id, answers, duration))
+    return parsed, None
+
+
+@api_bp.route('/results', methods=['POST'])
+@login_required
+def results():
+    '''
+    Grades a batch of answer sheets and stores the results.
+
+    The body is a JSON object with a `submissions` list, up to
+    `API_MAX_SUBMISSIONS` of them. Each submission is graded with the same
+    rules as a quiz submitted from the quiz page, using the cached answer
+    keys. The quizzes and users are checked with one query each, and all
+    the results are written in a single transaction with batched
+    statements (or queued, in write-behind mode). The batch is rejected
+    as a whole if any submission is invalid.
+
+    Request Body:
+        submissions (list): Objects containing:
+            - quiz_id (int): The ID of the quiz.
+            - user_id (int, optional): The ID of the user who took the
+            quiz (defaults to the current user; only admins can submit
+            for other users).
+            - answers (dict): The selected option (`a` to `d`)
+            of each answered question, keyed by question ID.
+            - duration (int, optional): The time taken, in seconds.
+
+    Returns:
+        Response: A JSON object containing:
+            - results (list): One entry per submission, in the order
+            of the request, with `user_id`, `quiz_id`, `score`, `total`
+            and `percent`.
+        A 400 error is returned if the body is invalid or refers
+        to unknown quizzes or users, and a 403 error if a non-admin
+        submits for another user.
+    '''
+
+    submissions, error = parse_submissions(request.get_json(silent=True))
+    if error:
+        return jsonify({'error': error}), 400
+    if current_user.role != 'admin' and any(
+            submission[0] != current_user.id for submission in submissions):
+        return jsonify({
+            'error': 'Only admins can submit for other users.'
+            }), 403
+
+    quiz_ids = {quiz_id for _, quiz_id, _, _ in submissions}
+    user_ids = {user_id for user_id, _, _, _ in submissions}
+    unknown_quizzes = quiz_ids - set(db.session.scalars(
+        select(Quiz.id).where(Quiz.id.in_(quiz_ids))
+        ))
+    unknown_users = user_ids - set(db.session.scalars(
+        select(User.id).where(User.id.in_(user_ids))
+        ))
+    if unknown_quizzes or unknown_users:
+        return jsonify({
+            'error': 'Unknown quizzes or users.',
+            'quiz_ids': sorted(unknown_quizzes),
+            'user_ids': sorted(unknown_users)
+            }), 400
+
+    graded = [
+            grade_submission(user_id, quiz_id, answers, duration)
+            for user_id, quiz_id, answers, duration in submissions
+            ]
+    result_writer.submit(graded)
+    return jsonify({
+        'results': [
+            {field: result[field] for field in RESULT_FIELDS}
+            for result in graded
+            ]
+        })
@@ -0,0 +1,106 @@
+'''
+app/routes/api/rows.py
+
+This module defines the read-only fast path used by the API routes to load
+quizzes and questions.
+
+The API only copies column values into JSON, so instead of hydrating `Quiz`
+and `Question` objects into the session's identity map, it runs SQLAlchemy
+Core selects against the underlying tables and works on the returned rows.
+Rows expose their columns as attributes (`row.id`, `row.title`, ...), just
+like the models.
+
+Constants:
+    quiz_table: The table of the `Quiz` model.
+    question_table: The table of the `Question` model.
+    QUESTION_COLUMNS: The question columns returned by the API.
+
+Functions:
+    quiz_select: Returns a select of the requested quiz columns.
+    question_select: Returns a select of the API question columns.
+    fetch_rows: Executes a select and returns all its rows.
+    fetch_questions: Returns the questions of the given quizzes.
+'''
+
+from app.extensions import db
+from app.models import Quiz, Question
+from sqlalchemy import select
+
+quiz_table = Quiz.__table__
+question_table = Question.__table__
+QUESTION_COLUMNS = (
+        'id',
+        'text',
+        'option_a',
+        'option_b',
+        'option_c',
+        'option_d',
+        'correct_option'
+        )
+
+
+def quiz_select(columns):
+    '''
+    Returns a select of the requested quiz columns.
+
+    Args:
+        columns (iterable): The names of the quiz columns to select.
+        The ID and the version are always selected (the version keys
+        the payload cache).
+
+    Returns:
+        Select: A Core select on the quiz table.
+    '''
+
+    names = ['id', 'version'] + [
+            name
+            for name in columns
+            if name not in ('id', 'version')
+            ]
+    return select(*(quiz_table.c[name] for name in names))
+
+
+def question_select():
+    '''
+    Returns a select of the API question columns and the quiz ID.
+
+    Returns:
+        Select: A Core select on the question table.
+    '''
+
+    return select(
+            question_table.c.quiz_id,
+            *(question_table.c[name] for name in QUESTION_COLUMNS)
+            )
+
+
+def fetch_rows(statement):
+    '''
+    Executes a select and returns all its rows.
+
+    Args:
+        statement (Select): The select to execute.
+
+    Returns:
+        list: The rows, as `Row` tuples.
+    '''
+
+    return db.session.execute(statement).all()
+
+
+def fetch_questions(quiz_ids):
+    '''
+    Returns the questions of the given quizzes with a single `IN` query.
+
+    Args:
+        quiz_ids (list): The IDs of the quizzes.
+
+    Returns:
+        list: The question rows, ordered by question ID.
+    '''
+
+    return fetch_rows(
+            question_select().where(
+                question_table.c.quiz_id.in_(quiz_ids)
+                ).order_by(question_table.c.id)
+            )
@@ -0,0 +1,242 @@
+'''
+app/routes/api/serialize_quizzes.py
+
+This module defines the shared serialization helpers used by the quiz
+API routes.
+
+Functions:
+    serialize_question: Converts a question into a dictionary.
+    quiz_select_fields: Returns a select of the quiz columns among
+    the requested fields.
+    serialize_quizzes: Converts a list of quizzes, including their questions,
+    into dictionaries using a single bulk query for all questions.
+    encode_quizzes: Returns the encoded JSON payloads of a list of quizzes,
+    using the payload cache.
+    encode_quiz: Returns the encoded JSON payload of a quiz, using
+    the payload cache.
+    quizzes_response: Builds a JSON response around encoded quiz payloads.
+'''
+
+from app.extensions import payload_cache
+from .fields import QUIZ_FIELDS, DEFAULT_FIELDS
+from .rows import quiz_table, quiz_select, fetch_rows, fetch_questions
+from .columnar import encode_columns
+from app.json_provider import PreEncoded
+from flask import current_app, abort
+
+
+def serialize_question(question):
+    '''
+    Converts a question into a dictionary.
+
+    Args:
+        question (Row): The question row (or `Question` object)
+        to serialize.
+
+    Returns:
+        dict: The question details (id, text, the four options
+        and the correct option).
+    '''
+
+    return {
+            'id': question.id,
+            'text': question.text,
+            'option_a': question.option_a,
+            'option_b': question.option_b,
+            'option_c': question.option_c,
+            'option_d': question.option_d,
+            'correct_option': question.correct_option,
+            }
+
+
+def quiz_select_fields(fields=DEFAULT_FIELDS):
+    '''
+    Returns a select of the quiz columns among the requested fields.
+
+    Args:
+        fields (tuple): The requested field names.
+
+    Returns:
+        Select: A Core select on the quiz table restricted to
+        the requested columns (the ID is always selected).
+    '''
+
+    return quiz_select(field for field in fields if field in QUIZ_FIELDS)
+
+
+def _serialize_questions(questions):
+    '''
+    Converts question rows into a list of dictionaries.
+
+    Args:
+        questions (list): The question rows.
+
+    Returns:
+        list: One dictionary per question.
+    '''
+
+    return [serialize_question(question) for question in questions]
+
+
+def serialize_quizzes(quizzes, fields=DEFAULT_FIELDS, columnar=False):
+    '''
+    Converts a list of quizzes, including their questions, into dictionaries.
+
+    Instead of walking the lazy `Quiz.questions` relationship for every
+    quiz (one query per quiz), the questions of all the given quizzes are
+    loaded with a single `IN` query and grouped by quiz, so the number
+    of queries does not depend on the number of quizzes. The query is
+    skipped when `questions` is not among the requested fields.
+
+    Args:
+        quizzes (list): The quiz rows to serialize.
+        fields (tuple, optional): The requested field names.
+        columnar (bool, optional): Encodes the questions of each quiz
+        as parallel arrays (see `columnar.py`).
+
+    Returns:
+        list: A list of dictionaries, one per quiz, in the given order.
+    '''
+
+    columns = [field for field in fields if field in QUIZ_FIELDS]
+    data = [
+            {column: getattr(quiz, column) for column in columns}
+            for quiz in quizzes
+            ]
+    if 'questions' in fields:
+        questions = {quiz.id: [] for quiz in quizzes}
+        if questions:
+            for question in fetch_questions(list(questions)):
+                questions[question.quiz_id].append(question)
+        encode = encode_columns if columnar else _serialize_questions
+        for quiz, quiz_data in zip(quizzes, data):
+            quiz_data['questions'] = encode(questions[quiz.id])
+    return data
+
+
+def _encode(quizzes, fields=DEFAULT_FIELDS, columnar=False):
+    '''
+    Serializes and encodes a list of quizzes.
+
+    Args:
+        quizzes (list): The quiz rows to encode.
+        fields (tuple, optional): The requested field names.
+        columnar (bool, optional): Encodes the questions as
+        parallel arrays.
+
+    Returns:
+        list: The encoded JSON payload (bytes) of each quiz.
+    '''
+
+    return [
+            current_app.json.dumps_bytes(quiz_data)
+            for quiz_data in serialize_quizzes(quizzes, fields, columnar)
+            ]
+
+
+def encode_quizzes(quizzes, fields=DEFAULT_FIELDS, columnar=False):
+    '''
+    Returns the encoded JSON payloads of a list of quizzes.
+
+    Full representations are read from the payload cache, for the version
+    of each quiz row. The quizzes that are not cached are serialized
+    together (one query for all their questions) and added to the cache.
+    Sparse and columnar representations are not cached.
+
+    Args:
+        quizzes (list): The quiz rows to encode (with their `version`,
+        see `quiz_select`).
+        fields (tuple, optional): The requested field names.
+        columnar (bool, optional): Encodes the questions as
+        parallel arrays.
+
+    Returns:
+        list: The encoded JSON payload (bytes) of each quiz,
+        in the given order.
+    '''
+
+    if fields != DEFAULT_FIELDS or columnar:
+        return _encode(quizzes, fields, columnar)
+    generation = payload_cache.generation
+    payloads = [payload_cache.get(quiz.id, quiz.version) for quiz in quizzes]
+    missing = [
+            quiz
+            for quiz, payload in zip(quizzes, payloads)
+            if payload is None
+            ]
+    encoded = {}
+    for quiz, payload in zip(missing, _encode(missing)):
+        payload_cache.set(quiz.id, quiz.version, payload, generation)
+        encoded[quiz.id] = payload
+    return [
+            payload if payload is not None else encoded[quiz.id]
+            for quiz, payload in zip(quizzes, payloads)
+            ]
+
+
+def encode_quiz(quiz_id, version, fields=DEFAULT_FIELDS):
+    '''
+    Returns the encoded JSON payload of a quiz.
+
+    On a cache hit neither the quiz nor its questions are loaded.
+    If the quiz does not exist, a 404 error is raised.
+
+    Args:
+        quiz_id (int): The ID of the quiz.
+        version (int): The current version of the quiz, read by
+        the caller (see `quiz_version`).
+        fields (tuple, optional): The requested field names.
+
+    Returns:
+        bytes: The encoded JSON payload of the quiz.
+    '''
+
+    cached = fields == DEFAULT_FIELDS
+    generation = payload_cache.generation
+    payload = payload_cache.get(quiz_id, version) if cached else None
+    if payload is None:
+        quizzes = fetch_rows(
+                quiz_select_fields(fields).where(quiz_table.c.id == quiz_id)
+                )
+        if not quizzes:
+            abort(404)
+        payload = _encode(quizzes, fields)[0]
+        if cached:
+            payload_cache.set(quiz_id, quizzes[0].version, payload, generation)
+    return payload
+
+
+def quizzes_response(payloads, **fields):
+    '''
+    Builds a JSON response around encoded quiz payloads.
+
+    The payloads are spliced into the body as they are, without being
+    decoded and encoded again.
+
+    Args:
+        payloads (list): The encoded JSON payloads of the quizzes.
+        **fields: Other members of the response object
+        (e.g. `total`, `pages`).
+
+    Returns:
+        Response: A JSON response with the quizzes under `quizzes`
+        and the other fields next to it.
+    '''
+
+    json = current_app.json
+    body = [
+            b'{"quizzes"',
+            json.key_separator,
+            b'[',
+            json.item_separator.join(payloads),
+            b']'
+            ]
+    for key, value in fields.items():
+        body += [
+                json.item_separator,
+                json.dumps_bytes(key),
+                json.key_separator,
+                json.dumps_bytes(value)
+                ]
+    body.append(b'}')
+    return json.response(PreEncoded(b''.join(body)))
@@ -0,0 +1,60 @@
+'''
+app/routes/api/standings.py
+
+This module defines the API route for the overall standings of the users.
+
+Routes:
+    /api/standings: Returns the best users over all the quizzes.
+'''
+
+from . import api_bp
+from app.leaderboard import rank_entries
+from app.standings import SORTS, top_standings
+from flask import jsonify, request
+from flask_login import login_required
+
+
+@api_bp.route('/standings')
+@login_required
+def standings():
+    '''
+    Returns the best users over all the quizzes.
+
+    The standings are read from the rollups maintained with the results
+    (see `app.standings`), with one query.
+
+    Query Parameters:
+        limit (int, optional): The number of users (1 to 100, default 10).
+        sort (str, optional): `total` to rank by total score (default),
+        or `mean` to rank by mean percent.
+
+    Returns:
+        Response: A JSON object containing:
+            - standings (list): The best users, with `rank`, `user_id`,
+            `name`, `username`, `total_score`, `quizzes_completed`
+            and `mean_percent`.
+        A 400 error is returned if the ranking is unknown.
+    '''
+
+    limit = min(max(request.args.get('limit', 10, type=int), 1), 100)
+    sort = request.args.get('sort', 'total')
+    if sort not in SORTS:
+        return jsonify({'error': 'Unknown sort.'}), 400
+    key = 'total_score' if sort == 'total' else 'mean_percent'
+    return jsonify({
+        'standings': [
+            {
+                'rank': rank,
+                'user_id': standing.user_id,
+                'name': standing.name,
+                'username': standing.username,
+                'total_score': standing.total_score,
+                'quizzes_completed': standing.quizzes_completed,
+                'mean_percent': round(standing.mean_percent, 2)
+                }
+            for rank, standing in rank_entries(
+                top_standings(limit, sort),
+                key
+                )
+            ]
+        })
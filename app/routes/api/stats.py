@@ -0,0 +1,43 @@
+'''
+app/routes/api/stats.py
+
+This module defines the admin API route for the item analysis of a quiz.
+
+Routes:
+    /api/quiz/<int:quiz_id>/stats: Returns the item statistics of the
+    questions of a quiz.
+'''
+
+from . import api_bp
+from app.item_stats import item_analysis
+from flask import jsonify
+from flask_login import current_user, login_required
+
+
+@api_bp.route('/quiz/<int:quiz_id>/stats')
+@login_required
+def stats(quiz_id):
+    '''
+    Returns the item statistics of the questions of a quiz.
+
+    The statistics are computed from the counters maintained on every
+    submission, with a single query and without reading any attempt.
+    This route is restricted to admins.
+
+    Args:
+        quiz_id (int): The ID of the quiz.
+
+    Returns:
+        Response: A JSON object containing:
+            - quiz_id (int): The ID of the quiz.
+            - questions (list): One entry per question that was answered,
+            with `id`, `responses`, `difficulty` (share of correct
+            answers), `discrimination` (item-rest point-biserial
+            correlation, or null), `options` (share of each option)
+            and `unanswered`.
+        A 403 error is returned if the user is not an admin.
+    '''
+
+    if current_user.role != 'admin':
+        return jsonify({'error': 'Only admins can read statistics.'}), 403
+    return jsonify({'quiz_id': quiz_id, 'questions': item_analysis(quiz_id)})
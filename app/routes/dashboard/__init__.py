@@ -9,6 +9,7 @@ Routes:
     - new: Displays the new quizzes section of the dashboard.
     - old: Displays the old quizzes section of the dashboard.
     - leaderboard: Displays the leaderboard page.
+    - standings: Displays the overall standings page.
 
 Blueprint:
     dashboard_bp: The blueprint for managing routes related to the dashboard.
@@ -22,3 +23,4 @@ from .main import main  # noqa: E402
 from .new import new  # noqa: E402
 from .old import old  # noqa: E402
 from .leaderboard import leaderboard  # noqa: E402
+from .standings import standings  # noqa: E402
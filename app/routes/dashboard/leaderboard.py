@@ -2,16 +2,22 @@
 app/routes/dashboard/leaderboard.py
 
 This module defines the route for displaying the leaderboard in the dashboard.
-The leaderboard shows the top 10 users based on their quiz scores (percentage).
+The leaderboard shows the top 10 users based on their quiz scores (percentage),
+overall or on a selected quiz, of all time or of the current day, week
+or month, along with the rank of the current user on the selected quiz.
 
 Routes:
     - leaderboard: Displays the leaderboard with the top 10 users' scores.
 '''
 
-from flask import render_template
-from app.models import QuizResult
+from flask import render_template, request
+from app.extensions import db
+from app.leaderboard import ranked_leaderboard, user_rank
+from app.leaderboard_windows import WINDOWS
+from app.models import Quiz
 from . import dashboard_bp
-from flask_login import login_required
+from flask_login import current_user, login_required
+from sqlalchemy import select
 
 
 @dashboard_bp.route('/leaderboard')
@@ -21,13 +27,38 @@ def leaderboard():
     Renders the leaderboard page with the top 10 highest quiz scores.
 
     The leaderboard is ordered by the percentage of correct answers and
-    shows the top 10 results.
+    shows the top 10 results. It is read from the leaderboard entries,
+    which already hold the user and quiz names (see `app.leaderboard`).
+    When a quiz is selected with the `quiz_id` query parameter, only its
+    results are shown, with the rank and percentile of the current user
+    on the all-time leaderboard. The `window` query parameter (`today`,
+    `week` or `month`) restricts the leaderboard to the best scores of the
+    period, merged from the daily buckets (see `app.leaderboard_windows`);
+    as in the API, no rank is shown then, since the histogram only holds
+    the latest scores of all time. Concurrent requests for the same
+    leaderboard share one read.
 
     Returns:
         render_template: The rendered leaderboard HTML page.
     '''
 
-    scores = QuizResult.query.order_by(
-            QuizResult.percent.desc()
-            ).limit(10).all()
-    return render_template('dashboard/leaderboard.html', scores=scores)
+    quiz_id = request.args.get('quiz_id', type=int)
+    window = request.args.get('window')
+    if window not in WINDOWS:
+        window = None
+    scores = ranked_leaderboard(10, quiz_id, window or 'all')
+    quizzes = db.session.execute(
+            select(Quiz.id, Quiz.title).order_by(Quiz.id)
+            ).all()
+    standing = None
+    if quiz_id is not None and window is None:
+        standing = user_rank(current_user.id, quiz_id)
+    return render_template(
+            'dashboard/leaderboard.html',
+            scores=scores,
+            quizzes=quizzes,
+            quiz_id=quiz_id,
+            window=window,
+            windows=WINDOWS,
+            standing=standing
+            )
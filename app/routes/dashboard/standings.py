@@ -0,0 +1,41 @@
+'''
+app/routes/dashboard/standings.py
+
+This module defines the route for displaying the overall standings in the
+dashboard. The standings rank the users by their performance over all the
+quizzes they took, with one row per user.
+
+Routes:
+    - standings: Displays the top 10 users over all quizzes.
+'''
+
+from flask import render_template, request
+from app.leaderboard import rank_entries
+from app.standings import SORTS, top_standings
+from . import dashboard_bp
+from flask_login import login_required
+
+
+@dashboard_bp.route('/standings')
+@login_required
+def standings():
+    '''
+    Renders the overall standings page with the top 10 users.
+
+    The users are ranked by their total score, or by their mean percent
+    score with `?sort=mean`. The standings are read from the rollups
+    maintained with the results (see `app.standings`).
+
+    Returns:
+        render_template: The rendered standings HTML page.
+    '''
+
+    sort = request.args.get('sort')
+    if sort not in SORTS:
+        sort = 'total'
+    key = 'total_score' if sort == 'total' else 'mean_percent'
+    return render_template(
+            'dashboard/standings.html',
+            standings=rank_entries(top_standings(10, sort), key),
+            sort=sort
+            )
@@ -17,7 +17,14 @@ Returns:
 from flask import request
 from flask_login import current_user
 from app.extensions import db
-from app.models import User
+from app.events import mark_results_saved
+from app.models import (
+        LeaderboardDay,
+        LeaderboardEntry,
+        User,
+        UserStanding
+        )
+from sqlalchemy import update
 
 
 def update_info():
@@ -26,7 +33,9 @@ def update_info():
 
     This function checks if the new username or email is already in use
     by other users. If valid, it updates the
-    current user's name, username, and email in the database.
+    current user's name, username, and email in the database, along with
+    the names copied in their leaderboard entries, daily buckets
+    and standing.
 
     Args:
         None
@@ -54,6 +63,13 @@ def update_info():
     current_user.name = name
     current_user.username = username
     current_user.email = email
+    for model in (LeaderboardEntry, LeaderboardDay, UserStanding):
+        db.session.execute(
+                update(model).where(
+                    model.user_id == current_user.id
+                    ).values(name=name, username=username)
+                )
+    mark_results_saved(db.session)
 
     db.session.commit()
     return 'correct'
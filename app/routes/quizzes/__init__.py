@@ -9,6 +9,8 @@ Blueprint:
 Modules:
     quiz: Defines the route for handling individual quiz interactions.
     main: Defines the main route for displaying a list of all quizzes.
+    adaptive: Defines the route for taking a quiz in adaptive mode.
+    list_quizzes: Reads the list of quizzes, coalescing concurrent reads.
 '''
 
 from flask import Blueprint
@@ -17,3 +19,4 @@ quizzes_bp = Blueprint('quizzes', __name__, url_prefix='/quizzes')
 
 from .quiz import quiz  # noqa: E402
 from .main import main  # noqa: E402
+from .adaptive import adaptive  # noqa: E402
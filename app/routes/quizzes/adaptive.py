@@ -0,0 +1,259 @@
+'''
+app/routes/quizzes/adaptive.py
+
+This module defines the route for taking a quiz in adaptive mode.
+
+Routes:
+    /<int:quiz_id>/adaptive: Asks the questions of a quiz one at a time,
+    each chosen for the user's running ability estimate.
+
+Functions:
+    adaptive: Displays the next question, records each answer, and stores
+    the result once the last question is answered.
+'''
+
+from . import quizzes_bp
+from .attempt_token import is_late
+from app.extensions import db
+from app.models import AdaptiveAttempt, Question, Quiz
+from app.item_bank import item_banks, estimate_ability
+from app.results import grade_submission
+from app.result_writer import result_writer
+from flask_login import current_user, login_required
+from flask import (
+        current_app,
+        request,
+        flash,
+        redirect,
+        url_for,
+        render_template
+        )
+from datetime import datetime
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm.exc import StaleDataError
+
+_BLANK = '-'
+
+
+def _questions(attempt):
+    '''
+    Returns the questions asked in an adaptive attempt.
+
+    Args:
+        attempt (AdaptiveAttempt): The attempt in progress.
+
+    Returns:
+        list: The question IDs, as strings, in the order they were asked.
+    '''
+
+    return attempt.question_ids.split(',') if attempt.question_ids else []
+
+
+def _answers(attempt):
+    '''
+    Returns the answers of an adaptive attempt.
+
+    Args:
+        attempt (AdaptiveAttempt): The attempt in progress.
+
+    Returns:
+        list: The selected option of each answered question, or None
+        for the ones left blank.
+    '''
+
+    return [None if answer == _BLANK else answer for answer in attempt.answers]
+
+
+def _next_question(bank, attempt):
+    '''
+    Chooses the next question of an adaptive attempt.
+
+    Args:
+        bank (ItemBank): The item bank of the quiz.
+        attempt (AdaptiveAttempt): The attempt in progress.
+
+    Returns:
+        str or None: The ID of the next question, or None if every
+        question was asked.
+    '''
+
+    used = {
+            bank.positions[question_id]
+            for question_id in _questions(attempt)
+            if question_id in bank.positions
+            }
+    index = bank.next_item(attempt.ability, used)
+    return None if index is None else str(bank.question_ids[index])
+
+
+def _record_answer(bank, attempt, option):
+    '''
+    Records the answer to the current question and updates
+    the ability estimate.
+
+    Args:
+        bank (ItemBank): The item bank of the quiz.
+        attempt (AdaptiveAttempt): The attempt in progress.
+        option (str or None): The selected option.
+    '''
+
+    option = option.lower() if option else None
+    attempt.answers += option if option in ('a', 'b', 'c', 'd') else _BLANK
+    difficulties = []
+    responses = []
+    for question_id, answer in zip(_questions(attempt), _answers(attempt)):
+        index = bank.positions.get(question_id)
+        if index is not None:
+            difficulties.append(bank.difficulties[index])
+            responses.append(answer == bank.correct_options[index])
+    attempt.ability = estimate_ability(difficulties, responses)
+
+
+def _elapsed(attempt):
+    '''
+    Returns the time elapsed since an adaptive attempt was started.
+
+    Args:
+        attempt (AdaptiveAttempt): The attempt in progress.
+
+    Returns:
+        float: The elapsed time, in seconds.
+    '''
+
+    return max((datetime.utcnow() - attempt.started).total_seconds(), 0)
+
+
+def _time_up(attempt):
+    '''
+    Discards an adaptive attempt submitted after the time limit.
+
+    Args:
+        attempt (AdaptiveAttempt): The attempt in progress.
+
+    Returns:
+        Response: A redirect to the dashboard.
+    '''
+
+    db.session.delete(attempt)
+    db.session.commit()
+    flash('Time is up: your answers were not accepted.', 'danger')
+    return redirect(url_for('dashboard.main'))
+
+
+@quizzes_bp.route('/<int:quiz_id>/adaptive', methods=['GET', 'POST'])
+@login_required
+def adaptive(quiz_id):
+    '''
+    Displays the next question and handles the answers of an adaptive quiz.
+
+    The questions are asked one at a time. After each answer, the ability
+    of the user is estimated again, and the next question is the unused
+    one whose precomputed difficulty is the closest to it, found in the
+    cached item bank of the quiz without any query. Only the question
+    being displayed is loaded. The state of the attempt (questions asked,
+    answers and ability) is kept on the server (see `AdaptiveAttempt`), so
+    a question cannot be answered twice by replaying an earlier request,
+    and concurrent answers to the same question are refused. Once
+    `draw_count` questions (or `ADAPTIVE_QUIZ_LENGTH`) are answered, the
+    attempt is graded and stored like any other, with the questions in
+    the order they were asked.
+
+    The time limit applies to the whole attempt, as on the quiz page:
+    once it is exceeded, the attempt is either discarded or recorded
+    as late, depending on `QUIZ_LATE_POLICY`.
+
+    Args:
+        quiz_id (int): The ID of the quiz.
+
+    Returns:
+        Response:
+            - If the request method is GET, it renders the next question.
+            - If the request method is POST, it records the answer and
+            redirects to the next question, or flashes the score and
+            redirects to the dashboard after the last one.
+    '''
+
+    config = current_app.config
+    url = url_for('quizzes.adaptive', quiz_id=quiz_id)
+    bank = item_banks.get(quiz_id)
+    attempt = db.session.get(AdaptiveAttempt, (current_user.id, quiz_id))
+    late = attempt is not None and is_late(_elapsed(attempt))
+    if late and config['QUIZ_LATE_POLICY'] == 'reject':
+        return _time_up(attempt)
+
+    if request.method == 'POST':
+        if attempt is None or len(attempt.answers) == len(
+                _questions(attempt)):
+            return redirect(url)
+        _record_answer(bank, attempt, request.form.get('answer'))
+        if len(attempt.answers) < attempt.length:
+            try:
+                db.session.commit()
+            except StaleDataError:
+                db.session.rollback()
+            return redirect(url)
+        questions = _questions(attempt)
+        answers = _answers(attempt)
+        ability = attempt.ability
+        duration = round(_elapsed(attempt))
+        db.session.delete(attempt)
+        try:
+            db.session.commit()
+        except StaleDataError:
+            db.session.rollback()
+            return redirect(url)
+        result = grade_submission(
+                current_user.id,
+                quiz_id,
+                dict(zip(questions, answers)),
+                duration,
+                late,
+                question_ids=tuple(questions)
+                )
+        result['ability'] = ability
+        result_writer.submit([result])
+        flash(
+                f'You scored {result["score"]}/{result["total"]} '
+                f'(ability {ability:+.2f}).',
+                'info'
+                )
+        return redirect(url_for('dashboard.main'))
+
+    quiz = Quiz.query.get_or_404(quiz_id)
+    if not len(bank):
+        flash('This quiz has no questions yet.', 'info')
+        return redirect(url_for('quizzes.main'))
+    if attempt is None:
+        length = quiz.draw_count or config['ADAPTIVE_QUIZ_LENGTH']
+        attempt = AdaptiveAttempt(
+                user_id=current_user.id,
+                quiz_id=quiz_id,
+                question_ids='',
+                answers='',
+                ability=0.0,
+                length=min(length, len(bank))
+                )
+        db.session.add(attempt)
+    questions = _questions(attempt)
+    if len(attempt.answers) == len(questions):
+        question_id = _next_question(bank, attempt)
+        if question_id is None:
+            db.session.delete(attempt)
+            db.session.commit()
+            return redirect(url)
+        questions.append(question_id)
+        attempt.question_ids = ','.join(questions)
+    length = attempt.length
+    try:
+        db.session.commit()
+    except (IntegrityError, StaleDataError):
+        db.session.rollback()
+        return redirect(url)
+    question = Question.query.get_or_404(int(questions[-1]))
+    return render_template(
+            'quizzes/adaptive.html',
+            quiz=quiz,
+            question=question,
+            number=len(questions),
+            length=length
+            )
@@ -0,0 +1,122 @@
+'''
+app/routes/quizzes/attempt_token.py
+
+This module defines the signed attempt tokens used to enforce the quiz
+time limit on the server.
+
+The quiz page embeds a token holding the user and quiz IDs, and for
+quizzes that draw a subset of their questions, the number of questions
+drawn, the seed they were drawn with and the fingerprint of the pool they
+were drawn from. The token is signed and timestamped with the app's secret
+key. The submission returns it, and the time taken and drawn questions are
+read from the token alone, without any per-attempt state on the server.
+The drawn questions can only be rebuilt while the questions of the quiz
+keep the fingerprint the token was issued for (see `pool_fingerprint`).
+
+Classes:
+    Attempt: The attempt read from a token.
+
+Functions:
+    issue_attempt_token: Issues the token of a new quiz attempt.
+    read_attempt_token: Reads the attempt of a token.
+    is_late: Tells whether a submission exceeds the time limit.
+'''
+
+from flask import current_app
+from itsdangerous import URLSafeTimedSerializer, BadData
+from time import time
+from collections import namedtuple
+
+Attempt = namedtuple(
+        'Attempt',
+        ['elapsed', 'draw_count', 'seed', 'pool']
+        )
+Attempt.__doc__ = '''
+The attempt read from a token.
+
+Attributes:
+    elapsed (float): The time elapsed since the token was issued,
+    in seconds.
+    draw_count (int or None): The number of questions drawn.
+    seed (int or None): The seed the questions were drawn with.
+    pool (str or None): The fingerprint of the questions the drawn ones
+    were drawn from.
+'''
+
+
+def _serializer():
+    '''
+    Returns the serializer used to sign attempt tokens with the app's
+    secret key.
+    '''
+
+    return URLSafeTimedSerializer(
+            current_app.config['SECRET_KEY'],
+            salt='quiz-attempt'
+            )
+
+
+def issue_attempt_token(
+        user_id,
+        quiz_id,
+        draw_count=None,
+        seed=None,
+        pool=None
+        ):
+    '''
+    Issues the token of a new quiz attempt.
+
+    Args:
+        user_id (int): The ID of the user taking the quiz.
+        quiz_id (int): The ID of the quiz.
+        draw_count (int, optional): The number of questions drawn.
+        seed (int, optional): The seed the questions were drawn with.
+        pool (str, optional): The fingerprint of the questions the drawn
+        ones were drawn from.
+
+    Returns:
+        str: A signed, timestamped, URL-safe token.
+    '''
+
+    return _serializer().dumps([user_id, quiz_id, draw_count, seed, pool])
+
+
+def read_attempt_token(token, user_id, quiz_id):
+    '''
+    Reads the attempt of a token.
+
+    Args:
+        token (str): The token returned with the submission.
+        user_id (int): The ID of the user submitting the quiz.
+        quiz_id (int): The ID of the submitted quiz.
+
+    Returns:
+        Attempt or None: The attempt, or None if the token is invalid
+        or was issued for another user or quiz.
+    '''
+
+    try:
+        payload, issued = _serializer().loads(token, return_timestamp=True)
+    except BadData:
+        return None
+    if not isinstance(payload, list) or len(payload) != 5 or (
+            payload[:2] != [user_id, quiz_id]):
+        return None
+    return Attempt(max(time() - issued.timestamp(), 0), *payload[2:])
+
+
+def is_late(elapsed):
+    '''
+    Tells whether a submission exceeds the time limit.
+
+    Args:
+        elapsed (float): The time elapsed since the quiz was displayed,
+        in seconds.
+
+    Returns:
+        bool: True if the submission came after the time limit
+        and the grace period.
+    '''
+
+    config = current_app.config
+    return elapsed > config['QUIZ_TIME_LIMIT'] + config['QUIZ_GRACE_PERIOD']
@@ -0,0 +1,45 @@
+'''
+app/routes/quizzes/draw_questions.py
+
+This module contains the function that selects the questions shown
+for a new quiz attempt.
+
+Functions:
+    draw_questions: Draws the questions of a new attempt.
+'''
+
+from app.models import Question
+from app.answer_keys import answer_keys, draw_answer_key, pool_fingerprint
+from secrets import randbits
+
+
+def draw_questions(quiz):
+    '''
+    Draws the questions of a new attempt.
+
+    When the quiz draws `draw_count` questions per attempt, a new seed is
+    picked and the drawn question IDs are derived from it and the cached
+    answer key, so only the drawn rows are loaded. The seed and the
+    fingerprint of the pool travel in the attempt token, and grading
+    rebuilds the same subset from them (submissions are refused if
+    questions were added or deleted in between).
+
+    Args:
+        quiz (Quiz): The quiz being taken.
+
+    Returns:
+        tuple: The questions to display, ordered by ID, the seed they
+        were drawn with and the fingerprint of the pool they were drawn
+        from (both None when every question is shown).
+    '''
+
+    answer_key = answer_keys.get(quiz.id)
+    if not quiz.draw_count or quiz.draw_count >= len(answer_key.question_ids):
+        return quiz.questions, None, None
+    seed = randbits(31)
+    drawn = draw_answer_key(answer_key, quiz.draw_count, seed)
+    question_ids = [int(question_id) for question_id in drawn.question_ids]
+    questions = Question.query.filter(
+            Question.id.in_(question_ids)
+            ).order_by(Question.id).all()
+    return questions, seed, pool_fingerprint(answer_key)
@@ -11,9 +11,9 @@ Functions:
     the quizzes list page.
 '''
 
-from app.models import Quiz
 from flask import render_template
 from . import quizzes_bp
+from .list_quizzes import list_quizzes
 
 
 @quizzes_bp.route('')
@@ -21,12 +21,13 @@ def main():
     '''
     Displays a list of all quizzes.
 
-    This function queries the database for all quizzes
-    and renders them in the quizzes main page.
+    This function reads the ID and title of all quizzes (one read shared
+    by concurrent requests, see `list_quizzes`) and renders them
+    in the quizzes main page.
 
     Returns:
         Response: The rendered HTML page containing a list of all quizzes.
     '''
 
-    all_quizzes = Quiz.query.all()
+    all_quizzes = list_quizzes()
     return render_template('quizzes/main.html', quizzes=all_quizzes)
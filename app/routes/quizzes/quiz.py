@@ -15,9 +15,19 @@ Functions:
 '''
 
 from .update_results import update_results
-from flask_login import login_required
-from flask import request, flash, redirect, url_for, render_template
+from .attempt_token import issue_attempt_token, read_attempt_token, is_late
+from .draw_questions import draw_questions
+from flask_login import current_user, login_required
+from flask import (
+        current_app,
+        request,
+        flash,
+        redirect,
+        url_for,
+        render_template
+        )
 from . import quizzes_bp
+from app.answer_keys import answer_keys, pool_fingerprint
 from app.models import Quiz
 
 
@@ -33,21 +43,67 @@ def quiz(quiz_id):
     the user is shown their score and redirected to
     the dashboard.
 
+    The quiz page embeds a signed attempt token, and the time limit is
+    enforced from the token returned with the answers. Submissions with
+    a missing or invalid token are refused. Late submissions are either
+    refused or recorded as late, depending on `QUIZ_LATE_POLICY`.
+    For quizzes that draw a subset of their questions, the token also
+    carries the seed of the drawn questions and the fingerprint of the
+    pool they were drawn from, and submissions are refused if questions
+    were added to or deleted from the quiz since it was displayed, as
+    the same questions could not be drawn again. Other changes (edits,
+    calibration, regrading) do not affect the drawn questions, and the
+    questions of other attempts are those of the current answer key.
+
     Args:
         quiz_id (int): The ID of the quiz to be displayed.
 
     Returns:
         Response:
             - If the request method is GET, it renders the quiz page
-            with the quiz data.
+            with the quiz data and a new attempt token.
             - If the request method is POST, it processes the results,
             flashes the score, and redirects to the dashboard.
     '''
 
-    quiz = Quiz.query.get_or_404(quiz_id)
+    config = current_app.config
     if request.method == 'POST':
-        score = update_results(quiz_id, quiz)
-        flash(f'You scored {score}/{len(quiz.questions)}.', 'info')
+        attempt = read_attempt_token(
+                request.form.get('attempt_token', ''),
+                current_user.id,
+                quiz_id
+                )
+        if attempt is None:
+            flash('This attempt is not valid. Please start again.', 'danger')
+            return redirect(url_for('quizzes.quiz', quiz_id=quiz_id))
+        if attempt.seed is not None and attempt.pool != pool_fingerprint(
+                answer_keys.get(quiz_id)):
+            flash(
+                    'This quiz changed while you were taking it. '
+                    'Please start again.',
+                    'danger'
+                    )
+            return redirect(url_for('quizzes.quiz', quiz_id=quiz_id))
+        late = is_late(attempt.elapsed)
+        if late and config['QUIZ_LATE_POLICY'] == 'reject':
+            flash('Time is up: your answers were not accepted.', 'danger')
+            return redirect(url_for('dashboard.main'))
+        score, total = update_results(quiz_id, attempt, late)
+        flash(f'You scored {score}/{total}.', 'info')
         return redirect(url_for('dashboard.main'))
 
-    return render_template('quizzes/quiz.html', quiz=quiz)
+    quiz = Quiz.query.get_or_404(quiz_id)
+    questions, seed, pool = draw_questions(quiz)
+    return render_template(
+            'quizzes/quiz.html',
+            quiz=quiz,
+            questions=questions,
+            attempt_token=issue_attempt_token(
+                current_user.id,
+                quiz_id,
+                quiz.draw_count if seed is not None else None,
+                seed,
+                pool
+                ),
+            time_limit=config['QUIZ_TIME_LIMIT']
+            )
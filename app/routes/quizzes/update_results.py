@@ -8,52 +8,42 @@ Functions:
     and updates or creates a new quiz result.
 '''
 
-from app.extensions import db
-from app.models import QuizResult
+from app.results import grade_submission
+from app.result_writer import result_writer
 from flask_login import current_user
 from flask import request
 
 
-def update_results(quiz_id, quiz):
+def update_results(quiz_id, attempt, late=False):
     '''
     Calculates the quiz score and updates the quiz result for the current user.
 
-    This function compares the selected answers with the correct options
-    for each question in the quiz.
-    It then updates or creates a `QuizResult` record,
-    storing the user's score and percentage.
+    This function compares the selected answers with the compiled answer
+    key of the quiz, which is cached in process, so no question is loaded.
+    It then records the attempt and updates the user's `QuizResult` rollup
+    (in write-behind mode, the write is queued; see `app.result_writer`).
 
     Args:
         quiz_id (int): The ID of the quiz.
-        quiz (Quiz): The `Quiz` object containing questions
-        and correct answers.
+        attempt (Attempt): The attempt read from the attempt token
+        (time taken and drawn questions).
+        late (bool, optional): Whether the submission exceeded
+        the time limit.
 
     Returns:
-        int: The total score of the user for the quiz.
+        tuple: The score of the user for the quiz and the number
+        of questions.
     '''
 
-    score = 0
-    for question in quiz.questions:
-        selected_option_id = request.form.get(str(question.id))
-        if selected_option_id:
-            if selected_option_id.lower() == question.correct_option:
-                score += 1
-    percent = round(score / len(quiz.questions) * 100, 2)
-    old_result = QuizResult.query.filter_by(
-            quiz=quiz,
-            user=current_user
-            ).first()
-    if old_result:
-        old_result.score = score
-        old_result.percent = percent
-    else:
-        result = QuizResult(
-                user_id=current_user.id,
-                quiz_id=quiz_id,
-                score=score,
-                percent=percent
-                )
-        db.session.add(result)
-    db.session.commit()
-
-    return score
+    result = grade_submission(
+            current_user.id,
+            quiz_id,
+            request.form,
+            round(attempt.elapsed),
+            late,
+            attempt.draw_count,
+            attempt.seed
+            )
+    result_writer.submit([result])
+
+    return result['score'], result['total']
@@ -0,0 +1,191 @@
+'''
+app/single_flight.py
+
+This module defines a single-flight layer that coalesces concurrent calls
+of expensive read functions.
+
+When several requests need the same value at the same time (e.g. right
+after a cache was invalidated), the first caller computes it and the
+others wait for its result instead of running the same queries. Nothing
+is kept once the call completes: a later call computes the value again.
+
+Callers wait at most `SINGLE_FLIGHT_TIMEOUT` seconds, then compute the
+value themselves. If the computation fails, its error is raised to every
+caller that was waiting for it. Values are shared between threads, so they
+must not depend on the request or the session that computed them (e.g.
+rows or encoded payloads rather than ORM objects).
+
+Classes:
+    SingleFlight: Coalesces concurrent calls with the same key.
+'''
+
+from concurrent.futures import Future, TimeoutError
+from threading import Lock
+
+
+class _Flight:
+    '''
+    A call in progress.
+
+    Attributes:
+        future (Future): The result of the call.
+        waiters (int): The number of callers waiting for it.
+    '''
+
+    __slots__ = ('future', 'waiters')
+
+    def __init__(self):
+        '''
+        Creates a call in progress, without waiters.
+        '''
+
+        self.future = Future()
+        self.waiters = 0
+
+
+class SingleFlight:
+    '''
+    Coalesces concurrent calls with the same key.
+
+    Attributes:
+        timeout (float): The maximum time a caller waits for the result
+        of another one, in seconds (0 disables coalescing).
+        calls (int): The number of calls.
+        executions (int): The number of calls that computed the value.
+        coalesced (int): The number of calls answered with the result
+        of another one.
+        timeouts (int): The number of calls that stopped waiting and
+        computed the value themselves.
+        errors (int): The number of computations that failed.
+        max_waiters (int): The largest number of callers that waited
+        for one computation.
+    '''
+
+    def __init__(self, app=None):
+        '''
+        Creates the layer, optionally binding it to an application.
+
+        Args:
+            app (Flask, optional): The Flask application instance.
+        '''
+
+        self._lock = Lock()
+        self._flights = {}
+        self.timeout = 0
+        self._reset_stats()
+        if app is not None:
+            self.init_app(app)
+
+    def _reset_stats(self):
+        '''
+        Resets the counters of the layer.
+        '''
+
+        self.calls = 0
+        self.executions = 0
+        self.coalesced = 0
+        self.timeouts = 0
+        self.errors = 0
+        self.max_waiters = 0
+
+    def init_app(self, app):
+        '''
+        Configures the layer for an application.
+
+        Args:
+            app (Flask): The Flask application instance.
+        '''
+
+        self.timeout = app.config['SINGLE_FLIGHT_TIMEOUT']
+        self._reset_stats()
+        app.extensions['single_flight'] = self
+
+    def do(self, key, function, *args):
+        '''
+        Returns the value of a function, sharing it with the concurrent
+        calls that have the same key.
+
+        Args:
+            key (hashable): Identifies the value; calls with equal keys
+            must compute equal values.
+            function (callable): Computes the value.
+            *args: The arguments of the function.
+
+        Returns:
+            The value computed by this call or by a concurrent one.
+        '''
+
+        if not self.timeout:
+            return function(*args)
+        with self._lock:
+            self.calls += 1
+            flight = self._flights.get(key)
+            if flight is None:
+                flight = self._flights[key] = _Flight()
+                leader = True
+            else:
+                flight.waiters += 1
+                leader = False
+        if leader:
+            return self._lead(key, flight, function, args)
+
+        try:
+            value = flight.future.result(self.timeout)
+        except TimeoutError:
+            with self._lock:
+                self.timeouts += 1
+            return function(*args)
+        with self._lock:
+            self.coalesced += 1
+        return value
+
+    def _lead(self, key, flight, function, args):
+        '''
+        Computes a value and hands it to the callers waiting for it.
+
+        Args:
+            key (hashable): The key of the call.
+            flight (_Flight): The call in progress.
+            function (callable): Computes the value.
+            args (tuple): The arguments of the function.
+
+        Returns:
+            The computed value.
+        '''
+
+        try:
+            value = function(*args)
+        except BaseException as error:
+            flight.future.set_exception(error)
+            with self._lock:
+                self.errors += 1
+            raise
+        else:
+            flight.future.set_result(value)
+            return value
+        finally:
+            with self._lock:
+                del self._flights[key]
+                self.executions += 1
+                self.max_waiters = max(self.max_waiters, flight.waiters)
+
+    def stats(self):
+        '''
+        Returns the metrics of the layer.
+
+        Returns:
+            dict: The number of calls, computations, coalesced calls,
+            timeouts and errors, the calls in progress and the largest
+            number of waiters of a computation.
+        '''
+
+        with self._lock:
+            return {
+                    'calls': self.calls,
+                    'executions': self.executions,
+                    'coalesced': self.coalesced,
+                    'timeouts': self.timeouts,
+                    'errors': self.errors,
+                    'in_flight': len(self._flights),
+                    'max_waiters': self.max_waiters
+                    }
@@ -0,0 +1,178 @@
+'''
+app/standings.py
+
+This module maintains the overall standings of the users (see
+`UserStanding`) and reads them.
+
+The standing of a user adds up their leaderboard entries, one per quiz:
+the latest score and percent of the user on each quiz they took. When
+entries are written, the difference with their previous values is added
+to the standings in the same transaction (see `save_leaderboard`), so the
+standings are never computed by grouping the results.
+
+Functions:
+    save_standings: Adds changes to the standings of users.
+    rebuild_standings: Rebuilds every standing from the leaderboard
+    entries.
+    top_standings: Returns the best standings.
+
+Attributes:
+    SORTS (dict): The columns the standings can be ranked by, keyed by
+    the name of the ranking.
+'''
+
+from app.extensions import db
+from app.models import LeaderboardEntry, UserStanding
+from app.upsert import upsert
+from sqlalchemy import delete, func, insert, select, update
+
+SORTS = {
+        'total': UserStanding.total_score,
+        'mean': UserStanding.mean_percent
+        }
+
+_COUNTERS = ('total_score', 'quizzes_completed', 'percent_sum')
+
+
+def save_standings(rows):
+    '''
+    Adds changes to the standings of users.
+
+    The counters are incremented and the mean percent recomputed in the
+    database with a single `INSERT ... ON CONFLICT DO UPDATE` statement,
+    or, on dialects without `ON CONFLICT`, updated and inserted with
+    batched statements after looking up the existing standings.
+    The caller commits the transaction.
+
+    Args:
+        rows (list): One dictionary per user, with the `user_id`, `name`
+        and `username` of the user and the changes of `total_score`,
+        `quizzes_completed` and `percent_sum`.
+    '''
+
+    if not rows:
+        return
+    for row in rows:
+        completed = row['quizzes_completed']
+        row['mean_percent'] = (
+                row['percent_sum'] / completed if completed else 0
+                )
+    dialect_insert = upsert(db.session.get_bind().dialect.name)
+    if dialect_insert is not None:
+        statement = dialect_insert(UserStanding)
+        excluded = statement.excluded
+        statement = statement.on_conflict_do_update(
+                index_elements=[UserStanding.user_id],
+                set_={
+                    'name': excluded.name,
+                    'username': excluded.username,
+                    'total_score': (
+                        UserStanding.total_score + excluded.total_score
+                        ),
+                    'quizzes_completed': (
+                        UserStanding.quizzes_completed
+                        + excluded.quizzes_completed
+                        ),
+                    'percent_sum': (
+                        UserStanding.percent_sum + excluded.percent_sum
+                        ),
+                    'mean_percent': (
+                        (UserStanding.percent_sum + excluded.percent_sum)
+                        / func.nullif(
+                            UserStanding.quizzes_completed
+                            + excluded.quizzes_completed,
+                            0
+                            )
+                        )
+                    }
+                )
+        db.session.execute(statement, rows)
+        return
+
+    existing = {
+            row.user_id: row
+            for row in db.session.execute(
+                select(
+                    UserStanding.user_id,
+                    UserStanding.total_score,
+                    UserStanding.quizzes_completed,
+                    UserStanding.percent_sum
+                    ).where(
+                        UserStanding.user_id.in_(
+                            [row['user_id'] for row in rows]
+                            )
+                        )
+                )
+            }
+    updates = []
+    inserts = []
+    for row in rows:
+        stored = existing.get(row['user_id'])
+        if stored is None:
+            inserts.append(row)
+            continue
+        updated = dict(row, **{
+            counter: getattr(stored, counter) + row[counter]
+            for counter in _COUNTERS
+            })
+        completed = updated['quizzes_completed']
+        updated['mean_percent'] = (
+                updated['percent_sum'] / completed if completed else 0
+                )
+        updates.append(updated)
+    if updates:
+        db.session.execute(update(UserStanding), updates)
+    if inserts:
+        db.session.execute(insert(UserStanding), inserts)
+
+
+def rebuild_standings():
+    '''
+    Rebuilds every standing from the leaderboard entries.
+
+    The standings are replaced with one `INSERT ... SELECT` statement that
+    groups the entries by user. The caller commits the transaction.
+    '''
+
+    db.session.execute(delete(UserStanding))
+    db.session.execute(insert(UserStanding).from_select(
+        (
+            'user_id',
+            'name',
+            'username',
+            'total_score',
+            'quizzes_completed',
+            'percent_sum',
+            'mean_percent'
+            ),
+        select(
+            LeaderboardEntry.user_id,
+            func.max(LeaderboardEntry.name),
+            func.max(LeaderboardEntry.username),
+            func.sum(LeaderboardEntry.score),
+            func.count(),
+            func.sum(LeaderboardEntry.percent),
+            func.avg(LeaderboardEntry.percent)
+            ).group_by(LeaderboardEntry.user_id)
+        ))
+
+
+def top_standings(limit=10, sort='total'):
+    '''
+    Returns the best standings.
+
+    Args:
+        limit (int, optional): The number of standings.
+        sort (str, optional): The ranking, a key of `SORTS`: by total
+        score (default) or by mean percent.
+
+    Returns:
+        list: The best standings, best first.
+    '''
+
+    return db.session.execute(
+            select(UserStanding).order_by(
+                SORTS[sort].desc(),
+                UserStanding.user_id
+                ).limit(limit)
+            ).scalars().all()
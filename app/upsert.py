@@ -0,0 +1,32 @@
+'''
+app/upsert.py
+
+This module selects the dialect-specific `INSERT` construct used for
+upserts, which are not part of the portable SQLAlchemy `insert`.
+
+Functions:
+    upsert: Returns the dialect-specific `INSERT` construct that supports
+    `ON CONFLICT DO UPDATE`.
+'''
+
+
+def upsert(dialect_name):
+    '''
+    Returns the dialect-specific `INSERT` construct that supports
+    `ON CONFLICT DO UPDATE`.
+
+    Args:
+        dialect_name (str): The name of the database dialect.
+
+    Returns:
+        function: The `insert` function of the dialect, or None
+        if the dialect is not supported.
+    '''
+
+    if dialect_name == 'sqlite':
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+    elif dialect_name == 'postgresql':
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+    else:
+        return None
+    return dialect_insert
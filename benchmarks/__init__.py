@@ -0,0 +1,6 @@
+'''
+benchmarks/__init__.py
+
+This package contains micro-benchmarks for the hot paths of the application.
+Each module is a script meant to be run with `python -m benchmarks.<name>`.
+'''
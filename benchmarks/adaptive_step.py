@@ -0,0 +1,41 @@
+'''
+benchmarks/adaptive_step.py
+
+This script measures the cost of one step of the adaptive mode: updating
+the ability estimate and choosing the next question from an item bank.
+
+Usage:
+    python -m benchmarks.adaptive_step [questions] [answered]
+
+The script will:
+    - Build an item bank with the given number of questions (default 5000)
+    with random difficulties.
+    - Time a step after the given number of answers (default 30)
+    and print the average time per step.
+'''
+
+from app.item_bank import ItemBank, estimate_ability
+from random import Random
+from timeit import repeat
+import sys
+
+if __name__ == '__main__':
+    questions = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    answered = int(sys.argv[2]) if len(sys.argv) > 2 else 30
+    random = Random(0)
+    bank = ItemBank(sorted(
+        ((id_, 'a', random.gauss(0, 1.5)) for id_ in range(questions)),
+        key=lambda row: row[2]
+        ))
+    used = set(random.sample(range(questions), answered))
+    difficulties = [bank.difficulties[index] for index in used]
+    responses = [random.random() < 0.5 for _ in used]
+
+    def step():
+        ability = estimate_ability(difficulties, responses)
+        return bank.next_item(ability, used)
+
+    number = 1000
+    best = min(repeat(step, number=number, repeat=5)) / number
+    print(f'{questions} questions, {answered} answered: '
+          f'{best * 1e6:.1f} us per step')
@@ -0,0 +1,114 @@
+'''
+benchmarks/api_rows.py
+
+This script compares the cost per row of the two ways of reading quizzes
+and questions for the API: hydrating ORM objects, and the Core row path
+used by `app/routes/api`.
+
+Usage:
+    python -m benchmarks.api_rows [quizzes] [questions_per_quiz]
+
+The script will:
+    - Create an in-memory database with the testing configuration.
+    - Add the given number of quizzes (default 500) with the given number
+    of questions each (default 20).
+    - Load and serialize all of them through both paths several times
+    and print the best time per row of each.
+'''
+
+from app import create_app
+from app.config import TestingConfig
+from app.extensions import db
+from app.models import Quiz, Question
+from app.routes.api.rows import fetch_rows
+from app.routes.api.serialize_quizzes import (
+        quiz_select_fields,
+        serialize_question,
+        serialize_quizzes
+        )
+from timeit import repeat
+import sys
+
+
+def populate(quizzes, questions_per_quiz):
+    '''
+    Adds sample quizzes and questions to the database.
+
+    Args:
+        quizzes (int): The number of quizzes.
+        questions_per_quiz (int): The number of questions per quiz.
+    '''
+
+    for number in range(quizzes):
+        quiz = Quiz(title=f'Quiz {number}', description='Benchmark quiz.')
+        db.session.add(quiz)
+        db.session.flush()
+        db.session.add_all([
+            Question(
+                quiz_id=quiz.id,
+                text=f'Question {index}?',
+                option_a='A',
+                option_b='B',
+                option_c='C',
+                option_d='D',
+                correct_option='a'
+                )
+            for index in range(questions_per_quiz)
+            ])
+    db.session.commit()
+
+
+def orm_path():
+    '''
+    Loads and serializes every quiz through ORM objects.
+
+    Returns:
+        list: The serialized quizzes.
+    '''
+
+    db.session.remove()
+    quizzes = Quiz.query.order_by(Quiz.id).all()
+    questions = {quiz.id: [] for quiz in quizzes}
+    for question in Question.query.filter(
+            Question.quiz_id.in_(list(questions))
+            ).order_by(Question.id):
+        questions[question.quiz_id].append(serialize_question(question))
+    return [
+            {
+                'id': quiz.id,
+                'title': quiz.title,
+                'description': quiz.description,
+                'questions': questions[quiz.id]
+                }
+            for quiz in quizzes
+            ]
+
+
+def core_path():
+    '''
+    Loads and serializes every quiz through Core rows.
+
+    Returns:
+        list: The serialized quizzes.
+    '''
+
+    db.session.remove()
+    return serialize_quizzes(fetch_rows(quiz_select_fields()))
+
+
+if __name__ == '__main__':
+    quizzes = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    questions_per_quiz = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    rows = quizzes * (questions_per_quiz + 1)
+
+    app = create_app(TestingConfig)
+    with app.app_context():
+        db.create_all()
+        populate(quizzes, questions_per_quiz)
+        assert orm_path() == core_path()
+        for name, path in (('ORM', orm_path), ('Core', core_path)):
+            best = min(repeat(path, number=1, repeat=5))
+            print(
+                    f'{name:>4}: {best * 1000:8.2f} ms total, '
+                    f'{best / rows * 1e6:6.2f} us/row ({rows} rows)'
+                    )
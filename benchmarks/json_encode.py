@@ -0,0 +1,83 @@
+'''
+benchmarks/json_encode.py
+
+This script compares the time needed to encode representative quiz payloads
+with Flask's default JSON provider and with `QuizJSONProvider`, using the
+standard library and, when it is installed, `orjson`.
+
+Usage:
+    python -m benchmarks.json_encode [quizzes] [questions_per_quiz]
+
+The script will:
+    - Build the `/api/quizzes` payload of the given number of quizzes
+    (default 200) with the given number of questions each (default 20).
+    - Encode it several times with each encoder and print the best time
+    and the size of the output.
+'''
+
+from app import create_app
+from app.config import TestingConfig
+from app.json_provider import QuizJSONProvider, orjson
+from flask.json.provider import DefaultJSONProvider
+from timeit import repeat
+import sys
+
+
+def quizzes_payload(quizzes, questions_per_quiz):
+    '''
+    Builds a payload shaped like the response of `/api/quizzes`.
+
+    Args:
+        quizzes (int): The number of quizzes.
+        questions_per_quiz (int): The number of questions per quiz.
+
+    Returns:
+        dict: The payload.
+    '''
+
+    return {
+            'quizzes': [
+                {
+                    'id': quiz_id,
+                    'title': f'Quiz {quiz_id}',
+                    'description': 'A representative quiz description.',
+                    'questions': [
+                        {
+                            'id': quiz_id * questions_per_quiz + index,
+                            'text': 'What is the capital of France?',
+                            'option_a': 'Paris',
+                            'option_b': 'London',
+                            'option_c': 'Berlin',
+                            'option_d': 'Madrid',
+                            'correct_option': 'a'
+                            }
+                        for index in range(questions_per_quiz)
+                        ]
+                    }
+                for quiz_id in range(quizzes)
+                ],
+            'total': quizzes
+            }
+
+
+if __name__ == '__main__':
+    quizzes = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    questions_per_quiz = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    payload = quizzes_payload(quizzes, questions_per_quiz)
+
+    app = create_app(TestingConfig)
+    app.config['JSON_FAST_ENCODER'] = False
+    encoders = [
+            ('Flask default', DefaultJSONProvider(app).dumps),
+            ('stdlib compact', QuizJSONProvider(app).dumps_bytes)
+            ]
+    if orjson is not None:
+        app.config['JSON_FAST_ENCODER'] = True
+        encoders.append(('orjson', QuizJSONProvider(app).dumps_bytes))
+    else:
+        print('orjson is not installed, skipping it.')
+
+    for name, encode in encoders:
+        size = len(encode(payload))
+        best = min(repeat(lambda: encode(payload), number=1, repeat=10))
+        print(f'{name:>14}: {best * 1000:8.2f} ms, {size} bytes')
@@ -0,0 +1,111 @@
+'''
+tests/adaptive/test_item_bank.py
+
+This module contains tests for the item banks of the adaptive mode and the
+command that calibrates them.
+
+Classes:
+    ItemBankTestCase: Test cases for item banks and calibration.
+
+Methods:
+    test_next_item(): Tests choosing the unused question closest
+    to the ability.
+    test_estimate_ability(): Tests that the ability estimate follows
+    the answers and stays finite.
+    test_calibrate_items(): Tests precomputing difficulties from
+    the item statistics.
+'''
+
+from tests.base import BaseTestCase
+from app.extensions import db
+from app.item_bank import ItemBank, estimate_ability, item_banks
+from app.models import Question
+
+
+class ItemBankTestCase(BaseTestCase):
+    '''
+    Test cases for item banks and calibration.
+
+    Inherits:
+        BaseTestCase: Provides setup, teardown, and helper methods for testing.
+    '''
+
+    def test_next_item(self):
+        '''
+        Tests choosing the unused question closest to the ability.
+
+        - Builds a bank of five questions.
+        - Verifies the question chosen for several abilities, skipping
+        the used ones, and that None is returned when all are used.
+        '''
+
+        bank = ItemBank([
+            (id_, 'a', difficulty)
+            for id_, difficulty in enumerate((-2.0, -1.0, 0.0, 1.0, 2.0), 1)
+            ])
+        self.assertEqual(bank.next_item(0.1, set()), 2)
+        self.assertEqual(bank.next_item(0.1, {2}), 3)
+        self.assertEqual(bank.next_item(-5.0, {0}), 1)
+        self.assertEqual(bank.next_item(9.0, set()), 4)
+        self.assertIsNone(bank.next_item(0.0, set(range(5))))
+        self.assertEqual(bank.positions['3'], 2)
+
+    def test_estimate_ability(self):
+        '''
+        Tests that the ability estimate follows the answers and stays
+        finite.
+
+        - Estimates the ability after right and wrong answers.
+        - Verifies the sign of the estimates and that they are bounded.
+        '''
+
+        high = estimate_ability([0.0, 1.0, 2.0], [True, True, True])
+        low = estimate_ability([0.0, -1.0, -2.0], [False, False, False])
+        self.assertGreater(high, 0)
+        self.assertLess(low, 0)
+        self.assertLess(abs(high), 5)
+        self.assertEqual(estimate_ability([], []), 0)
+
+    def test_calibrate_items(self):
+        '''
+        Tests precomputing difficulties from the item statistics.
+
+        - Submits answer sheets where the first question is answered
+        correctly more often than the second, then runs the command.
+        - Verifies the first question is calibrated as easier, and that
+        the cached item bank of the quiz is compiled again.
+        '''
+
+        self.create_test_quiz()
+        self.create_test_questions()
+        self.create_test_users()
+        self.login_user(self.test_user)
+        q1 = f'{self.q1_id}'
+        q2 = f'{self.q2_id}'
+        self.client.post('/api/results', json={
+            'submissions': [
+                {'quiz_id': self.quiz_id, 'answers': answers}
+                for answers in (
+                    {q1: 'a', q2: 'b'},
+                    {q1: 'a', q2: 'c'},
+                    {q1: 'b', q2: 'c'}
+                    )
+                ]
+            })
+        self.assertEqual(list(item_banks.get(self.quiz_id).difficulties), [
+            0, 0
+            ])
+
+        result = self.app.test_cli_runner().invoke(
+                args=['calibrate-items', '--min-responses', '1']
+                )
+        self.assertIn('Calibrated 2 questions.', result.output)
+        db.session.expire_all()
+        easy = db.session.get(Question, self.q1_id).difficulty
+        hard = db.session.get(Question, self.q2_id).difficulty
+        self.assertLess(easy, 0)
+        self.assertGreater(hard, 0)
+        self.assertEqual(
+                list(item_banks.get(self.quiz_id).difficulties),
+                [easy, hard]
+                )
@@ -0,0 +1,81 @@
+'''
+tests/api/test_attempts_route.py
+
+This module contains tests for the API route that returns the attempts
+of the current user on a quiz.
+
+Classes:
+    AttemptsRouteTestCase: Test cases for the attempts API route.
+
+Methods:
+    test_get(): Tests reviewing the answers of each attempt.
+    test_get_after_delete(): Tests reviewing an attempt after one of its
+    questions was deleted.
+'''
+
+from tests.base import BaseTestCase
+from app.extensions import db
+
+
+class AttemptsRouteTestCase(BaseTestCase):
+    '''
+    Test cases for the attempts API route.
+
+    Inherits:
+        BaseTestCase: Provides setup, teardown, and helper methods for testing.
+    '''
+
+    def test_get(self):
+        '''
+        Tests reviewing the answers of each attempt.
+
+        - Displays and submits the quiz twice as the test user.
+        - Verifies both attempts are returned, newest first, with their
+        answers and a measured duration.
+        '''
+
+        self.create_test_quiz()
+        self.create_test_questions()
+        self.create_test_users()
+        self.login_user(self.test_user)
+        for answers in ({f'{self.q1_id}': 'B'}, {f'{self.q2_id}': 'b'}):
+            self.submit_quiz(self.quiz_id, answers)
+
+        response = self.client.get(f'/api/quiz/{self.quiz_id}/attempts')
+        self.assertEqual(response.status_code, 200)
+        data = response.get_json()['attempts']
+        self.assertEqual(
+                [attempt['answers'] for attempt in data],
+                [
+                    {f'{self.q1_id}': None, f'{self.q2_id}': 'b'},
+                    {f'{self.q1_id}': 'b', f'{self.q2_id}': None}
+                    ]
+                )
+        self.assertEqual([attempt['score'] for attempt in data], [1, 0])
+        self.assertLessEqual(data[0]['duration'], 2)
+
+    def test_get_after_delete(self):
+        '''
+        Tests reviewing an attempt after one of its questions was deleted.
+
+        - Submits the quiz, then deletes its first question.
+        - Verifies the answers are still mapped to the questions they
+        were given for.
+        '''
+
+        self.create_test_quiz()
+        self.create_test_questions()
+        self.create_test_users()
+        self.login_user(self.test_user)
+        self.submit_quiz(
+                self.quiz_id,
+                {f'{self.q1_id}': 'c', f'{self.q2_id}': 'b'}
+                )
+        db.session.delete(self.test_q1)
+        db.session.commit()
+
+        response = self.client.get(f'/api/quiz/{self.quiz_id}/attempts')
+        self.assertEqual(
+                response.get_json()['attempts'][0]['answers'],
+                {f'{self.q1_id}': 'c', f'{self.q2_id}': 'b'}
+                )
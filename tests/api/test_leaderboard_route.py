@@ -0,0 +1,229 @@
+'''
+tests/api/test_leaderboard_route.py
+
+This module contains tests for the leaderboard API routes.
+
+Classes:
+    LeaderboardRouteTestCase: Test cases for the leaderboard API routes.
+
+Methods:
+    test_quiz_leaderboard(): Tests the leaderboard of a quiz and the rank
+    of the current user.
+    test_histogram(): Tests moving users between buckets of the score
+    histogram as they resubmit.
+    test_empty_histogram(): Tests the rank of the current user when
+    the score histogram of the quiz is empty.
+    test_today(): Tests the leaderboard of the current day.
+    test_windows(): Tests merging daily buckets into the leaderboards
+    of a week and a month, and purging expired buckets.
+'''
+
+from tests.base import BaseTestCase
+from app.extensions import db
+from app.leaderboard_windows import purge_days, window_entries
+from app.models import LeaderboardDay, ScoreBucket
+from datetime import date
+from sqlalchemy import delete, select
+
+
+class LeaderboardRouteTestCase(BaseTestCase):
+    '''
+    Test cases for the leaderboard API routes.
+
+    Inherits:
+        BaseTestCase: Provides setup, teardown, and helper methods for testing.
+    '''
+
+    def setUp(self):
+        '''
+        Creates a quiz, its questions and the users.
+        '''
+
+        super().setUp()
+        self.create_test_quiz()
+        self.create_test_questions()
+        self.create_test_users()
+
+    def submit(self, user, answers):
+        '''
+        Submits an answer sheet for a user as the admin.
+
+        Args:
+            user (User): The user who answered.
+            answers (dict): The selected option of each question.
+        '''
+
+        self.login_user(self.test_admin)
+        self.client.post('/api/results', json={
+            'submissions': [{
+                'user_id': user.id,
+                'quiz_id': self.quiz_id,
+                'answers': answers
+                }]
+            })
+        self.logout_user()
+
+    def test_quiz_leaderboard(self):
+        '''
+        Tests the leaderboard of a quiz and the rank of the current user.
+
+        - Submits a perfect sheet for the admin and a half one
+        for the regular user.
+        - Verifies the ranked entries, the rank and percentile of the user,
+        and that a user without result gets null.
+        '''
+
+        self.submit(
+                self.test_admin,
+                {f'{self.q1_id}': 'a', f'{self.q2_id}': 'b'}
+                )
+        self.submit(self.test_user, {f'{self.q1_id}': 'a'})
+        self.login_user(self.test_user)
+
+        data = self.client.get(f'/api/quiz/{self.quiz_id}/leaderboard').json
+        self.assertEqual(
+                [(e['rank'], e['username']) for e in data['entries']],
+                [(1, self.test_admin.username), (2, self.test_user.username)]
+                )
+        self.assertEqual(data['entries'][0]['quiz_title'], 'Sample Quiz')
+        self.assertEqual(
+                data['you'],
+                {'percent': 50, 'rank': 2, 'total': 2, 'percentile': 25.0}
+                )
+        data = self.client.get('/api/leaderboard?limit=1').json
+        self.assertEqual(len(data['entries']), 1)
+        self.assertNotIn('you', data)
+        data = self.client.get(f'/api/quiz/{self.quiz_id + 1}/leaderboard')
+        self.assertEqual(data.json, {'entries': [], 'you': None})
+
+    def test_histogram(self):
+        '''
+        Tests moving users between buckets of the score histogram as they
+        resubmit.
+
+        - Submits twice for the regular user, with different scores.
+        - Verifies the histogram only counts the latest score, and that
+        it matches a histogram rebuilt from the entries.
+        '''
+
+        self.submit(self.test_user, {f'{self.q1_id}': 'a'})
+        self.submit(
+                self.test_user,
+                {f'{self.q1_id}': 'a', f'{self.q2_id}': 'b'}
+                )
+        self.submit(self.test_admin, {})
+
+        buckets = select(ScoreBucket.percent, ScoreBucket.count).where(
+                ScoreBucket.count != 0
+                ).order_by(ScoreBucket.percent)
+        self.assertEqual(db.session.execute(buckets).all(), [(0, 1), (100, 1)])
+        result = self.app.test_cli_runner().invoke(
+                args=['rebuild-leaderboard']
+                )
+        self.assertIn('Rebuilt 2 leaderboard entries.', result.output)
+        self.assertEqual(db.session.execute(buckets).all(), [(0, 1), (100, 1)])
+
+    def test_empty_histogram(self):
+        '''
+        Tests the rank of the current user when the score histogram
+        of the quiz is empty.
+
+        - Submits a sheet for the regular user, then deletes the buckets
+        of the histogram.
+        - Verifies the rank of the user is null instead of an error.
+        '''
+
+        self.submit(self.test_user, {f'{self.q1_id}': 'a'})
+        db.session.execute(delete(ScoreBucket))
+        db.session.commit()
+        self.login_user(self.test_user)
+
+        response = self.client.get(f'/api/quiz/{self.quiz_id}/leaderboard')
+        self.assertEqual(response.status_code, 200)
+        self.assertIsNone(response.json['you'])
+
+    def test_today(self):
+        '''
+        Tests the leaderboard of the current day.
+
+        - Submits two sheets for the regular user, the best one first.
+        - Verifies the daily leaderboard keeps the best score of the day,
+        has no rank of the current user, and that an unknown period
+        is refused.
+        '''
+
+        self.submit(
+                self.test_user,
+                {f'{self.q1_id}': 'a', f'{self.q2_id}': 'b'}
+                )
+        self.submit(self.test_user, {})
+        self.login_user(self.test_user)
+
+        url = f'/api/quiz/{self.quiz_id}/leaderboard'
+        data = self.client.get(f'{url}?window=today').json
+        self.assertEqual(
+                [(e['username'], e['percent']) for e in data['entries']],
+                [(self.test_user.username, 100)]
+                )
+        self.assertNotIn('you', data)
+        self.assertEqual(
+                self.client.get(url).json['entries'][0]['percent'],
+                0
+                )
+        response = self.client.get(f'{url}?window=year')
+        self.assertEqual(response.status_code, 400)
+
+    def test_windows(self):
+        '''
+        Tests merging daily buckets into the leaderboards of a week
+        and a month, and purging expired buckets.
+
+        - Stores daily buckets on several days before a Wednesday.
+        - Verifies the weekly and monthly leaderboards keep the best score
+        of each user in the period, and that purging deletes the buckets
+        older than the retention period only.
+        '''
+
+        rows = (
+                (date(2026, 10, 12), self.test_admin, 80),
+                (date(2026, 10, 13), self.test_admin, 60),
+                (date(2026, 10, 13), self.test_user, 70),
+                (date(2026, 10, 2), self.test_user, 90),
+                (date(2026, 9, 20), self.test_admin, 100),
+                (date(2026, 9, 1), self.test_admin, 100)
+                )
+        db.session.add_all([
+            LeaderboardDay(
+                day=day,
+                user_id=user.id,
+                quiz_id=self.quiz_id,
+                percent=percent,
+                name=user.name,
+                username=user.username,
+                quiz_title='Sample Quiz'
+                )
+            for day, user, percent in rows
+            ])
+        db.session.commit()
+        today = date(2026, 10, 14)
+
+        def board(window):
+            return [
+                    (row.user_id, row.percent)
+                    for row in window_entries(window, 10, today=today)
+                    ]
+
+        self.assertEqual(
+                board('week'),
+                [(self.test_admin.id, 80), (self.test_user.id, 70)]
+                )
+        self.assertEqual(
+                board('month'),
+                [(self.test_user.id, 90), (self.test_admin.id, 80)]
+                )
+        self.assertEqual(board('today'), [])
+        purge_days(today)
+        db.session.commit()
+        days = db.session.scalars(select(LeaderboardDay.day)).all()
+        self.assertEqual(len(days), 5)
+        self.assertNotIn(date(2026, 9, 1), days)
@@ -9,6 +9,7 @@ Classes:
 
 Methods:
     test_get(): Tests the GET request to retrieve a specific question by ID.
+    test_get_not_modified(): Tests answering a conditional GET with 304.
 '''
 
 from tests.base import BaseTestCase
@@ -36,3 +37,20 @@ class QuestionRouteTestCase(BaseTestCase):
         data = response.get_json()
         self.assertEqual(data['correct_option'], 'a')
         self.assertEqual(data['option_d'], 'Madrid')
+
+    def test_get_not_modified(self):
+        '''
+        Tests answering a conditional GET with 304.
+
+        - Fetches a question and sends its ETag back in `If-None-Match`.
+        - Asserts that the response status code is 304 (Not Modified).
+        '''
+
+        self.create_test_quiz()
+        self.create_test_questions()
+        response = self.client.get(f'/api/question/{self.q1_id}')
+        response = self.client.get(
+                f'/api/question/{self.q1_id}',
+                headers={'If-None-Match': response.headers['ETag']}
+                )
+        self.assertEqual(response.status_code, 304)
@@ -0,0 +1,61 @@
+'''
+tests/api/test_questions_route.py
+
+This module contains tests for the API route that retrieves several
+questions at once.
+
+Classes:
+    QuestionsRouteTestCase: Test cases for the questions API route.
+
+Methods:
+    test_get(): Tests retrieving questions in request order with
+    missing markers.
+    test_get_invalid(): Tests rejecting malformed or too long ID lists.
+'''
+
+from tests.base import BaseTestCase
+
+
+class QuestionsRouteTestCase(BaseTestCase):
+    '''
+    Test cases for the questions API route.
+
+    Inherits:
+        BaseTestCase: Provides setup, teardown, and helper methods for testing.
+    '''
+
+    def test_get(self):
+        '''
+        Tests retrieving questions in request order with missing markers.
+
+        - Sends a GET request for two existing IDs and an unknown one.
+        - Verifies the questions are returned in the requested order,
+        with a missing marker for the unknown ID, using a single query.
+        '''
+
+        self.create_test_quiz()
+        self.create_test_questions()
+        with self.count_queries() as statements:
+            response = self.client.get(
+                    f'/api/questions?ids={self.q2_id},99,{self.q1_id}'
+                    )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(statements), 1)
+        data = response.get_json()['questions']
+        self.assertEqual(data[0]['correct_option'], 'b')
+        self.assertEqual(data[1], {'id': 99, 'missing': True})
+        self.assertEqual(data[2]['option_a'], 'Paris')
+
+    def test_get_invalid(self):
+        '''
+        Tests rejecting malformed or too long ID lists.
+
+        - Sends GET requests with no IDs, a non-numeric ID and more IDs
+        than allowed.
+        - Asserts that each response status code is 400 (Bad Request).
+        '''
+
+        self.app.config['API_MAX_IDS'] = 2
+        for ids in ('', '1,a', '1,2,3'):
+            response = self.client.get(f'/api/questions?ids={ids}')
+            self.assertEqual(response.status_code, 400)
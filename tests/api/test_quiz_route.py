@@ -9,9 +9,16 @@ Classes:
 
 Methods:
     test_get(): Tests the retrieval of a quiz by ID from the API.
+    test_get_sparse(): Tests restricting the returned fields.
+    test_get_not_modified(): Tests answering a conditional GET with 304.
+    test_get_after_new_question(): Tests that adding a question changes
+    the ETag of the quiz.
+    test_get_after_question_edit(): Tests that editing a question changes
+    the ETag of the quiz.
 '''
 
 from tests.base import BaseTestCase
+from app.extensions import db
 
 
 class QuizRouteTestCase(BaseTestCase):
@@ -43,3 +50,108 @@ class QuizRouteTestCase(BaseTestCase):
                 data['questions'][0]['correct_option'],
                 'a'
                 )
+
+    def test_get_sparse(self):
+        '''
+        Tests restricting the returned fields.
+
+        - Sends a GET request with the `fields` parameter.
+        - Verifies that only the requested field is returned and
+        that the full representation is still served by default.
+        '''
+
+        self.create_test_quiz()
+        self.create_test_questions()
+        response = self.client.get(
+                f'/api/quiz/{self.quiz_id}?fields=description'
+                )
+        self.assertEqual(
+                response.get_json(),
+                {'description': 'This is a sample quiz.'}
+                )
+        response = self.client.get(f'/api/quiz/{self.quiz_id}')
+        self.assertEqual(len(response.get_json()['questions']), 2)
+
+    def test_get_not_modified(self):
+        '''
+        Tests answering a conditional GET with 304.
+
+        - Fetches a quiz and reads its ETag.
+        - Sends the ETag back in `If-None-Match`.
+        - Asserts that the response status code is 304 (Not Modified)
+        and that only the version lookup was executed.
+        '''
+
+        self.create_test_quiz()
+        self.create_test_questions()
+        response = self.client.get(f'/api/quiz/{self.quiz_id}')
+        etag = response.headers['ETag']
+        with self.count_queries() as statements:
+            response = self.client.get(
+                    f'/api/quiz/{self.quiz_id}',
+                    headers={'If-None-Match': etag}
+                    )
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.headers['ETag'], etag)
+        self.assertEqual(len(statements), 1)
+
+    def test_get_after_new_question(self):
+        '''
+        Tests that adding a question through the admin route changes
+        the ETag of the quiz.
+
+        - Fetches a quiz and reads its ETag.
+        - Adds a question as an admin.
+        - Verifies that the old ETag no longer matches and the new
+        question is returned.
+        '''
+
+        self.create_test_quiz()
+        self.create_test_users()
+        etag = self.client.get(f'/api/quiz/{self.quiz_id}').headers['ETag']
+        self.login_user(self.test_admin)
+        self.client.post(
+                f'/admin/quiz/{self.quiz_id}/question',
+                data={
+                    'question_text': 'What is 2 + 2?',
+                    'option_a': '3',
+                    'option_b': '4',
+                    'option_c': '5',
+                    'option_d': '6',
+                    'correct_option': 'b'
+                    }
+                )
+        response = self.client.get(
+                f'/api/quiz/{self.quiz_id}',
+                headers={'If-None-Match': etag}
+                )
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response.headers['ETag'], etag)
+        self.assertEqual(len(response.get_json()['questions']), 1)
+
+    def test_get_after_question_edit(self):
+        '''
+        Tests that editing a question through the ORM changes the ETag
+        of the quiz.
+
+        - Fetches a quiz and reads its ETag.
+        - Changes the correct option of a question and commits.
+        - Verifies that the old ETag no longer matches and the new
+        correct option is returned.
+        '''
+
+        self.create_test_quiz()
+        self.create_test_questions()
+        etag = self.client.get(f'/api/quiz/{self.quiz_id}').headers['ETag']
+        self.test_q1.correct_option = 'b'
+        db.session.commit()
+        response = self.client.get(
+                f'/api/quiz/{self.quiz_id}',
+                headers={'If-None-Match': etag}
+                )
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response.headers['ETag'], etag)
+        self.assertEqual(
+                response.get_json()['questions'][0]['correct_option'],
+                'b'
+                )
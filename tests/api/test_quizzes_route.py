@@ -13,9 +13,19 @@ Methods:
     with pagination parameters.
     test_get_without_pagination(): Tests retrieving quizzes
     without pagination parameters.
+    test_get_with_cursor(): Tests crawling quizzes with cursor pagination.
+    test_get_invalid_cursor(): Tests rejecting a tampered cursor.
+    test_get_streamed(): Tests streaming quizzes in batches.
+    test_get_not_modified(): Tests answering a conditional GET with 304.
+    test_get_sparse(): Tests restricting the returned fields and
+    leaving questions out.
+    test_get_columnar(): Tests encoding questions as parallel arrays.
+    test_query_count(): Tests that the number of queries does not grow
+    with the number of quizzes.
 '''
 
 from tests.base import BaseTestCase
+from app.routes.api.columnar import decode_quizzes
 
 
 class QuizzesRouteTestCase(BaseTestCase):
@@ -78,3 +88,168 @@ class QuizzesRouteTestCase(BaseTestCase):
                 data['quizzes'][0]['description'],
                 'This is a sample quiz.'
                 )
+
+    def test_get_with_cursor(self):
+        '''
+        Tests crawling quizzes with cursor pagination.
+
+        - Sends a GET request with a limit and follows `next_cursor`.
+        - Verifies the pages contain every quiz once, in ID order,
+        and that the last page has no next cursor.
+        '''
+
+        response = self.client.get('/api/quizzes?limit=2')
+        self.assertEqual(response.status_code, 200)
+        data = response.get_json()
+        self.assertEqual([quiz['id'] for quiz in data['quizzes']], [1, 2])
+        self.assertEqual(len(data['quizzes'][0]['questions']), 6)
+        response = self.client.get(
+                f'/api/quizzes?limit=2&cursor={data["next_cursor"]}'
+                )
+        data = response.get_json()
+        self.assertEqual([quiz['id'] for quiz in data['quizzes']], [3])
+        self.assertIsNone(data['next_cursor'])
+        response = self.client.get('/api/quizzes?limit=5&after=1')
+        data = response.get_json()
+        self.assertEqual([quiz['id'] for quiz in data['quizzes']], [2, 3])
+
+    def test_get_invalid_cursor(self):
+        '''
+        Tests rejecting a tampered cursor.
+
+        - Sends a GET request with a cursor that was not issued by the API.
+        - Asserts that the response status code is 400 (Bad Request).
+        '''
+
+        response = self.client.get('/api/quizzes?limit=2&cursor=abc')
+        self.assertEqual(response.status_code, 400)
+
+    def test_get_streamed(self):
+        '''
+        Tests streaming quizzes in batches.
+
+        - Sends a GET request with the stream parameter and a batch size
+        smaller than the number of quizzes.
+        - Verifies that the response is streamed and contains the same
+        data as the unpaginated response.
+        '''
+
+        self.app.config['API_STREAM_BATCH_SIZE'] = 2
+        response = self.client.get('/api/quizzes?stream=true')
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.is_streamed)
+        data = response.get_json()
+        self.assertEqual(data['total'], 3)
+        self.assertEqual(
+                data['quizzes'],
+                self.client.get('/api/quizzes').get_json()['quizzes']
+                )
+
+    def test_get_not_modified(self):
+        '''
+        Tests answering a conditional GET with 304.
+
+        - Fetches a page of quizzes and sends its ETag back.
+        - Asserts that the response status code is 304 (Not Modified).
+        - Verifies that the ETag depends on the query string and changes
+        when a quiz is added.
+        '''
+
+        response = self.client.get('/api/quizzes?page=1&per_page=2')
+        etag = response.headers['ETag']
+        response = self.client.get(
+                '/api/quizzes?page=1&per_page=2',
+                headers={'If-None-Match': etag}
+                )
+        self.assertEqual(response.status_code, 304)
+        response = self.client.get(
+                '/api/quizzes',
+                headers={'If-None-Match': etag}
+                )
+        self.assertEqual(response.status_code, 200)
+        self.create_test_quiz()
+        response = self.client.get(
+                '/api/quizzes?page=1&per_page=2',
+                headers={'If-None-Match': etag}
+                )
+        self.assertEqual(response.status_code, 200)
+
+    def test_get_sparse(self):
+        '''
+        Tests restricting the returned fields and leaving questions out.
+
+        - Sends GET requests with `fields` and `include` parameters.
+        - Verifies that only the requested fields are returned, that
+        the questions are not queried unless included, and that unknown
+        fields are rejected.
+        '''
+
+        with self.count_queries() as statements:
+            response = self.client.get('/api/quizzes?fields=id,title')
+        data = response.get_json()
+        self.assertEqual(data['quizzes'][0], {'id': 1, 'title': 'Sample Quiz'})
+        self.assertFalse(
+                any('FROM question' in statement for statement in statements)
+                )
+        self.assertFalse(
+                any('description' in statement for statement in statements)
+                )
+        response = self.client.get(
+                '/api/quizzes?page=1&per_page=1&fields=title'
+                '&include=questions'
+                )
+        quiz = response.get_json()['quizzes'][0]
+        self.assertEqual(sorted(quiz), ['questions', 'title'])
+        self.assertEqual(len(quiz['questions']), 6)
+        response = self.client.get('/api/quizzes?limit=1&include=')
+        self.assertNotIn('questions', response.get_json()['quizzes'][0])
+        response = self.client.get('/api/quizzes?fields=password')
+        self.assertEqual(response.status_code, 400)
+
+    def test_get_columnar(self):
+        '''
+        Tests encoding questions as parallel arrays.
+
+        - Sends GET requests with `format=columnar` in several modes.
+        - Verifies that the questions are encoded as one array per field,
+        that the response is smaller, and that decoding it gives back
+        the default format.
+        '''
+
+        rows = self.client.get('/api/quizzes')
+        columnar = self.client.get('/api/quizzes?format=columnar')
+        self.assertEqual(columnar.status_code, 200)
+        questions = columnar.get_json()['quizzes'][0]['questions']
+        self.assertEqual(questions['correct_option'], ['a', 'b'] * 3)
+        self.assertLess(len(columnar.data), len(rows.data))
+        self.assertEqual(
+                decode_quizzes(columnar.get_json())['quizzes'],
+                rows.get_json()['quizzes']
+                )
+        response = self.client.get('/api/quizzes?limit=1&format=columnar')
+        self.assertEqual(
+                len(response.get_json()['quizzes'][0]['questions']['id']),
+                6
+                )
+        response = self.client.get('/api/quizzes?format=xml')
+        self.assertEqual(response.status_code, 400)
+
+    def test_query_count(self):
+        '''
+        Tests that the number of queries does not grow with
+        the number of quizzes.
+
+        - Counts the queries of a request for three quizzes.
+        - Adds more quizzes and questions and counts again.
+        - Verifies that both requests ran the same number of queries.
+        '''
+
+        with self.count_queries() as before:
+            self.client.get('/api/quizzes')
+        for _ in range(3):
+            self.create_test_quiz()
+            self.create_test_questions()
+        with self.count_queries() as after:
+            response = self.client.get('/api/quizzes')
+        self.assertEqual(response.get_json()['total'], 6)
+        self.assertEqual(len(before), len(after))
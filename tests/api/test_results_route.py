@@ -0,0 +1,142 @@
+'''
+tests/api/test_results_route.py
+
+This module contains tests for the API route that grades a batch
+of answer sheets.
+
+Classes:
+    ResultsRouteTestCase: Test cases for the results API route.
+
+Methods:
+    test_submit(): Tests grading a batch and storing one result per user
+    and quiz.
+    test_submit_other_user(): Tests that only admins can submit for other
+    users.
+    test_submit_invalid(): Tests rejecting malformed batches and unknown
+    quizzes.
+    test_submit_unauthorized(): Tests that the route requires a login.
+'''
+
+from tests.base import BaseTestCase
+from app.models import QuizResult
+
+
+class ResultsRouteTestCase(BaseTestCase):
+    '''
+    Test cases for the results API route.
+
+    Inherits:
+        BaseTestCase: Provides setup, teardown, and helper methods for testing.
+    '''
+
+    def setUp(self):
+        '''
+        Sets up the test environment by creating a quiz, questions
+        and test users, then logging in the test admin.
+        '''
+
+        super().setUp()
+        self.create_test_quiz()
+        self.create_test_questions()
+        self.create_test_users()
+        self.login_user(self.test_admin)
+
+    def test_submit(self):
+        '''
+        Tests grading a batch and storing one result per user and quiz.
+
+        - Submits three sheets, two of them for the same user.
+        - Verifies the results are returned in order and that the last
+        sheet of a user is the one stored.
+        '''
+
+        response = self.client.post('/api/results', json={
+            'submissions': [
+                {
+                    'quiz_id': self.quiz_id,
+                    'user_id': self.test_user.id,
+                    'answers': {f'{self.q1_id}': 'a'}
+                    },
+                {
+                    'quiz_id': self.quiz_id,
+                    'answers': {f'{self.q1_id}': 'A', f'{self.q2_id}': 'b'}
+                    },
+                {
+                    'quiz_id': self.quiz_id,
+                    'user_id': self.test_user.id,
+                    'answers': {f'{self.q2_id}': 'c'}
+                    }
+                ]
+            })
+        self.assertEqual(response.status_code, 200)
+        data = response.get_json()['results']
+        self.assertEqual(
+                [(result['score'], result['percent']) for result in data],
+                [(1, 50), (2, 100), (0, 0)]
+                )
+        self.assertEqual(data[1]['user_id'], self.test_admin.id)
+        stored = {
+                result.user_id: result.score
+                for result in QuizResult.query.all()
+                }
+        self.assertEqual(
+                stored,
+                {self.test_user.id: 0, self.test_admin.id: 2}
+                )
+
+    def test_submit_other_user(self):
+        '''
+        Tests that only admins can submit for other users.
+
+        - Logs in the regular test user and submits a sheet for the admin.
+        - Asserts that the response status code is 403 (Forbidden)
+        and that nothing is stored.
+        '''
+
+        self.logout_user()
+        self.login_user(self.test_user)
+        response = self.client.post('/api/results', json={
+            'submissions': [
+                {'quiz_id': self.quiz_id, 'user_id': self.test_admin.id}
+                ]
+            })
+        self.assertEqual(response.status_code, 403)
+        self.assertEqual(QuizResult.query.count(), 0)
+
+    def test_submit_invalid(self):
+        '''
+        Tests rejecting malformed batches and unknown quizzes.
+
+        - Sends an empty batch, a sheet without a quiz ID, a sheet with
+        invalid answers and a batch referring to an unknown quiz.
+        - Asserts that each response status code is 400 (Bad Request)
+        and that nothing is stored.
+        '''
+
+        bodies = [
+                {'submissions': []},
+                {'submissions': [{'answers': {}}]},
+                {'submissions': [{'quiz_id': self.quiz_id, 'answers': [1]}]},
+                {'submissions': [
+                    {'quiz_id': self.quiz_id},
+                    {'quiz_id': 99}
+                    ]}
+                ]
+        for body in bodies:
+            response = self.client.post('/api/results', json=body)
+            self.assertEqual(response.status_code, 400)
+        self.assertEqual(QuizResult.query.count(), 0)
+
+    def test_submit_unauthorized(self):
+        '''
+        Tests that the route requires a login.
+
+        - Logs out and submits a sheet.
+        - Verifies that nothing is stored.
+        '''
+
+        self.logout_user()
+        self.client.post('/api/results', json={
+            'submissions': [{'quiz_id': self.quiz_id}]
+            })
+        self.assertEqual(QuizResult.query.count(), 0)
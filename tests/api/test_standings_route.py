@@ -0,0 +1,132 @@
+'''
+tests/api/test_standings_route.py
+
+This module contains tests for the standings API route.
+
+Classes:
+    StandingsRouteTestCase: Test cases for the standings API route.
+
+Methods:
+    test_standings(): Tests ranking users by their rollups over
+    all quizzes.
+    test_rebuild(): Tests that rebuilding the standings gives the
+    incrementally maintained ones.
+'''
+
+from tests.base import BaseTestCase
+from app.extensions import db
+from app.models import Question, Quiz, UserStanding
+from sqlalchemy import select
+
+
+class StandingsRouteTestCase(BaseTestCase):
+    '''
+    Test cases for the standings API route.
+
+    Inherits:
+        BaseTestCase: Provides setup, teardown, and helper methods for testing.
+    '''
+
+    def setUp(self):
+        '''
+        Creates two quizzes, their questions and the users, then submits
+        answer sheets as the admin.
+
+        - The regular user scores 1/2 then 2/2 on the first quiz,
+        and 0/1 on the second one.
+        - The admin scores 1/2 on the first quiz.
+        '''
+
+        super().setUp()
+        self.create_test_quiz()
+        self.create_test_questions()
+        self.create_test_users()
+        quiz = Quiz(title='Second Quiz', description='Another quiz.')
+        db.session.add(quiz)
+        db.session.commit()
+        question = Question(
+                quiz_id=quiz.id,
+                text='What is 1 + 1?',
+                option_a='1',
+                option_b='2',
+                option_c='3',
+                option_d='4',
+                correct_option='b'
+                )
+        db.session.add(question)
+        db.session.commit()
+        q1 = f'{self.q1_id}'
+        q2 = f'{self.q2_id}'
+        self.login_user(self.test_admin)
+        for user, quiz_id, answers in (
+                (self.test_user, self.quiz_id, {q1: 'a'}),
+                (self.test_user, self.quiz_id, {q1: 'a', q2: 'b'}),
+                (self.test_user, quiz.id, {f'{question.id}': 'a'}),
+                (self.test_admin, self.quiz_id, {q2: 'b'})
+                ):
+            self.client.post('/api/results', json={
+                'submissions': [{
+                    'user_id': user.id,
+                    'quiz_id': quiz_id,
+                    'answers': answers
+                    }]
+                })
+
+    def test_standings(self):
+        '''
+        Tests ranking users by their rollups over all quizzes.
+
+        - Requests the standings by total score and by mean percent.
+        - Verifies one entry per user with their latest scores added up,
+        and that an unknown ranking is refused.
+        '''
+
+        data = self.client.get('/api/standings').json
+        self.assertEqual(data['standings'], [
+            {
+                'rank': 1,
+                'user_id': self.test_user.id,
+                'name': self.test_user.name,
+                'username': self.test_user.username,
+                'total_score': 2,
+                'quizzes_completed': 2,
+                'mean_percent': 50.0
+                },
+            {
+                'rank': 2,
+                'user_id': self.test_admin.id,
+                'name': self.test_admin.name,
+                'username': self.test_admin.username,
+                'total_score': 1,
+                'quizzes_completed': 1,
+                'mean_percent': 50.0
+                }
+            ])
+        data = self.client.get('/api/standings?sort=mean').json
+        self.assertEqual(
+                [standing['rank'] for standing in data['standings']],
+                [1, 1]
+                )
+        response = self.client.get('/api/standings?sort=best')
+        self.assertEqual(response.status_code, 400)
+
+    def test_rebuild(self):
+        '''
+        Tests that rebuilding the standings gives the incrementally
+        maintained ones.
+
+        - Reads the standings, runs the rebuild command and reads
+        them again.
+        - Verifies both are the same.
+        '''
+
+        query = select(
+                UserStanding.user_id,
+                UserStanding.total_score,
+                UserStanding.quizzes_completed,
+                UserStanding.percent_sum,
+                UserStanding.mean_percent
+                ).order_by(UserStanding.user_id)
+        before = db.session.execute(query).all()
+        self.app.test_cli_runner().invoke(args=['rebuild-leaderboard'])
+        self.assertEqual(db.session.execute(query).all(), before)
@@ -0,0 +1,90 @@
+'''
+tests/api/test_stats_route.py
+
+This module contains tests for the admin API route that returns the item
+statistics of a quiz.
+
+Classes:
+    StatsRouteTestCase: Test cases for the stats API route.
+
+Methods:
+    test_get(): Tests the option shares, difficulty and discrimination
+    computed from the counters.
+    test_get_forbidden(): Tests that only admins can read statistics.
+'''
+
+from tests.base import BaseTestCase
+
+
+class StatsRouteTestCase(BaseTestCase):
+    '''
+    Test cases for the stats API route.
+
+    Inherits:
+        BaseTestCase: Provides setup, teardown, and helper methods for testing.
+    '''
+
+    def setUp(self):
+        '''
+        Sets up the test environment by creating a quiz, questions
+        and test users, then logging in the test admin.
+        '''
+
+        super().setUp()
+        self.create_test_quiz()
+        self.create_test_questions()
+        self.create_test_users()
+        self.login_user(self.test_admin)
+
+    def test_get(self):
+        '''
+        Tests the option shares, difficulty and discrimination computed
+        from the counters.
+
+        - Submits four answer sheets, one of them in a separate batch.
+        - Verifies the statistics of both questions.
+        '''
+
+        q1 = f'{self.q1_id}'
+        q2 = f'{self.q2_id}'
+        sheets = [
+                {q1: 'a', q2: 'b'},
+                {q1: 'A', q2: 'c'},
+                {q1: 'b'},
+                {}
+                ]
+        for batch in (sheets[:3], sheets[3:]):
+            self.client.post('/api/results', json={
+                'submissions': [
+                    {'quiz_id': self.quiz_id, 'answers': answers}
+                    for answers in batch
+                    ]
+                })
+
+        response = self.client.get(f'/api/quiz/{self.quiz_id}/stats')
+        self.assertEqual(response.status_code, 200)
+        first, second = response.get_json()['questions']
+        self.assertEqual(first['responses'], 4)
+        self.assertEqual(first['difficulty'], 0.5)
+        self.assertEqual(
+                first['options'],
+                {'a': 0.5, 'b': 0.25, 'c': 0, 'd': 0}
+                )
+        self.assertEqual(first['unanswered'], 0.25)
+        self.assertEqual(first['discrimination'], 0.5774)
+        self.assertEqual(second['difficulty'], 0.25)
+        self.assertEqual(second['unanswered'], 0.5)
+        self.assertEqual(second['discrimination'], 0.5774)
+
+    def test_get_forbidden(self):
+        '''
+        Tests that only admins can read statistics.
+
+        - Logs in the regular test user and requests the statistics.
+        - Asserts that the response status code is 403 (Forbidden).
+        '''
+
+        self.logout_user()
+        self.login_user(self.test_user)
+        response = self.client.get(f'/api/quiz/{self.quiz_id}/stats')
+        self.assertEqual(response.status_code, 403)
@@ -22,9 +22,16 @@ Methods:
     in the database.
     login_user(user): Logs in a user to the test client.
     logout_user(): Logs out the currently logged-in user from the test client.
+    start_quiz(quiz_id): Displays a quiz and returns its attempt token.
+    submit_quiz(quiz_id, answers): Takes a quiz with the given answers.
+    count_queries(): Counts the SQL statements executed inside
+    a `with` block.
 '''
 
+import re
 import unittest
+from contextlib import contextmanager
+from sqlalchemy import event
 from app.extensions import db
 from app import create_app
 from app.config import TestingConfig
@@ -180,3 +187,67 @@ class BaseTestCase(unittest.TestCase):
         '''
 
         self.client.get('auth/logout')
+
+    def start_quiz(self, quiz_id):
+        '''
+        Displays a quiz and returns the attempt token of the page.
+
+        Args:
+            quiz_id (int): The ID of the quiz.
+
+        Returns:
+            str: The signed attempt token to submit with the answers.
+        '''
+
+        page = self.client.get(f'/quizzes/{quiz_id}').data.decode('utf-8')
+        return re.search(
+                r"name='attempt_token' value='([^']+)'",
+                page
+                ).group(1)
+
+    def submit_quiz(self, quiz_id, answers, token=None, **kwargs):
+        '''
+        Takes a quiz with the given answers.
+
+        Args:
+            quiz_id (int): The ID of the quiz.
+            answers (dict): The selected options, keyed by question ID.
+            token (str, optional): The attempt token (a new attempt
+            is started when omitted).
+            **kwargs: Other arguments of the test client's `post`.
+
+        Returns:
+            Response: The response to the submission.
+        '''
+
+        if token is None:
+            token = self.start_quiz(quiz_id)
+        return self.client.post(
+                f'/quizzes/{quiz_id}',
+                data=dict(answers, attempt_token=token),
+                **kwargs
+                )
+
+    @contextmanager
+    def count_queries(self):
+        '''
+        Counts the SQL statements executed inside a `with` block.
+
+        Yields:
+            list: A list that receives one entry per executed statement.
+        '''
+
+        statements = []
+
+        def before_cursor_execute(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        event.listen(db.engine, 'before_cursor_execute', before_cursor_execute)
+        try:
+            yield statements
+        finally:
+            event.remove(
+                    db.engine,
+                    'before_cursor_execute',
+                    before_cursor_execute
+                    )
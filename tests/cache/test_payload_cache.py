@@ -0,0 +1,163 @@
+'''
+tests/cache/test_payload_cache.py
+
+This module contains tests for the in-process cache of encoded
+quiz payloads.
+
+Classes:
+    PayloadCacheTestCase: Test cases for the payload cache.
+
+Methods:
+    test_eviction(): Tests evicting the least recently used payloads
+    once the byte budget is exceeded.
+    test_stale_set(): Tests that payloads built before an invalidation
+    are not cached.
+    test_api_hit(): Tests serving a quiz from the cache.
+    test_invalidation_on_commit(): Tests invalidating a quiz when one
+    of its questions changes.
+    test_other_process_change(): Tests serving a quiz changed by another
+    process with its new version.
+'''
+
+from tests.base import BaseTestCase
+from app.extensions import db, payload_cache
+from app.events import bump_versions
+from app.models import Question
+from sqlalchemy import update
+
+
+class PayloadCacheTestCase(BaseTestCase):
+    '''
+    Test cases for the payload cache.
+
+    Inherits:
+        BaseTestCase: Provides setup, teardown, and helper methods for testing.
+    '''
+
+    def test_eviction(self):
+        '''
+        Tests evicting the least recently used payloads once
+        the byte budget is exceeded.
+
+        - Fills the cache with three 4-byte payloads and a 10-byte budget.
+        - Verifies that the least recently used payload was evicted
+        and that the counters are updated.
+        '''
+
+        payload_cache.max_bytes = 10
+        generation = payload_cache.generation
+        payload_cache.set(1, 1, b'aaaa', generation)
+        payload_cache.set(2, 1, b'bbbb', generation)
+        self.assertEqual(payload_cache.get(1, 1), b'aaaa')
+        payload_cache.set(3, 1, b'cccc', generation)
+        self.assertIsNone(payload_cache.get(2, 1))
+        self.assertEqual(payload_cache.get(3, 1), b'cccc')
+        self.assertEqual(
+                payload_cache.stats(),
+                {
+                    'entries': 2,
+                    'size': 8,
+                    'max_bytes': 10,
+                    'hits': 2,
+                    'misses': 1,
+                    'evictions': 1
+                    }
+                )
+
+    def test_stale_set(self):
+        '''
+        Tests that payloads built before an invalidation are not cached.
+        '''
+
+        generation = payload_cache.generation
+        payload_cache.invalidate([1])
+        payload_cache.set(1, 1, b'stale', generation)
+        self.assertIsNone(payload_cache.get(1, 1))
+
+    def test_api_hit(self):
+        '''
+        Tests serving a quiz from the cache.
+
+        - Requests the same quiz twice.
+        - Verifies that the second request is a cache hit that runs
+        no query besides the version lookup.
+        '''
+
+        self.create_test_quiz()
+        self.create_test_questions()
+        first = self.client.get(f'/api/quiz/{self.quiz_id}')
+        with self.count_queries() as statements:
+            second = self.client.get(f'/api/quiz/{self.quiz_id}')
+        self.assertEqual(first.data, second.data)
+        self.assertEqual(len(statements), 1)
+        self.assertEqual(payload_cache.hits, 1)
+
+    def test_invalidation_on_commit(self):
+        '''
+        Tests invalidating a quiz when one of its questions changes.
+
+        - Caches a quiz through the API.
+        - Changes a question and commits.
+        - Verifies that the quiz was dropped from the cache and the API
+        returns the new data.
+        '''
+
+        self.create_test_quiz()
+        self.create_test_questions()
+        self.client.get('/api/quizzes')
+        self.assertEqual(payload_cache.stats()['entries'], 1)
+        self.test_q1.text = 'What is the capital of Italy?'
+        db.session.commit()
+        self.assertEqual(payload_cache.stats()['entries'], 0)
+        data = self.client.get(f'/api/quiz/{self.quiz_id}').get_json()
+        self.assertEqual(
+                data['questions'][0]['text'],
+                'What is the capital of Italy?'
+                )
+
+    def test_other_process_change(self):
+        '''
+        Tests serving a quiz changed by another process with its
+        new version.
+
+        - Caches a quiz through the API.
+        - Changes a question with a Core statement and bumps the version
+        of the quiz, without the commit events of this process, as
+        a CLI command or another worker would.
+        - Verifies that the quiz and the list of quizzes return the new
+        data under a new ETag.
+        '''
+
+        self.create_test_quiz()
+        self.create_test_questions()
+        first = self.client.get(f'/api/quiz/{self.quiz_id}')
+        listed = self.client.get('/api/quizzes')
+        table = Question.__table__
+        db.session.execute(
+                update(table).where(table.c.id == self.q1_id).values(
+                    text='What is the capital of Italy?'
+                    )
+                )
+        bump_versions(db.session, [self.quiz_id])
+        db.session.commit()
+        self.assertEqual(payload_cache.stats()['entries'], 1)
+
+        second = self.client.get(
+                f'/api/quiz/{self.quiz_id}',
+                headers={'If-None-Match': first.headers['ETag']}
+                )
+        self.assertEqual(second.status_code, 200)
+        self.assertNotEqual(second.headers['ETag'], first.headers['ETag'])
+        self.assertEqual(
+                second.get_json()['questions'][0]['text'],
+                'What is the capital of Italy?'
+                )
+        data = self.client.get('/api/quizzes').get_json()
+        self.assertEqual(
+                data['quizzes'][0]['questions'][0]['text'],
+                'What is the capital of Italy?'
+                )
+        self.assertNotEqual(
+                self.client.get('/api/quizzes').headers['ETag'],
+                listed.headers['ETag']
+                )
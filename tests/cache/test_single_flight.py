@@ -0,0 +1,214 @@
+'''
+tests/cache/test_single_flight.py
+
+This module contains tests for the single-flight layer that coalesces
+concurrent reads.
+
+Classes:
+    SingleFlightTestCase: Test cases for the single-flight layer.
+
+Methods:
+    test_coalesce(): Tests computing a value once for concurrent callers.
+    test_timeout(): Tests computing the value again after waiting
+    too long.
+    test_error(): Tests raising the error of a failed computation
+    to the waiting callers.
+    test_routes(): Tests that the coalesced routes still serve
+    their data.
+    test_leaderboard_after_save(): Tests that a leaderboard read after
+    results were saved does not wait for an older read.
+'''
+
+from tests.base import BaseTestCase
+from app import leaderboard
+from app.single_flight import SingleFlight
+from threading import Event, Thread
+from time import sleep
+from unittest.mock import patch
+
+
+class SingleFlightTestCase(BaseTestCase):
+    '''
+    Test cases for the single-flight layer.
+
+    Inherits:
+        BaseTestCase: Provides setup, teardown, and helper methods for testing.
+    '''
+
+    def start_flight(self, flight, function, count):
+        '''
+        Calls a function from several threads with the same key, and
+        waits until all of them but the first one are waiting.
+
+        Args:
+            flight (SingleFlight): The layer under test.
+            function (callable): The function to call.
+            count (int): The number of threads.
+
+        Returns:
+            tuple: The threads, and the list their results are added to.
+        '''
+
+        results = []
+
+        def call():
+            try:
+                results.append(flight.do('key', function))
+            except ValueError as error:
+                results.append(error)
+
+        threads = [Thread(target=call) for _ in range(count)]
+        for thread in threads:
+            thread.start()
+        while flight._flights.get('key') is None or (
+                flight._flights['key'].waiters < count - 1):
+            sleep(0.001)
+        return threads, results
+
+    def test_coalesce(self):
+        '''
+        Tests computing a value once for concurrent callers.
+
+        - Calls a blocking function from five threads, then releases it.
+        - Verifies it ran once, every caller got its value, and the
+        counters.
+        '''
+
+        flight = SingleFlight()
+        flight.timeout = 5
+        release = Event()
+        runs = []
+
+        def compute():
+            runs.append(1)
+            release.wait()
+            return 42
+
+        threads, results = self.start_flight(flight, compute, 5)
+        release.set()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(runs, [1])
+        self.assertEqual(results, [42] * 5)
+        stats = flight.stats()
+        self.assertEqual(stats['calls'], 5)
+        self.assertEqual(stats['executions'], 1)
+        self.assertEqual(stats['coalesced'], 4)
+        self.assertEqual(stats['max_waiters'], 4)
+        self.assertEqual(stats['in_flight'], 0)
+        self.assertEqual(flight.do('key', lambda: 7), 7)
+
+    def test_timeout(self):
+        '''
+        Tests computing the value again after waiting too long.
+
+        - Calls a blocking function from two threads with a short timeout.
+        - Verifies the waiting caller computed the value itself.
+        '''
+
+        flight = SingleFlight()
+        flight.timeout = 0.01
+        release = Event()
+        runs = []
+
+        def compute():
+            runs.append(1)
+            if len(runs) == 1:
+                release.wait()
+            return len(runs)
+
+        threads, results = self.start_flight(flight, compute, 2)
+        while len(results) < 1:
+            sleep(0.001)
+        release.set()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(results, [2, 2])
+        self.assertEqual(flight.stats()['timeouts'], 1)
+        self.assertEqual(flight.stats()['coalesced'], 0)
+
+    def test_error(self):
+        '''
+        Tests raising the error of a failed computation to the waiting
+        callers.
+
+        - Calls a blocking function that fails from three threads.
+        - Verifies every caller got the error and it was counted once.
+        '''
+
+        flight = SingleFlight()
+        flight.timeout = 5
+        release = Event()
+
+        def compute():
+            release.wait()
+            raise ValueError('failed')
+
+        threads, results = self.start_flight(flight, compute, 3)
+        release.set()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(results), 3)
+        self.assertTrue(all(isinstance(r, ValueError) for r in results))
+        self.assertEqual(flight.stats()['errors'], 1)
+
+    def test_routes(self):
+        '''
+        Tests that the coalesced routes still serve their data.
+
+        - Requests the quizzes page, the quiz list API and the leaderboard.
+        - Verifies the quiz is listed and the calls were counted.
+        '''
+
+        self.create_test_quiz()
+        self.create_test_users()
+        self.login_user(self.test_user)
+        response = self.client.get('/quizzes')
+        self.assertIn('Sample Quiz', response.data.decode('utf-8'))
+        response = self.client.get('/api/quizzes?page=1&per_page=5')
+        self.assertEqual(response.json['total'], 1)
+        response = self.client.get('/dashboard/leaderboard')
+        self.assertEqual(response.status_code, 200)
+        flight = self.app.extensions['single_flight']
+        self.assertEqual(flight.stats()['executions'], 3)
+
+    def test_leaderboard_after_save(self):
+        '''
+        Tests that a leaderboard read after results were saved does not
+        wait for an older read.
+
+        - Starts a blocked read of the leaderboard, then submits the quiz.
+        - Verifies the next read of the leaderboard starts its own read
+        and returns the new result, before the blocked one completes.
+        '''
+
+        self.create_test_quiz()
+        self.create_test_questions()
+        self.create_test_users()
+        self.login_user(self.test_user)
+        flight = self.app.extensions['single_flight']
+        release = Event()
+        read = leaderboard._ranked_leaderboard
+        calls = []
+
+        def ranked(*args):
+            calls.append(args)
+            if len(calls) == 1:
+                release.wait()
+                return []
+            return read(*args)
+
+        with patch.object(leaderboard, '_ranked_leaderboard', ranked):
+            thread = Thread(target=leaderboard.ranked_leaderboard)
+            thread.start()
+            while not calls:
+                sleep(0.001)
+            self.submit_quiz(self.quiz_id, {f'{self.q1_id}': 'A'})
+            try:
+                entries = leaderboard.ranked_leaderboard()
+            finally:
+                release.set()
+                thread.join()
+        self.assertEqual(len(entries), 1)
+        stats = flight.stats()
+        self.assertEqual((stats['coalesced'], stats['timeouts']), (0, 0))
@@ -12,6 +12,10 @@ Methods:
     when the user is not logged in.
     test_get_authorized(): Tests the GET request for the leaderboard route
     when the user is logged in.
+    test_read_model(): Tests reading the leaderboard from its entries
+    with one query.
+    test_rank_all_time(): Tests showing the rank of the current user
+    on the all-time leaderboard of a quiz only.
 '''
 
 from tests.base import BaseTestCase
@@ -67,3 +71,81 @@ class LeaderboardRouteTestCase(BaseTestCase):
                 '<h1 class=\'text-center my-5\'>Leaderboard</h1>',
                 response_data
                 )
+
+    def test_read_model(self):
+        '''
+        Tests reading the leaderboard from its entries with one query.
+
+        - Submits results for both users, then renames the regular user.
+        - Verifies the leaderboard lists the new name and the quiz title,
+        best first, without querying the results or loading each quiz.
+        '''
+
+        self.create_test_quiz()
+        self.create_test_questions()
+        self.create_test_users()
+        self.login_user(self.test_admin)
+        self.client.post('/api/results', json={
+            'submissions': [
+                {
+                    'user_id': self.test_user.id,
+                    'quiz_id': self.quiz_id,
+                    'answers': {f'{self.q1_id}': 'a', f'{self.q2_id}': 'b'}
+                    },
+                {
+                    'user_id': self.test_admin.id,
+                    'quiz_id': self.quiz_id,
+                    'answers': {f'{self.q1_id}': 'a'}
+                    }
+                ]
+            })
+        self.logout_user()
+        self.login_user(self.test_user)
+        self.client.post('/profile/edit', data={
+            'first_name': 'Alicia',
+            'username': self.test_user.username,
+            'email': self.test_user.email
+            })
+
+        with self.count_queries() as statements:
+            response = self.client.get('/dashboard/leaderboard')
+        response_data = response.data.decode('utf-8')
+        self.assertIn('Alicia', response_data)
+        self.assertIn('Quiz: Sample Quiz', response_data)
+        self.assertLess(
+                response_data.index('100%'),
+                response_data.index('50%')
+                )
+        reads = [
+                statement
+                for statement in statements
+                if 'leaderboard_entry' in statement
+                ]
+        self.assertEqual(len(reads), 1)
+        self.assertFalse(any(
+            'quiz_result' in statement or 'FROM quiz \nWHERE' in statement
+            for statement in statements
+            ))
+
+    def test_rank_all_time(self):
+        '''
+        Tests showing the rank of the current user on the all-time
+        leaderboard of a quiz only.
+
+        - Submits the quiz as the test user.
+        - Verifies the rank is shown on the all-time leaderboard of
+        the quiz, and not on its leaderboard of the day.
+        '''
+
+        self.create_test_quiz()
+        self.create_test_questions()
+        self.create_test_users()
+        self.login_user(self.test_user)
+        self.submit_quiz(self.quiz_id, {f'{self.q1_id}': 'A'})
+
+        url = f'/dashboard/leaderboard?quiz_id={self.quiz_id}'
+        self.assertIn('Your rank: <b>#1</b>', self.client.get(url).text)
+        response = self.client.get(f'{url}&window=today')
+        self.assertIn('Sample Quiz', response.text)
+        self.assertNotIn('Your rank', response.text)
+        self.assertNotIn('You have not taken this quiz yet.', response.text)
@@ -0,0 +1,49 @@
+'''
+tests/dashboard/test_standings_route.py
+
+This module contains tests for the standings dashboard route
+of the application.
+
+Classes:
+    StandingsRouteTestCase: Test case for the standings route.
+
+Methods:
+    test_get_authorized(): Tests the GET request for the standings route
+    when the user is logged in.
+'''
+
+from tests.base import BaseTestCase
+
+
+class StandingsRouteTestCase(BaseTestCase):
+    '''
+    Test case for the standings route.
+
+    Inherits:
+        BaseTestCase: Provides setup, teardown, and helper methods for testing.
+    '''
+
+    def test_get_authorized(self):
+        '''
+        Tests the GET request for the standings route when the user
+        is logged in.
+
+        - Submits the quiz and sends a GET request to the standings route.
+        - Asserts that the response status code is 200 (OK).
+        - Verifies that the response lists the user with their total score
+        and mean percent.
+        '''
+
+        self.create_test_quiz()
+        self.create_test_questions()
+        self.create_test_users()
+        self.login_user(self.test_user)
+        self.submit_quiz(self.quiz_id, {f'{self.q1_id}': 'a'})
+        response = self.client.get('/dashboard/standings?sort=mean')
+        self.assertEqual(response.status_code, 200)
+        response_data = response.data.decode('utf-8')
+        self.assertIn(
+                f'{self.test_user.name} ({self.test_user.username})',
+                response_data
+                )
+        self.assertIn('50.00%', response_data)
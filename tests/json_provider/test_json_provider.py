@@ -0,0 +1,85 @@
+'''
+tests/json_provider/test_json_provider.py
+
+This module contains tests for the JSON provider registered by `create_app`.
+
+Classes:
+    JSONProviderTestCase: Test cases for the JSON provider.
+
+Methods:
+    test_registered(): Tests that the provider is used by `jsonify`.
+    test_pre_encoded(): Tests sending a pre-encoded payload as it is.
+    test_stdlib_fallback(): Tests encoding with the standard library
+    when the fast encoder is disabled.
+    test_not_compact(): Tests indenting the output when compact output
+    is disabled.
+'''
+
+from tests.base import BaseTestCase
+from app.json_provider import QuizJSONProvider, PreEncoded
+from flask import jsonify
+from datetime import datetime
+
+
+class JSONProviderTestCase(BaseTestCase):
+    '''
+    Test cases for the JSON provider.
+
+    Inherits:
+        BaseTestCase: Provides setup, teardown, and helper methods for testing.
+    '''
+
+    def test_registered(self):
+        '''
+        Tests that the provider is used by `jsonify`.
+
+        - Verifies that the app's JSON provider is a `QuizJSONProvider`.
+        - Verifies that `jsonify` output is compact, with sorted keys
+        and dates in the HTTP date format.
+        '''
+
+        self.assertIsInstance(self.app.json, QuizJSONProvider)
+        with self.app.test_request_context():
+            response = jsonify(b=1, a=datetime(2025, 1, 1))
+        self.assertEqual(
+                response.data,
+                b'{"a":"Wed, 01 Jan 2025 00:00:00 GMT","b":1}\n'
+                )
+
+    def test_pre_encoded(self):
+        '''
+        Tests sending a pre-encoded payload as it is.
+        '''
+
+        with self.app.test_request_context():
+            response = self.app.json.response(PreEncoded(b'{"x": [1, 2]}'))
+        self.assertEqual(response.data, b'{"x": [1, 2]}\n')
+        self.assertEqual(response.mimetype, 'application/json')
+
+    def test_stdlib_fallback(self):
+        '''
+        Tests encoding with the standard library when the fast encoder
+        is disabled.
+        '''
+
+        self.app.config['JSON_FAST_ENCODER'] = False
+        provider = QuizJSONProvider(self.app)
+        self.assertFalse(provider.fast)
+        self.assertEqual(
+                provider.dumps_bytes({'b': 1, 'a': 'é'}),
+                b'{"a":"\\u00e9","b":1}'
+                )
+
+    def test_not_compact(self):
+        '''
+        Tests indenting the output when compact output is disabled.
+        '''
+
+        self.app.config['JSON_COMPACT'] = False
+        provider = QuizJSONProvider(self.app)
+        self.assertEqual(provider.item_separator, b', ')
+        self.assertEqual(
+                provider.loads(provider.dumps({'a': [1]})),
+                {'a': [1]}
+                )
+        self.assertIn(b'\n  "a"', provider.dumps_bytes({'a': [1]}))
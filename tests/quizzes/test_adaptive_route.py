@@ -0,0 +1,119 @@
+'''
+tests/quizzes/test_adaptive_route.py
+
+This module contains tests for the adaptive quiz route.
+
+Classes:
+    AdaptiveRouteTestCase: Test cases for the adaptive quiz route.
+
+Methods:
+    test_take(): Tests taking a quiz one question at a time, in order
+    of difficulty, and storing the result.
+    test_answer_once(): Tests that a question cannot be answered twice.
+    test_late_rejected(): Tests discarding attempts after the time limit.
+'''
+
+from tests.base import BaseTestCase
+from app.extensions import db
+from app.models import AdaptiveAttempt, QuizAttempt
+
+
+class AdaptiveRouteTestCase(BaseTestCase):
+    '''
+    Test cases for the adaptive quiz route.
+
+    Inherits:
+        BaseTestCase: Provides setup, teardown, and helper methods for testing.
+    '''
+
+    def test_take(self):
+        '''
+        Tests taking a quiz one question at a time, in order of difficulty,
+        and storing the result.
+
+        - Gives the two questions difficulties of -1 and 1, then answers
+        them in adaptive mode.
+        - Verifies that the easier question is asked first, that the score
+        is stored with the questions in the order they were asked,
+        and that the ability estimate went up.
+        '''
+
+        self.create_test_quiz()
+        self.create_test_questions()
+        self.create_test_users()
+        self.test_q1.difficulty = 1.0
+        self.test_q2.difficulty = -1.0
+        self.test_quiz.draw_count = 2
+        db.session.commit()
+        self.login_user(self.test_user)
+        url = f'/quizzes/{self.quiz_id}/adaptive'
+
+        page = self.client.get(url).data.decode('utf-8')
+        self.assertIn('What is 2 + 2?', page)
+        self.assertIn('Question 1 of 2', page)
+        self.client.post(url, data={'answer': 'B'})
+        page = self.client.get(url).data.decode('utf-8')
+        self.assertIn('What is the capital of France?', page)
+        response = self.client.post(
+                url,
+                data={'answer': 'A'},
+                follow_redirects=True
+                )
+        self.assertIn('You scored 2/2', response.data.decode('utf-8'))
+
+        attempt = QuizAttempt.query.one()
+        self.assertEqual(
+                attempt.question_ids,
+                f'{self.q2_id},{self.q1_id}'
+                )
+        self.assertGreater(attempt.ability, 0)
+
+    def test_answer_once(self):
+        '''
+        Tests that a question cannot be answered twice.
+
+        - Displays the first question and answers it, then posts another
+        answer without displaying the next question.
+        - Verifies that only the first answer is kept.
+        '''
+
+        self.create_test_quiz()
+        self.create_test_questions()
+        self.create_test_users()
+        self.login_user(self.test_user)
+        url = f'/quizzes/{self.quiz_id}/adaptive'
+
+        self.client.get(url)
+        self.client.post(url, data={'answer': 'B'})
+        self.client.post(url, data={'answer': 'A'})
+        attempt = db.session.get(
+                AdaptiveAttempt,
+                (self.test_user.id, self.quiz_id)
+                )
+        self.assertEqual(attempt.answers, 'b')
+
+    def test_late_rejected(self):
+        '''
+        Tests discarding attempts after the time limit.
+
+        - Sets a time limit that has already run out, displays the first
+        question and answers it.
+        - Verifies that the answer is refused and the attempt discarded.
+        '''
+
+        self.create_test_quiz()
+        self.create_test_questions()
+        self.create_test_users()
+        self.login_user(self.test_user)
+        self.app.config['QUIZ_TIME_LIMIT'] = -10
+        url = f'/quizzes/{self.quiz_id}/adaptive'
+
+        self.client.get(url)
+        response = self.client.post(
+                url,
+                data={'answer': 'B'},
+                follow_redirects=True
+                )
+        self.assertIn('Time is up', response.data.decode('utf-8'))
+        self.assertEqual(AdaptiveAttempt.query.count(), 0)
+        self.assertEqual(QuizAttempt.query.count(), 0)
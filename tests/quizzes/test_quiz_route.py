@@ -13,9 +13,28 @@ Methods:
     test_full_mark(): Tests submitting the correct answers and
     scoring full marks.
     test_zero(): Tests submitting incorrect answers and scoring zero.
+    test_answer_key_cached(): Tests grading without querying questions.
+    test_answer_key_invalidated(): Tests regrading with a new answer key
+    after the questions change.
+    test_resubmit(): Tests that resubmitting a quiz overwrites the result
+    with a single upsert statement.
+    test_invalid_token(): Tests refusing submissions without a valid
+    attempt token.
+    test_late_rejected(): Tests refusing submissions after the time limit.
+    test_late_flagged(): Tests recording late submissions as late.
+    test_draw(): Tests drawing and grading a subset of the questions.
+    test_quiz_changed(): Tests refusing submissions when the quiz changed
+    after it was displayed.
+    test_maintenance_during_attempt(): Tests accepting submissions after
+    the quiz was edited, calibrated and regraded.
+    test_short_token(): Tests refusing tokens without the drawn questions.
 '''
 
+import re
 from tests.base import BaseTestCase
+from app.extensions import db
+from app.models import Question, QuizAttempt, QuizResult
+from app.routes.quizzes.attempt_token import _serializer
 
 
 class QuizRouteTestCase(BaseTestCase):
@@ -82,14 +101,14 @@ class QuizRouteTestCase(BaseTestCase):
         a perfect score.
         '''
 
-        response = self.client.post(
-                f'/quizzes/{self.quiz_id}',
-                data={
+        response = self.submit_quiz(
+                self.quiz_id,
+                {
                     f'{self.q1_id}': 'A',
                     f'{self.q2_id}': 'B'
                     },
                 follow_redirects=True
-                    )
+                )
         self.assertEqual(response.status_code, 200)
         response_data = response.data.decode('utf-8')
         self.assertIn('You scored 2/2.', response_data)
@@ -104,14 +123,290 @@ class QuizRouteTestCase(BaseTestCase):
         a score of zero.
         '''
 
-        response = self.client.post(
-                f'/quizzes/{self.quiz_id}',
-                data={
+        response = self.submit_quiz(
+                self.quiz_id,
+                {
                     f'{self.q1_id}': 'B',
                     f'{self.q2_id}': 'C'
                     },
                 follow_redirects=True
-                    )
+                )
         self.assertEqual(response.status_code, 200)
         response_data = response.data.decode('utf-8')
         self.assertIn('You scored 0/2.', response_data)
+
+    def test_answer_key_cached(self):
+        '''
+        Tests grading without querying questions.
+
+        - Submits the quiz twice.
+        - Verifies that the second submission is graded from the cached
+        answer key, without any query on the question table.
+        '''
+
+        data = {f'{self.q1_id}': 'A', f'{self.q2_id}': 'B'}
+        self.submit_quiz(self.quiz_id, data)
+        token = self.start_quiz(self.quiz_id)
+        with self.count_queries() as statements:
+            self.submit_quiz(self.quiz_id, data, token)
+        self.assertFalse(
+                any('FROM question' in statement for statement in statements)
+                )
+
+    def test_answer_key_invalidated(self):
+        '''
+        Tests regrading with a new answer key after the questions change.
+
+        - Submits the quiz, then adds a question and changes
+        a correct option.
+        - Verifies that the next submission is graded against
+        the new questions.
+        '''
+
+        data = {f'{self.q1_id}': 'A', f'{self.q2_id}': 'B'}
+        self.submit_quiz(self.quiz_id, data)
+        self.test_q2.correct_option = 'c'
+        db.session.add(Question(
+            quiz_id=self.quiz_id,
+            text='What is 3 + 3?',
+            option_a='6',
+            option_b='7',
+            option_c='8',
+            option_d='9',
+            correct_option='a'
+            ))
+        db.session.commit()
+        response = self.submit_quiz(
+                self.quiz_id,
+                data,
+                follow_redirects=True
+                )
+        self.assertIn('You scored 1/3.', response.data.decode('utf-8'))
+
+    def test_resubmit(self):
+        '''
+        Tests that resubmitting a quiz overwrites the result with a single
+        upsert statement.
+
+        - Submits the quiz twice with different answers.
+        - Verifies that the second submission writes the result with one
+        `INSERT ... ON CONFLICT` statement and no lookup, and that
+        a single, updated result is stored.
+        '''
+
+        self.submit_quiz(
+                self.quiz_id,
+                {f'{self.q1_id}': 'A', f'{self.q2_id}': 'B'}
+                )
+        token = self.start_quiz(self.quiz_id)
+        with self.count_queries() as statements:
+            self.submit_quiz(self.quiz_id, {f'{self.q1_id}': 'A'}, token)
+        writes = [
+                statement
+                for statement in statements
+                if 'quiz_result' in statement
+                ]
+        self.assertEqual(len(writes), 1)
+        self.assertIn('ON CONFLICT', writes[0])
+        results = QuizResult.query.all()
+        self.assertEqual(len(results), 1)
+        self.assertEqual((results[0].score, results[0].percent), (1, 50))
+
+    def test_invalid_token(self):
+        '''
+        Tests refusing submissions without a valid attempt token.
+
+        - Submits the quiz without a token, then with the token
+        of another quiz.
+        - Verifies that both submissions are refused and nothing is stored.
+        '''
+
+        data = {f'{self.q1_id}': 'A', f'{self.q2_id}': 'B'}
+        response = self.client.post(
+                f'/quizzes/{self.quiz_id}',
+                data=data,
+                follow_redirects=True
+                )
+        self.assertIn(
+                'This attempt is not valid.',
+                response.data.decode('utf-8')
+                )
+        token = self.start_quiz(self.quiz_id)
+        self.submit_quiz(self.quiz_id + 1, data, token)
+        self.assertEqual(QuizAttempt.query.count(), 0)
+
+    def test_late_rejected(self):
+        '''
+        Tests refusing submissions after the time limit.
+
+        - Sets a time limit that has already run out and submits the quiz.
+        - Verifies that the submission is refused and nothing is stored.
+        '''
+
+        self.app.config['QUIZ_TIME_LIMIT'] = -10
+        response = self.submit_quiz(
+                self.quiz_id,
+                {f'{self.q1_id}': 'A'},
+                follow_redirects=True
+                )
+        self.assertIn('Time is up', response.data.decode('utf-8'))
+        self.assertEqual(QuizAttempt.query.count(), 0)
+
+    def test_late_flagged(self):
+        '''
+        Tests recording late submissions as late.
+
+        - Sets a time limit that has already run out, with the 'flag'
+        policy, and submits the quiz.
+        - Verifies that the submission is graded and its attempt
+        is marked as late.
+        '''
+
+        self.app.config.update(QUIZ_TIME_LIMIT=-10, QUIZ_LATE_POLICY='flag')
+        response = self.submit_quiz(
+                self.quiz_id,
+                {f'{self.q1_id}': 'A'},
+                follow_redirects=True
+                )
+        self.assertIn('You scored 1/2.', response.data.decode('utf-8'))
+        self.assertTrue(QuizAttempt.query.one().late)
+
+    def test_draw(self):
+        '''
+        Tests drawing and grading a subset of the questions.
+
+        - Sets the quiz to draw one question per attempt and displays it.
+        - Verifies that only one question is shown, and that answering
+        every question correctly scores 1/1, with the drawn question
+        rebuilt from the seed for the review.
+        '''
+
+        self.test_quiz.draw_count = 1
+        db.session.commit()
+        page = self.client.get(f'/quizzes/{self.quiz_id}').data.decode()
+        shown = [
+                question_id
+                for question_id, text in (
+                    (self.q1_id, 'What is the capital of France?'),
+                    (self.q2_id, 'What is 2 + 2?')
+                    )
+                if text in page
+                ]
+        self.assertEqual(len(shown), 1)
+
+        token = re.search(
+                r"name='attempt_token' value='([^']+)'",
+                page
+                ).group(1)
+        response = self.submit_quiz(
+                self.quiz_id,
+                {f'{self.q1_id}': 'A', f'{self.q2_id}': 'B'},
+                token,
+                follow_redirects=True
+                )
+        self.assertIn('You scored 1/1.', response.data.decode('utf-8'))
+        attempt = QuizAttempt.query.one()
+        self.assertEqual(attempt.question_count, 1)
+        self.assertIsNotNone(attempt.seed)
+        self.assertEqual(attempt.question_ids, str(shown[0]))
+        review = self.client.get(f'/api/quiz/{self.quiz_id}/attempts')
+        self.assertEqual(len(review.get_json()['attempts'][0]['answers']), 1)
+
+    def test_quiz_changed(self):
+        '''
+        Tests refusing submissions when the quiz changed after it was
+        displayed.
+
+        - Sets the quiz to draw one question per attempt and displays it.
+        - Adds a question to the quiz, then submits the answers.
+        - Verifies that the submission is refused and nothing is stored.
+        '''
+
+        self.test_quiz.draw_count = 1
+        db.session.commit()
+        token = self.start_quiz(self.quiz_id)
+        db.session.add(Question(
+            quiz_id=self.quiz_id,
+            text='What is 3 + 3?',
+            option_a='5',
+            option_b='6',
+            option_c='7',
+            option_d='8',
+            correct_option='b'
+            ))
+        db.session.commit()
+        response = self.submit_quiz(
+                self.quiz_id,
+                {f'{self.q1_id}': 'A', f'{self.q2_id}': 'B'},
+                token,
+                follow_redirects=True
+                )
+        self.assertIn(
+                'This quiz changed while you were taking it.',
+                response.data.decode('utf-8')
+                )
+        self.assertEqual(QuizAttempt.query.count(), 0)
+
+    def test_maintenance_during_attempt(self):
+        '''
+        Tests accepting submissions after the quiz was edited, calibrated
+        and regraded.
+
+        - Displays the quiz with all its questions, then sets it to draw
+        one question per attempt and displays it again.
+        - Edits a question, runs `calibrate-items` and `regrade`, then
+        submits both attempts.
+        - Verifies that both submissions are graded.
+        '''
+
+        data = {f'{self.q1_id}': 'A', f'{self.q2_id}': 'B'}
+        self.submit_quiz(self.quiz_id, data)
+        token = self.start_quiz(self.quiz_id)
+        self.test_quiz.draw_count = 1
+        db.session.commit()
+        drawn_token = self.start_quiz(self.quiz_id)
+        self.test_q1.text = 'What is the capital city of France?'
+        db.session.commit()
+        runner = self.app.test_cli_runner()
+        result = runner.invoke(
+                args=['calibrate-items', '--min-responses', '1']
+                )
+        self.assertIn('Calibrated 2 questions.', result.output)
+        result = runner.invoke(args=['regrade', str(self.quiz_id)])
+        self.assertIn('Regraded 1 attempts', result.output)
+
+        response = self.submit_quiz(
+                self.quiz_id,
+                data,
+                drawn_token,
+                follow_redirects=True
+                )
+        self.assertIn('You scored 1/1.', response.data.decode('utf-8'))
+        response = self.submit_quiz(
+                self.quiz_id,
+                data,
+                token,
+                follow_redirects=True
+                )
+        self.assertIn('You scored 2/2.', response.data.decode('utf-8'))
+
+    def test_short_token(self):
+        '''
+        Tests refusing tokens without the drawn questions.
+
+        - Signs a token with only the user and quiz IDs and submits it.
+        - Verifies that the submission is refused and nothing is stored.
+        '''
+
+        token = _serializer().dumps([self.test_user.id, self.quiz_id])
+        response = self.submit_quiz(
+                self.quiz_id,
+                {f'{self.q1_id}': 'A', f'{self.q2_id}': 'B'},
+                token,
+                follow_redirects=True
+                )
+        self.assertIn(
+                'This attempt is not valid.',
+                response.data.decode('utf-8')
+                )
+        self.assertEqual(QuizAttempt.query.count(), 0)
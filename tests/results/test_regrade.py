@@ -0,0 +1,141 @@
+'''
+tests/results/test_regrade.py
+
+This module contains tests for regrading the stored attempts of a quiz.
+
+Classes:
+    RegradeTestCase: Test cases for the regrade command.
+
+Methods:
+    test_regrade(): Tests recomputing attempts, results and item
+    statistics after a key correction.
+    test_skip_deleted_question(): Tests keeping the score of attempts
+    whose questions cannot be rebuilt.
+'''
+
+from tests.base import BaseTestCase
+from app.extensions import db
+from app.models import (
+        LeaderboardDay,
+        LeaderboardEntry,
+        Question,
+        QuestionStat,
+        QuizAttempt,
+        QuizResult
+        )
+from sqlalchemy import select, update
+
+
+class RegradeTestCase(BaseTestCase):
+    '''
+    Test cases for the regrade command.
+
+    Inherits:
+        BaseTestCase: Provides setup, teardown, and helper methods for testing.
+    '''
+
+    def test_regrade(self):
+        '''
+        Tests recomputing attempts, results and item statistics after
+        a key correction.
+
+        - Submits two attempts, then changes the correct option of the
+        second question outside the ORM, as a manual fix would.
+        - Runs the command with chunks of one attempt.
+        - Verifies the scores of the attempts, the latest and best scores
+        of the result, its leaderboard entry and daily bucket and the item
+        statistics follow the new key, and that the number of attempts
+        is kept.
+        - Submits a third attempt and verifies it is graded with the new
+        key, although the old one was cached.
+        '''
+
+        self.create_test_quiz()
+        self.create_test_questions()
+        self.create_test_users()
+        self.login_user(self.test_user)
+        q1 = f'{self.q1_id}'
+        q2 = f'{self.q2_id}'
+        for answers in ({q1: 'a', q2: 'c'}, {q1: 'a', q2: 'b'}):
+            self.client.post('/api/results', json={
+                'submissions': [{'quiz_id': self.quiz_id, 'answers': answers}]
+                })
+        db.session.execute(
+                update(Question).where(Question.id == self.q2_id).values(
+                    correct_option='c'
+                    )
+                )
+        db.session.commit()
+
+        result = self.app.test_cli_runner().invoke(
+                args=['regrade', str(self.quiz_id), '--chunk-size', '1']
+                )
+        self.assertIn(
+                'Regraded 2 attempts (2 changed, 0 skipped, 1 results).',
+                result.output
+                )
+        db.session.expire_all()
+        attempts = db.session.execute(
+                select(QuizAttempt.score, QuizAttempt.percent).order_by(
+                    QuizAttempt.id
+                    )
+                ).all()
+        self.assertEqual(attempts, [(2, 100.0), (1, 50.0)])
+        quiz_result = db.session.execute(select(QuizResult)).scalar_one()
+        self.assertEqual(quiz_result.score, 1)
+        self.assertEqual(quiz_result.percent, 50.0)
+        self.assertEqual(quiz_result.best_score, 2)
+        self.assertEqual(quiz_result.best_percent, 100.0)
+        self.assertEqual(quiz_result.attempt_count, 2)
+        entry = db.session.execute(select(LeaderboardEntry)).scalar_one()
+        self.assertEqual(entry.percent, 50)
+        day = db.session.execute(select(LeaderboardDay)).scalar_one()
+        self.assertEqual(day.percent, 100)
+        stat = db.session.get(QuestionStat, self.q2_id)
+        self.assertEqual(stat.responses, 2)
+        self.assertEqual(stat.correct, 1)
+        self.assertEqual(stat.sum_score_correct, 2)
+
+        response = self.client.post('/api/results', json={
+            'submissions': [{'quiz_id': self.quiz_id, 'answers': {q2: 'c'}}]
+            })
+        self.assertEqual(response.get_json()['results'][0]['score'], 1)
+
+    def test_skip_deleted_question(self):
+        '''
+        Tests keeping the score of attempts whose questions cannot be
+        rebuilt.
+
+        - Submits an attempt, then deletes its first question and changes
+        the correct option of the second one.
+        - Runs the command and verifies the attempt is skipped with its
+        score kept, and still counts in the statistics of the question
+        left.
+        '''
+
+        self.create_test_quiz()
+        self.create_test_questions()
+        self.create_test_users()
+        self.login_user(self.test_user)
+        self.client.post('/api/results', json={
+            'submissions': [{
+                'quiz_id': self.quiz_id,
+                'answers': {f'{self.q1_id}': 'a', f'{self.q2_id}': 'b'}
+                }]
+            })
+        db.session.delete(self.test_q1)
+        self.test_q2.correct_option = 'c'
+        db.session.commit()
+
+        result = self.app.test_cli_runner().invoke(
+                args=['regrade', str(self.quiz_id)]
+                )
+        self.assertIn(
+                'Regraded 1 attempts (0 changed, 1 skipped, 1 results).',
+                result.output
+                )
+        db.session.expire_all()
+        self.assertEqual(db.session.scalar(select(QuizAttempt.score)), 2)
+        stat = db.session.get(QuestionStat, self.q2_id)
+        self.assertEqual((stat.responses, stat.correct), (1, 0))
+        self.assertIsNone(db.session.get(QuestionStat, self.q1_id))
@@ -0,0 +1,287 @@
+'''
+tests/results/test_result_writer.py
+
+This module contains tests for the write-behind mode of the result writer.
+
+Classes:
+    ResultWriterTestCase: Test cases for the result writer.
+
+Methods:
+    test_group_commit(): Tests writing queued results in batches and
+    emptying the journal.
+    test_replay(): Tests saving the uncommitted results of the journal
+    on startup.
+    test_failed_result(): Tests isolating a result that cannot be saved.
+    test_journal_required(): Tests refusing write-behind mode without
+    a journal of its own.
+    test_transient_error(): Tests retrying a batch while the database
+    is locked.
+    test_replay_failed(): Tests saving the results of the failed journal
+    again.
+    test_regrade_queued(): Tests regrading a result still queued when
+    the regrade starts.
+'''
+
+from tests.base import BaseTestCase
+from app import result_writer as result_writer_module
+from app.extensions import db
+from app.models import Question, Quiz, QuizAttempt, QuizResult
+from app.results import grade_submission, save_results
+from app.result_writer import ResultWriter, result_writer, encode_entry
+from sqlalchemy import update
+from sqlalchemy.exc import OperationalError
+from tempfile import TemporaryDirectory
+from threading import Event, Timer
+from unittest.mock import patch
+import json
+import os
+
+
+class ResultWriterTestCase(BaseTestCase):
+    '''
+    Test cases for the result writer.
+
+    Inherits:
+        BaseTestCase: Provides setup, teardown, and helper methods for testing.
+    '''
+
+    def setUp(self):
+        '''
+        Sets up the test environment with a quiz, questions, test users
+        and write-behind mode using a temporary journal.
+        '''
+
+        super().setUp()
+        self.create_test_quiz()
+        self.create_test_questions()
+        self.create_test_users()
+        directory = TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.journal_path = os.path.join(directory.name, 'journal.jsonl')
+        self.app.config.update(
+                RESULTS_WRITE_BEHIND=True,
+                RESULTS_JOURNAL=self.journal_path
+                )
+
+    def enable_writer(self):
+        '''
+        Starts the writer thread, stopping it when the test ends.
+        '''
+
+        result_writer.init_app(self.app)
+        self.addCleanup(result_writer.stop)
+
+    def test_group_commit(self):
+        '''
+        Tests writing queued results in batches and emptying the journal.
+
+        - Submits the quiz twice from the quiz page.
+        - Verifies both attempts are written once the queue is drained,
+        that the queue is empty and that the journal was emptied.
+        '''
+
+        self.enable_writer()
+        self.login_user(self.test_user)
+        for answer in ('A', 'B'):
+            response = self.submit_quiz(
+                    self.quiz_id,
+                    {f'{self.q1_id}': answer},
+                    follow_redirects=True
+                    )
+        self.assertIn('You scored 0/2.', response.data.decode('utf-8'))
+        result_writer.drain()
+
+        self.assertEqual(QuizAttempt.query.count(), 2)
+        self.assertEqual(QuizResult.query.one().best_score, 1)
+        stats = result_writer.stats()
+        self.assertEqual(stats['queue_depth'], 0)
+        self.assertEqual(stats['rows_flushed'], 2)
+        self.assertGreaterEqual(stats['flushes'], 1)
+        self.assertEqual(os.path.getsize(self.journal_path), 0)
+
+    def test_replay(self):
+        '''
+        Tests saving the uncommitted results of the journal on startup.
+
+        - Writes a journal with two results, the first of which
+        was committed.
+        - Verifies that only the second one is saved on startup
+        and that the journal is emptied.
+        '''
+
+        user_id = self.test_user.id
+        with open(self.journal_path, 'w', encoding='utf-8') as journal:
+            journal.write(encode_entry(
+                1,
+                grade_submission(user_id, self.quiz_id, {})
+                ))
+            journal.write(json.dumps({'flushed': [1, 1]}) + '\n')
+            journal.write(encode_entry(
+                2,
+                grade_submission(user_id, self.quiz_id, {
+                    f'{self.q1_id}': 'a'
+                    })
+                ))
+        self.enable_writer()
+
+        attempt = QuizAttempt.query.one()
+        self.assertEqual(attempt.score, 1)
+        self.assertEqual(os.path.getsize(self.journal_path), 0)
+
+    def test_failed_result(self):
+        '''
+        Tests isolating a result that cannot be saved.
+
+        - Queues a valid result and one for a missing quiz in one batch.
+        - Verifies that the valid result is written, that the other one
+        is moved to the failed journal, and that the queue and the journal
+        are emptied.
+        '''
+
+        self.app.config['RESULTS_FLUSH_INTERVAL'] = 0.5
+        self.enable_writer()
+        user_id = self.test_user.id
+        result_writer.submit([
+            grade_submission(user_id, self.quiz_id, {f'{self.q1_id}': 'a'}),
+            grade_submission(user_id, self.quiz_id + 1, {})
+            ])
+        result_writer.drain()
+
+        self.assertEqual(QuizResult.query.one().quiz_id, self.quiz_id)
+        stats = result_writer.stats()
+        self.assertEqual(stats['queue_depth'], 0)
+        self.assertEqual(stats['rows_flushed'], 1)
+        self.assertEqual(stats['failed'], 1)
+        self.assertEqual(os.path.getsize(self.journal_path), 0)
+        with open(self.journal_path + '.failed', encoding='utf-8') as failed:
+            self.assertEqual(
+                    json.loads(failed.read())['quiz_id'],
+                    self.quiz_id + 1
+                    )
+
+    def test_journal_required(self):
+        '''
+        Tests refusing write-behind mode without a journal of its own.
+
+        - Starts the writer without `RESULTS_JOURNAL`, then a second
+        writer on the journal of a running one.
+        - Verifies that both fail to start.
+        '''
+
+        self.app.config['RESULTS_JOURNAL'] = None
+        with self.assertRaises(RuntimeError):
+            ResultWriter(self.app)
+        self.app.config['RESULTS_JOURNAL'] = self.journal_path
+        self.enable_writer()
+        with self.assertRaises(RuntimeError):
+            ResultWriter(self.app)
+
+    def test_transient_error(self):
+        '''
+        Tests retrying a batch while the database is locked.
+
+        - Allows one retry per batch, and makes the first three writes
+        fail with a locked database.
+        - Verifies that the batch is retried, queued again once the
+        retries run out, then written, and that nothing is moved to
+        the failed journal.
+        '''
+
+        self.app.config['RESULTS_RETRY_ATTEMPTS'] = 1
+        self.enable_writer()
+        calls = []
+
+        def locked(results):
+            calls.append(len(results))
+            if len(calls) <= 3:
+                raise OperationalError(
+                        'INSERT',
+                        {},
+                        Exception('database is locked')
+                        )
+            save_results(results)
+
+        with patch.object(result_writer_module, 'save_results', locked):
+            result_writer.submit([grade_submission(
+                self.test_user.id,
+                self.quiz_id,
+                {f'{self.q1_id}': 'a'}
+                )])
+            result_writer.drain()
+
+        self.assertEqual(len(calls), 4)
+        self.assertEqual(QuizAttempt.query.one().score, 1)
+        stats = result_writer.stats()
+        self.assertEqual(stats['queue_depth'], 0)
+        self.assertEqual((stats['retries'], stats['errors']), (2, 1))
+        self.assertEqual(stats['failed'], 0)
+        self.assertEqual(os.path.getsize(self.journal_path), 0)
+        self.assertFalse(os.path.exists(self.journal_path + '.failed'))
+
+    def test_replay_failed(self):
+        '''
+        Tests saving the results of the failed journal again.
+
+        - Queues a result for a missing quiz, which is moved to the failed
+        journal, then creates the quiz.
+        - Verifies that `replay-failed-results` saves the result and
+        empties the failed journal.
+        '''
+
+        self.enable_writer()
+        missing_id = self.quiz_id + 1
+        result_writer.submit([
+            grade_submission(self.test_user.id, missing_id, {})
+            ])
+        result_writer.drain()
+        self.assertEqual(result_writer.stats()['failed'], 1)
+        db.session.add(Quiz(id=missing_id, title='Other Quiz'))
+        db.session.commit()
+
+        result = self.app.test_cli_runner().invoke(
+                args=['replay-failed-results']
+                )
+        self.assertIn('Saved 1 results (0 left in', result.output)
+        self.assertEqual(QuizResult.query.one().quiz_id, missing_id)
+        self.assertEqual(os.path.getsize(self.journal_path + '.failed'), 0)
+
+    def test_regrade_queued(self):
+        '''
+        Tests regrading a result still queued when the regrade starts.
+
+        - Holds the writer on a result graded with the old key, corrects
+        the key and runs the regrade, releasing the writer shortly after.
+        - Verifies that the regrade waits for the queued result and
+        regrades it.
+        '''
+
+        self.enable_writer()
+        release = Event()
+
+        def held(results):
+            release.wait(5)
+            save_results(results)
+
+        with patch.object(result_writer_module, 'save_results', held):
+            result_writer.submit([grade_submission(
+                self.test_user.id,
+                self.quiz_id,
+                {f'{self.q2_id}': 'c'}
+                )])
+            db.session.execute(
+                    update(Question).where(Question.id == self.q2_id).values(
+                        correct_option='c'
+                        )
+                    )
+            db.session.commit()
+            timer = Timer(0.2, release.set)
+            timer.start()
+            self.addCleanup(timer.cancel)
+            result = self.app.test_cli_runner().invoke(
+                    args=['regrade', str(self.quiz_id)]
+                    )
+
+        self.assertIn('Regraded 1 attempts (1 changed', result.output)
+        db.session.expire_all()
+        self.assertEqual(QuizAttempt.query.one().score, 1)
+        self.assertEqual(QuizResult.query.one().best_score, 1)
@@ -0,0 +1,91 @@
+'''
+tests/results/test_results.py
+
+This module contains tests for storing graded submissions as attempts
+and result rollups.
+
+Classes:
+    ResultsTestCase: Test cases for attempts and result rollups.
+
+Methods:
+    test_pack_answers(): Tests packing answers 3 bits per question.
+    test_rollup(): Tests keeping every attempt and the latest and best
+    scores in the result.
+'''
+
+from tests.base import BaseTestCase
+from app.extensions import db
+from app.models import QuizAttempt, QuizResult
+from app.packed_answers import pack_answers, unpack_answers
+from app.results import grade_submission, save_results
+
+
+class ResultsTestCase(BaseTestCase):
+    '''
+    Test cases for attempts and result rollups.
+
+    Inherits:
+        BaseTestCase: Provides setup, teardown, and helper methods for testing.
+    '''
+
+    def test_pack_answers(self):
+        '''
+        Tests packing answers 3 bits per question.
+
+        - Packs ten answers, some unanswered or invalid.
+        - Verifies the blob takes 4 bytes and unpacks to the same options.
+        '''
+
+        question_ids = tuple(str(question_id) for question_id in range(10))
+        answers = {'0': 'A', '1': 'd', '3': 'c', '4': 'x', '9': 'b'}
+        blob = pack_answers(question_ids, answers)
+        self.assertEqual(len(blob), 4)
+        self.assertEqual(
+                unpack_answers(blob, 10),
+                ['a', 'd', None, 'c', None, None, None, None, None, 'b']
+                )
+
+    def test_rollup(self):
+        '''
+        Tests keeping every attempt and the latest and best scores
+        in the result.
+
+        - Saves two attempts in one batch, then a third one.
+        - Verifies that the three attempts are stored and that the result
+        holds the latest score, the best score and the attempt count.
+        '''
+
+        self.create_test_quiz()
+        self.create_test_questions()
+        self.create_test_users()
+        user_id = self.test_user.id
+        full = {f'{self.q1_id}': 'a', f'{self.q2_id}': 'b'}
+        save_results([
+            grade_submission(user_id, self.quiz_id, {}, 30),
+            grade_submission(user_id, self.quiz_id, full, 20)
+            ])
+        db.session.commit()
+        save_results([
+            grade_submission(user_id, self.quiz_id, {f'{self.q1_id}': 'a'})
+            ])
+        db.session.commit()
+
+        attempts = QuizAttempt.query.order_by(QuizAttempt.id).all()
+        self.assertEqual(
+                [(attempt.score, attempt.duration) for attempt in attempts],
+                [(0, 30), (2, 20), (1, None)]
+                )
+        self.assertEqual(
+                unpack_answers(attempts[1].answers, 2),
+                ['a', 'b']
+                )
+        result = QuizResult.query.one()
+        self.assertEqual(
+                (
+                    result.score,
+                    result.best_score,
+                    result.best_percent,
+                    result.attempt_count
+                    ),
+                (1, 2, 100, 3)
+                )